@@ -0,0 +1,199 @@
+"""
+ASGI serving mode for the repo's Flask APIs (betting_outs/kalshi/kalshi_api.py, news/tweets_api.py).
+
+AsgiRouter answers the routes registered on it with async handlers on one event loop, so a slow
+upstream call or DB insert waits without holding a thread. Every other request falls through to
+the Flask app (wsgi_fallback: asgiref's WsgiToAsgi, each request on a thread of its own pool), so
+both modes serve the same API. Each API starts it from its usual entry point:
+
+    python betting_outs/kalshi/kalshi_api.py --asgi
+    python news/tweets_api.py --asgi
+
+Needs uvicorn and asgiref (pip install uvicorn asgiref); the default Flask mode does not.
+"""
+import asyncio
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+from urllib.parse import parse_qsl
+
+Handler = Callable[["Request"], Awaitable[Any]]
+# Threads serving fallback (Flask) requests at once.
+WSGI_THREADS = 32
+
+
+class Request:
+    """What an async handler sees: method, path, query args (first value per name), path params."""
+
+    def __init__(self, scope: dict, body: bytes, params: Dict[str, str]):
+        self.method = scope["method"]
+        self.path = scope["path"]
+        self.args: Dict[str, str] = {}
+        for k, v in parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True):
+            self.args.setdefault(k, v)
+        self.params = params
+        self.body = body
+
+    def json(self) -> Any:
+        """Parsed JSON body, or None if empty or invalid (like Flask's get_json(silent=True))."""
+        try:
+            return json.loads(self.body) if self.body else None
+        except ValueError:
+            return None
+
+
+class Streaming:
+    """Handler result for a streamed body (e.g. server-sent events). chunks is an async iterator of
+    str or bytes; it is cancelled and closed when the client disconnects."""
+
+    def __init__(self, chunks: AsyncIterator[Any], content_type: str = "text/event-stream",
+                 headers: Optional[Dict[str, str]] = None, status: int = 200):
+        self.chunks = chunks
+        self.content_type = content_type
+        self.headers = headers or {}
+        self.status = status
+
+
+class AsgiRouter:
+    """Tiny ASGI app: exact paths with <name> segments, JSON in and out, a fallback app for the rest.
+
+    A handler returns a JSON-able body, (body, status), or Streaming. headers are added to every response
+    (e.g. CORS). on_startup / on_shutdown coroutines run with the server's lifespan.
+    """
+
+    def __init__(self, fallback: Optional[Callable] = None, headers: Optional[Dict[str, str]] = None):
+        self.fallback = fallback
+        self.headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+        self.routes: list = []  # (method, compiled path, handler)
+        self.on_startup: list = []
+        self.on_shutdown: list = []
+
+    def route(self, path: str, methods: tuple = ("GET",)) -> Callable[[Handler], Handler]:
+        pattern = re.compile("^" + re.sub(r"<(\w+)>", r"(?P<\1>[^/]+)", path) + "$")
+
+        def register(fn: Handler) -> Handler:
+            for m in methods:
+                self.routes.append((m, pattern, fn))
+            return fn
+
+        return register
+
+    def match(self, method: str, path: str) -> tuple:
+        for m, pattern, fn in self.routes:
+            if m == method:
+                found = pattern.match(path)
+                if found:
+                    return fn, found.groupdict()
+        return None, None
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            if self.fallback is not None:
+                await self.fallback(scope, receive, send)
+            return
+        fn, params = self.match(scope["method"], scope["path"])
+        if fn is None:
+            if self.fallback is not None:
+                await self.fallback(scope, receive, send)
+            else:
+                await self._send_json(send, {"error": "not found"}, 404)
+            return
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        try:
+            result = await fn(Request(scope, body, params))
+        except Exception as e:
+            result = ({"error": str(e)}, 500)
+        if isinstance(result, Streaming):
+            await self._send_stream(receive, send, result)
+            return
+        data, status = result if isinstance(result, tuple) else (result, 200)
+        await self._send_json(send, data, status)
+
+    async def _send_json(self, send: Callable, data: Any, status: int) -> None:
+        payload = json.dumps(data, default=str).encode()
+        headers = [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())]
+        await send({"type": "http.response.start", "status": status, "headers": headers + self.headers})
+        await send({"type": "http.response.body", "body": payload})
+
+    async def _send_stream(self, receive: Callable, send: Callable, stream: Streaming) -> None:
+        headers = [(b"content-type", stream.content_type.encode())]
+        headers += [(k.lower().encode(), v.encode()) for k, v in stream.headers.items()]
+        await send({"type": "http.response.start", "status": stream.status, "headers": headers + self.headers})
+
+        async def pump() -> None:
+            async for chunk in stream.chunks:
+                body = chunk.encode() if isinstance(chunk, str) else chunk
+                await send({"type": "http.response.body", "body": body, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+
+        async def disconnected() -> None:
+            while (await receive())["type"] != "http.disconnect":
+                pass
+
+        # The server stops delivering chunks after a disconnect but does not stop the iterator,
+        # so watch receive() and cancel the pump (running the iterator's cleanup) when it closes.
+        tasks = [asyncio.ensure_future(pump()), asyncio.ensure_future(disconnected())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            aclose = getattr(stream.chunks, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    async def _lifespan(self, receive: Callable, send: Callable) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                for fn in self.on_startup:
+                    await fn()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                for fn in self.on_shutdown:
+                    await fn()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def wsgi_fallback(wsgi_app: Any, threads: int = WSGI_THREADS) -> Callable:
+    """The Flask app as an ASGI app, each request on one of threads worker threads.
+
+    asgiref's WsgiToAsgi runs every request on one shared thread (thread_sensitive=True), so one
+    slow or streaming Flask response would hold up all the others."""
+    try:
+        from asgiref.sync import SyncToAsync
+        from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+    except ImportError:
+        raise SystemExit("ASGI mode needs uvicorn and asgiref: pip install uvicorn asgiref")
+    executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="wsgi")
+
+    class PooledInstance(WsgiToAsgiInstance):
+        run_wsgi_app = SyncToAsync(
+            WsgiToAsgiInstance.__dict__["run_wsgi_app"].func, thread_sensitive=False, executor=executor
+        )
+
+    class PooledWsgiToAsgi(WsgiToAsgi):
+        async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+            await PooledInstance(self.wsgi_application, self.duplicate_header_limit)(scope, receive, send)
+
+    return PooledWsgiToAsgi(wsgi_app)
+
+
+def serve(app: Any, host: str, port: int) -> None:
+    """Run app under uvicorn (blocks)."""
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("ASGI mode needs uvicorn and asgiref: pip install uvicorn asgiref")
+    uvicorn.run(app, host=host, port=port, log_level="warning")
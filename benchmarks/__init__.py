@@ -0,0 +1,4 @@
+"""
+Micro-benchmarks for OddsManager hot paths. Each module is a standalone script:
+    python -m benchmarks.<name>
+"""
@@ -0,0 +1,32 @@
+"""Shared helpers for the benchmark scripts (project-root path setup, throwaway keys, stats)."""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def throwaway_private_key():
+    """A fresh 2048-bit RSA key so benchmarks can sign requests without real credentials."""
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[k]
+
+
+def latency_summary(label: str, latencies_sec: list, wall_sec: float) -> str:
+    """One line: requests/sec plus p50/p99 latency in milliseconds."""
+    lat = sorted(latencies_sec)
+    rps = len(lat) / wall_sec if wall_sec > 0 else 0.0
+    return (
+        f"{label:<28} n={len(lat):<6} {rps:>9.1f} req/s   "
+        f"p50={percentile(lat, 50) * 1000:7.3f} ms   p99={percentile(lat, 99) * 1000:7.3f} ms"
+    )
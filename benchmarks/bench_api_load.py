@@ -0,0 +1,155 @@
+"""
+Load-test the local HTTP APIs: Flask's threaded server vs the --asgi mode, 100 concurrent clients.
+Run from project root: python -m benchmarks.bench_api_load [--clients 100] [--seconds 10] [--upstream-ms 80]
+
+By default both modes of kalshi_api.py are started as subprocesses in front of a stub Kalshi that
+answers after --upstream-ms, and every client loops on GET /markets/<ticker>/orderbook (an
+upstream-bound proxy route; in asgi mode identical in-flight requests also share one upstream
+call). Point it at a running server instead to measure any route, e.g. the
+tweets API on the VPS in each mode:
+
+    python -m benchmarks.bench_api_load --url "http://127.0.0.1:8765/api/tweets?limit=20"
+
+Needs aiohttp; the asgi mode needs uvicorn and asgiref.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks._common import ROOT, latency_summary
+
+_BODY = json.dumps({"orderbook": {"yes": [[40, 100], [41, 250]], "no": [[57, 80], [58, 10]]}}).encode()
+
+
+def _start_stub(delay_sec: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(delay_sec)  # a slow upstream round trip
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(_BODY)))
+            self.end_headers()
+            self.wfile.write(_BODY)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.request_queue_size = 1024
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _serve(mode: str, port: int, upstream: str) -> None:
+    """Subprocess entry: kalshi_api in mode, with Kalshi's public base URL pointed at the stub."""
+    sys.argv = [sys.argv[0]]
+    from betting_outs.kalshi import kalshi_api
+
+    kalshi_api.KALSHI_BASE_URL.update(DEMO=upstream, PROD=upstream)
+    if mode == "asgi":
+        from asgi_server import serve
+        serve(kalshi_api.build_asgi_app(), "127.0.0.1", port)
+    else:
+        kalshi_api.app.run(host="127.0.0.1", port=port, debug=False, use_reloader=False, threaded=True)
+
+
+def _launch(mode: str, port: int, upstream: str) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.bench_api_load", "--serve", mode, "--port", str(port), "--upstream", upstream],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    import requests
+
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/health", timeout=1).ok:
+                return proc
+        except requests.RequestException:
+            time.sleep(0.2)
+    proc.kill()
+    raise SystemExit(f"{mode} server did not start on port {port}")
+
+
+async def _load(url: str, clients: int, seconds: float) -> tuple[list, int, float]:
+    import aiohttp
+
+    latencies: list = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+
+    async def client(session):
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            try:
+                async with session.get(url) as resp:
+                    await resp.read()
+                    ok = resp.status < 400
+            except aiohttp.ClientError:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - t0)
+            else:
+                errors += 1
+
+    connector = aiohttp.TCPConnector(limit=clients)
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=60)) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(session) for _ in range(clients)))
+        return latencies, errors, time.perf_counter() - start
+
+
+def _report(label: str, url: str, clients: int, seconds: float) -> None:
+    asyncio.run(_load(url, clients, min(2.0, seconds)))  # warm-up: connections, pools, caches
+    latencies, errors, wall = asyncio.run(_load(url, clients, seconds))
+    print(latency_summary(label, latencies, wall) + f"   errors={errors}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--upstream-ms", type=float, default=80.0)
+    parser.add_argument("--path", default="/markets/KXBENCH-26-A/orderbook?env=demo")
+    parser.add_argument("--url", action="append", help="load-test this URL instead (repeatable)")
+    parser.add_argument("--serve", choices=("flask", "asgi"), help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=18766, help=argparse.SUPPRESS)
+    parser.add_argument("--upstream", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        _serve(args.serve, args.port, args.upstream)
+        return
+    print(f"{args.clients} concurrent clients, {args.seconds:.0f} s per run")
+    if args.url:
+        for url in args.url:
+            _report(url[-28:], url, args.clients, args.seconds)
+        return
+
+    stub = _start_stub(args.upstream_ms / 1000)
+    upstream = f"http://127.0.0.1:{stub.server_address[1]}"
+    print(f"Stub Kalshi {upstream} answering after {args.upstream_ms:.0f} ms; GET {args.path}")
+    for i, mode in enumerate(("flask", "asgi")):
+        port = args.port + i
+        proc = _launch(mode, port, upstream)
+        try:
+            _report(f"kalshi_api ({mode})", f"http://127.0.0.1:{port}{args.path}", args.clients, args.seconds)
+        finally:
+            proc.terminate()
+            proc.wait(10)
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("PYTHONUNBUFFERED", "1")
+    main()
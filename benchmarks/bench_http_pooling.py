@@ -0,0 +1,92 @@
+"""
+Benchmark KalshiHttpClient with and without connection pooling against a local stub server.
+Run from project root: python -m benchmarks.bench_http_pooling [--requests 2000] [--threads 4]
+
+"unpooled" swaps the client's session for the requests module itself, which is exactly what the
+client did before it owned a Session: every call opens (and closes) a new connection.
+"""
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from benchmarks._common import latency_summary, throwaway_private_key
+from betting_outs.kalshi.kalshi import KalshiHttpClient
+
+_BODY = json.dumps({"orderbook": {"yes": [[40, 100], [41, 250]], "no": [[57, 80], [58, 10]]}}).encode()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive unless the client closes
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(_BODY)))
+        self.end_headers()
+        self.wfile.write(_BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_stub() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _run(client: KalshiHttpClient, n: int, threads: int) -> tuple[list, float]:
+    latencies: list = []
+    lock = threading.Lock()
+
+    def one(_):
+        t0 = time.perf_counter()
+        client.get_orderbook("KXBENCH-26-A")
+        dt = time.perf_counter() - t0
+        with lock:
+            latencies.append(dt)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(one, range(n)))
+    return latencies, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    server = _start_stub()
+    host = f"http://127.0.0.1:{server.server_address[1]}"
+    key = throwaway_private_key()
+
+    def make_client(pooled: bool) -> KalshiHttpClient:
+        client = KalshiHttpClient("bench-key", key, "DEMO", pool_maxsize=args.threads)
+        client.host = host
+        client.rate_limit = lambda *a, **k: None  # measure transport only
+        if not pooled:
+            client.session = requests
+        return client
+
+    print(f"Stub server {host}; {args.requests} GETs on {args.threads} thread(s)")
+    for label, pooled in (("unpooled (requests.get)", False), ("pooled (Session)", True)):
+        client = make_client(pooled)
+        _run(client, min(50, args.requests), args.threads)  # warm-up
+        latencies, wall = _run(client, args.requests, args.threads)
+        print(latency_summary(label, latencies, wall))
+        if pooled:
+            client.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark the combined No allocator: the old 1c-at-a-time loop (re-sorting every leg per cent of
+excess) vs compute_offer_prices (water-filling) vs compute_offer_prices_batch (NumPy, all events
+in one call).
+Run from project root: python -m benchmarks.bench_offer_prices [--events 200] [--legs 40]
+"""
+import argparse
+import math
+import random
+import time
+
+from benchmarks._common import ROOT  # noqa: F401  (puts project root on sys.path)
+from betting_outs.kalshi.kalshi_orderbook import OrderBook
+from market_making.combined_no_bot import compute_offer_prices, compute_offer_prices_batch
+
+
+def loop_offer_prices(tickers: list, bid_ask_data: dict, max_combined: int) -> dict:
+    """The allocator compute_offer_prices replaced."""
+    caps = {}
+    for t in tickers:
+        median = bid_ask_data[t][2]
+        caps[t] = 1 if median <= 1 else max(1, int(math.floor(median)) - 1)
+    excess = sum(caps.values()) - max_combined
+    while excess > 0:
+        ordered = sorted(tickers, key=lambda t: bid_ask_data[t][3].depth_at("no", caps[t]) if caps[t] > 1 else float("inf"))
+        progress = False
+        for t in ordered:
+            if excess <= 0:
+                break
+            if caps[t] > 1:
+                caps[t] -= 1
+                excess -= 1
+                progress = True
+        if not progress:
+            break
+    return caps
+
+
+def _event(rng: random.Random, legs: int) -> tuple:
+    tickers = [f"KX-{i}" for i in range(legs)]
+    data = {}
+    for t in tickers:
+        book = OrderBook(t)
+        book.apply_snapshot([], [[p, rng.randint(1, 5000)] for p in sorted(rng.sample(range(1, 99), 30))])
+        data[t] = (0, 0, rng.uniform(20, 95), book)
+    return tickers, data
+
+
+def _time(label: str, n: int, fn) -> None:
+    t0 = time.perf_counter()
+    fn()
+    sec = time.perf_counter() - t0
+    print(f"  {label:<36} {sec * 1000:9.1f} ms  {sec / n * 1e6:8.1f} us/event")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--legs", type=int, default=40)
+    parser.add_argument("--max-combined", type=int, default=97)
+    args = parser.parse_args()
+    rng = random.Random(7)
+    events = [_event(rng, args.legs) for _ in range(args.events)]
+    m = args.max_combined
+
+    print(f"{args.events} events x {args.legs} legs, max_combined={m}")
+    _time("1c loop", args.events, lambda: [loop_offer_prices(t, d, m) for t, d in events])
+    _time("compute_offer_prices", args.events, lambda: [compute_offer_prices(t, d, m) for t, d in events])
+    try:
+        import numpy as np
+    except ImportError:
+        print("  numpy not installed; skipping batch")
+        return
+    medians = np.array([[d[t][2] for t in tickers] for tickers, d in events])
+    depth = np.array([[d[t][3].no for t in tickers] for tickers, d in events], dtype=np.int32)
+    _time("compute_offer_prices_batch", args.events, lambda: compute_offer_prices_batch(medians, depth, m))
+
+
+if __name__ == "__main__":
+    main()
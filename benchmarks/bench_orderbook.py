@@ -0,0 +1,79 @@
+"""
+Benchmark orderbook parsing, updates and queries: array-backed OrderBook vs the dict approach the
+bots used before (rebuild {price: qty} from the REST lists every poll, read best via [-1]/max).
+Run from project root: python -m benchmarks.bench_orderbook [--iterations 100000]
+"""
+import argparse
+import random
+import time
+
+from benchmarks._common import ROOT  # noqa: F401  (puts project root on sys.path)
+from betting_outs.kalshi.kalshi_orderbook import OrderBook
+
+
+def _response(rng: random.Random) -> dict:
+    yes = sorted(rng.sample(range(1, 50), 25))
+    no = sorted(rng.sample(range(1, 50), 25))
+    return {"orderbook": {
+        "yes": [[p, rng.randint(1, 5000)] for p in yes],
+        "no": [[p, rng.randint(1, 5000)] for p in no],
+    }}
+
+
+def dict_parse(data: dict) -> tuple:
+    """What _get_no_bid_ask did: best via [-1], then a fresh dict for liquidity lookups."""
+    ob = data.get("orderbook") or {}
+    yes_bids = ob.get("yes") or []
+    no_bids = ob.get("no") or []
+    best_yes_bid = int(yes_bids[-1][0])
+    best_no_bid = int(no_bids[-1][0])
+    return best_yes_bid, best_no_bid, {int(p): int(q) for p, q in no_bids}
+
+
+def dict_apply_delta(levels: dict, price: int, delta: int) -> int:
+    qty = levels.get(price, 0) + delta
+    if qty > 0:
+        levels[price] = qty
+    else:
+        levels.pop(price, None)
+    return max(levels) if levels else 0
+
+
+def _time(label: str, n: int, fn) -> None:
+    t0 = time.perf_counter()
+    fn()
+    sec = time.perf_counter() - t0
+    print(f"  {label:<36} {sec * 1000:9.1f} ms  {sec / n * 1e9:8.0f} ns/op")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=100000)
+    args = parser.parse_args()
+    n = args.iterations
+    rng = random.Random(7)
+    responses = [_response(rng) for _ in range(64)]
+    deltas = [(rng.choice(("yes", "no")), rng.randint(1, 60), rng.randint(-3000, 3000)) for _ in range(n)]
+    lookups = [rng.randint(1, 99) for _ in range(n)]
+
+    print(f"parse full book ({n}x)")
+    _time("dict rebuild", n, lambda: [dict_parse(responses[i & 63]) for i in range(n)])
+    _time("OrderBook.from_response", n, lambda: [OrderBook.from_response(responses[i & 63]) for i in range(n)])
+
+    print(f"apply delta + read best ({n}x)")
+    levels = {"yes": {int(p): int(q) for p, q in responses[0]["orderbook"]["yes"]},
+              "no": {int(p): int(q) for p, q in responses[0]["orderbook"]["no"]}}
+    _time("dict update + max()", n, lambda: [dict_apply_delta(levels[s], p, d) for s, p, d in deltas])
+    book = OrderBook.from_response(responses[0])
+    _time("OrderBook.apply_delta + best_bid", n,
+          lambda: [(book.apply_delta(s, p, d), book.best_bid(s)) for s, p, d in deltas])
+
+    print(f"depth-at-price lookup ({n}x)")
+    no_levels = dict_parse(responses[0])[2]
+    book = OrderBook.from_response(responses[0])
+    _time("dict.get", n, lambda: [no_levels.get(p, 0) for p in lookups])
+    _time("OrderBook.depth_at", n, lambda: [book.depth_at("no", p) for p in lookups])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark Kalshi request signing: the original per-request path vs RequestSigner.
+Run from project root: python -m benchmarks.bench_signing [--sizes 1000 10000]
+"""
+import argparse
+import base64
+import time
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+
+from benchmarks._common import throwaway_private_key
+from betting_outs.kalshi.kalshi_signing import RequestSigner
+
+PATHS = [
+    ("GET", "/trade-api/v2/markets/KXBENCH-26-A/orderbook"),
+    ("POST", "/trade-api/v2/portfolio/orders"),
+    ("GET", "/trade-api/v2/portfolio/orders?status=resting&limit=200"),
+    ("DELETE", "/trade-api/v2/portfolio/orders/abc123"),
+]
+
+
+def legacy_headers(key_id, private_key, method, path):
+    """The signing path KalshiBaseClient.request_headers used before RequestSigner."""
+    timestamp_str = str(int(time.time() * 1000))
+    path_parts = path.split('?')
+    message = (timestamp_str + method + path_parts[0]).encode('utf-8')
+    signature = private_key.sign(
+        message,
+        padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH),
+        hashes.SHA256(),
+    )
+    return {
+        "Content-Type": "application/json",
+        "KALSHI-ACCESS-KEY": key_id,
+        "KALSHI-ACCESS-SIGNATURE": base64.b64encode(signature).decode('utf-8'),
+        "KALSHI-ACCESS-TIMESTAMP": timestamp_str,
+    }
+
+
+def _time(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    key = throwaway_private_key()
+    signer = RequestSigner("bench-key", key)
+    for n in args.sizes:
+        pairs = [PATHS[i % len(PATHS)] for i in range(n)]
+        rows = [
+            ("legacy request_headers", _time(lambda: [legacy_headers("bench-key", key, m, p) for m, p in pairs])),
+            ("RequestSigner.headers", _time(lambda: [signer.headers(m, p) for m, p in pairs])),
+            ("RequestSigner.headers_many", _time(lambda: signer.headers_many(pairs))),
+        ]
+        print(f"{n} signatures")
+        base = rows[0][1]
+        for label, sec in rows:
+            print(f"  {label:<28} {sec * 1000:9.1f} ms  {sec / n * 1e6:8.1f} us/sig  x{base / sec:5.2f}")
+    print("signer.stats():", signer.stats())
+
+
+if __name__ == "__main__":
+    main()
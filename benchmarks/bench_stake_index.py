@@ -0,0 +1,70 @@
+"""
+Benchmark the per-stake bot's executed-order dispatch: scanning the stakes list with .strip() per
+stake (what handle_executed did) vs StakeIndex (one dict lookup by ticker and side), plus the
+repost parameters read from the dict vs precomputed on Stake.
+Run from project root: python -m benchmarks.bench_stake_index [--stakes 100] [--orders 1000] [--polls 100]
+"""
+import argparse
+import random
+import time
+
+from benchmarks._common import ROOT  # noqa: F401  (puts project root on sys.path)
+from market_making.stakes import StakeIndex
+
+
+def _stakes(n: int) -> list:
+    return [
+        {"ticker": f"KXBENCH-26-S{i:03d}", "side": ("yes", "no", "both")[i % 3], "shares": 100,
+         "pct_reload": 75, "repost_base": "market_mean", "cents_off": 1, "max_shares": 5000}
+        for i in range(n)
+    ]
+
+
+def scan_dispatch(stakes: list, orders: list) -> int:
+    hits = 0
+    for o in orders:
+        ticker = (o.get("ticker") or "").strip()
+        for stake in stakes:
+            if (stake.get("ticker") or "").strip() == ticker:
+                size = max(1, int(int(stake.get("shares") or 1) * int(stake.get("pct_reload") or 100) / 100))
+                hits += size > 0 and (stake.get("side") or "yes").lower() in (o["side"], "both")
+                break
+    return hits
+
+
+def index_dispatch(index: StakeIndex, orders: list) -> int:
+    hits = 0
+    for o in orders:
+        stake = index.get(o.get("ticker"), o.get("side"))
+        if stake is not None:
+            hits += stake.repost_size > 0 and stake.reposts(o["side"])
+    return hits
+
+
+def _time(label: str, n: int, fn) -> None:
+    t0 = time.perf_counter()
+    fn()
+    sec = time.perf_counter() - t0
+    print(f"  {label:<36} {sec * 1000:9.1f} ms  {sec / n * 1e6:8.1f} us/poll")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stakes", type=int, default=100)
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--polls", type=int, default=100)
+    args = parser.parse_args()
+    rng = random.Random(7)
+    stakes = _stakes(args.stakes)
+    orders = [{"ticker": rng.choice(stakes)["ticker"], "side": rng.choice(("yes", "no"))} for _ in range(args.orders)]
+
+    print(f"{args.polls} polls x {args.orders} executed orders x {args.stakes} stakes")
+    _time("scan stakes list", args.polls, lambda: [scan_dispatch(stakes, orders) for _ in range(args.polls)])
+    _time("StakeIndex (incl. build per poll)", args.polls,
+          lambda: [index_dispatch(StakeIndex(stakes), orders) for _ in range(args.polls)])
+    index = StakeIndex(stakes)
+    _time("StakeIndex", args.polls, lambda: [index_dispatch(index, orders) for _ in range(args.polls)])
+
+
+if __name__ == "__main__":
+    main()
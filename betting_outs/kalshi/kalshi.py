@@ -1,12 +1,14 @@
-import base64
 import os
 import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import websockets
+from requests.adapters import HTTPAdapter
 import time
 import json
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterator, Optional
 
 # Optional: load .env from project root when this module is run or imported from kalshi_api
 try:
@@ -18,11 +20,19 @@ try:
 except ImportError:
     pass
 
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding, rsa
-from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
 from cryptography.hazmat.backends import default_backend
 
+try:
+    from .kalshi_ratelimit import RateLimiter
+    from .kalshi_retry import RETRYABLE_STATUS, RetryPolicy, RetryStats
+    from .kalshi_signing import RequestSigner
+except ImportError:  # imported as a top-level module (kalshi_api.py puts this folder on sys.path)
+    from kalshi_ratelimit import RateLimiter
+    from kalshi_retry import RETRYABLE_STATUS, RetryPolicy, RetryStats
+    from kalshi_signing import RequestSigner
+
 
 KALSHI_API_KEY = os.getenv("KALSHI_API_KEY")
 
@@ -53,6 +63,78 @@ def load_private_key(path):
         raise RuntimeError(f"Failed to load private key: {e}")
 
 
+def make_session(pool_maxsize: int = 10) -> requests.Session:
+    """Build a keep-alive requests.Session with a bounded HTTP/1.1 connection pool.
+
+    pool_block=True makes threads wait for a pooled connection instead of opening
+    throwaway extra connections (each one a new TLS handshake). Retries are left to the caller.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_maxsize, pool_block=True, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+
+def drop_none(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Query params without the None entries (Kalshi treats empty values as filters)."""
+    return {k: v for k, v in params.items() if v is not None}
+
+
+def markets_params(
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    event_ticker: Optional[str] = None,
+    series_ticker: Optional[str] = None,
+    tickers: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Query params for GET /markets. Page size capped at 200; tickers sent lowercase."""
+    return drop_none({
+        'limit': min(limit or 200, 200),
+        'cursor': cursor,
+        'status': status,
+        'event_ticker': event_ticker.lower() if event_ticker else None,
+        'series_ticker': series_ticker.lower() if series_ticker else None,
+        'tickers': tickers.lower() if tickers else None,
+    })
+
+
+def order_body(
+    ticker: str,
+    action: str,
+    side: str,
+    count: int,
+    order_type: str = "limit",
+    yes_price: Optional[int] = None,
+    no_price: Optional[int] = None,
+    client_order_id: Optional[str] = None,
+    time_in_force: Optional[str] = None,
+    expiration_ts: Optional[int] = None,
+) -> Dict[str, Any]:
+    """JSON body for POST /portfolio/orders. Generates a client_order_id when none is given."""
+    body = {
+        "ticker": ticker,
+        "action": action,
+        "side": side,
+        "count": count,
+        "type": order_type,
+    }
+    if yes_price is not None:
+        body["yes_price"] = yes_price
+    if no_price is not None:
+        body["no_price"] = no_price
+    if client_order_id is None:
+        client_order_id = str(uuid.uuid4())
+    body["client_order_id"] = client_order_id
+    if time_in_force:
+        body["time_in_force"] = time_in_force
+    if expiration_ts is not None:
+        body["expiration_ts"] = expiration_ts
+    return body
+
+
 class KalshiBaseClient:
     """Base client class for interacting with the Kalshi API."""
     def __init__(
@@ -71,6 +153,8 @@ class KalshiBaseClient:
         self.key_id = key_id
         self.private_key = private_key
         self.environment = environment
+        # Precomputed padding/static headers plus per-sign latency counters (signer.stats()).
+        self.signer = RequestSigner(key_id, private_key)
         self.last_api_call = datetime.now()
 
         if self.environment == "DEMO":
@@ -84,62 +168,67 @@ class KalshiBaseClient:
 
     def request_headers(self, method: str, path: str) -> Dict[str, Any]:
         """Generates the required authentication headers for API requests."""
-        current_time_milliseconds = int(time.time() * 1000)
-        timestamp_str = str(current_time_milliseconds)
+        return self.signer.headers(method, path)
 
-        # Remove query params from path
-        path_parts = path.split('?')
-
-        msg_string = timestamp_str + method + path_parts[0]
-        signature = self.sign_pss_text(msg_string)
-
-        headers = {
-            "Content-Type": "application/json",
-            "KALSHI-ACCESS-KEY": self.key_id,
-            "KALSHI-ACCESS-SIGNATURE": signature,
-            "KALSHI-ACCESS-TIMESTAMP": timestamp_str,
-        }
-        return headers
+    def request_headers_many(self, requests: list[tuple[str, str]]) -> list[Dict[str, Any]]:
+        """Authentication headers for several (method, path) pairs in one call (batch operations)."""
+        return self.signer.headers_many(requests)
 
     def sign_pss_text(self, text: str) -> str:
         """Signs the text using RSA-PSS and returns the base64 encoded signature."""
-        message = text.encode('utf-8')
-        try:
-            signature = self.private_key.sign(
-                message,
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.DIGEST_LENGTH
-                ),
-                hashes.SHA256()
-            )
-            return base64.b64encode(signature).decode('utf-8')
-        except InvalidSignature as e:
-            raise ValueError("RSA sign PSS failed") from e
+        return self.signer.sign(text)
 
 class KalshiHttpClient(KalshiBaseClient):
-    """Client for handling HTTP connections to the Kalshi API."""
+    """Client for handling HTTP connections to the Kalshi API.
+
+    Owns one pooled keep-alive requests.Session, so repeated calls reuse the same
+    TCP+TLS connection instead of paying a fresh handshake per request. The session's
+    connection pool is thread-safe; one client may be shared by several threads.
+    """
+    # Max keep-alive connections kept open to the API host. Threads beyond this wait for a free one.
+    DEFAULT_POOL_MAXSIZE = 10
+    # (connect, read) timeout in seconds for every request.
+    DEFAULT_TIMEOUT = (3.05, 10.0)
+
     def __init__(
         self,
         key_id: str,
         private_key: rsa.RSAPrivateKey,
         environment: str = "DEMO",
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        timeout: Optional[tuple[float, float]] = DEFAULT_TIMEOUT,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
     ):
         super().__init__(key_id, private_key, environment)
         self.host = self.HTTP_BASE_URL
         self.exchange_url = "/trade-api/v2/exchange"
         self.markets_url = "/trade-api/v2/markets"
         self.portfolio_url = "/trade-api/v2/portfolio"
-
-    # Kalshi rate limits: Basic 20 read / 10 write per second. We throttle all calls to stay under write limit.
-    RATE_LIMIT_MIN_INTERVAL_SEC = 0.12  # ~8 calls/sec max; no infinite loops or recursion.
-
-    def rate_limit(self) -> None:
-        """Enforce minimum interval between API calls. Never exceed account rate limit."""
-        now = datetime.now()
-        elapsed = (now - self.last_api_call).total_seconds()
-        if elapsed < self.RATE_LIMIT_MIN_INTERVAL_SEC:
-            time.sleep(self.RATE_LIMIT_MIN_INTERVAL_SEC - elapsed)
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self.session = make_session(pool_maxsize)
+        # Separate read/write token buckets; pass one limiter to several clients to share a budget.
+        self.rate_limiter = rate_limiter or RateLimiter.from_env()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_stats = RetryStats()
+
+    def close(self) -> None:
+        """Close pooled connections. The client must not be used afterwards."""
+        self.session.close()
+
+    def __enter__(self) -> "KalshiHttpClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # Kalshi rate limits: Basic 20 read / 10 write per second, metered separately.
+    # GETs spend the read bucket, POST/DELETE the write bucket (see kalshi_ratelimit.py).
+
+    def rate_limit(self, kind: str = "read", cost: float = 1.0) -> None:
+        """Wait for cost tokens from the read or write budget. Never exceed account rate limit."""
+        self.rate_limiter.acquire(kind, cost)
         self.last_api_call = datetime.now()
 
     def raise_if_bad_response(self, response: requests.Response) -> None:
@@ -147,40 +236,88 @@ class KalshiHttpClient(KalshiBaseClient):
         if response.status_code not in range(200, 299):
             response.raise_for_status()
 
-    def post(self, path: str, body: dict) -> Any:
-        """Performs an authenticated POST request to the Kalshi API."""
-        self.rate_limit()
-        response = requests.post(
-            self.host + path,
-            json=body,
-            headers=self.request_headers("POST", path)
-        )
-        self.raise_if_bad_response(response)
+    def _request(
+        self,
+        method: str,
+        path: str,
+        kind: str,
+        cost: float = 1.0,
+        retry: bool = False,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Send one signed request (re-signed per attempt) and return the successful response.
+
+        Every 429 lowers the limiter's rate for this kind. With retry=True, 429/5xx responses and
+        connection errors/timeouts are retried per retry_policy, honouring Retry-After. An HTTPError
+        raised after at least one retry carries .retried = number of retries made.
+        """
+        attempt = 0
+        while True:
+            self.rate_limit(kind, cost)
+            try:
+                response = self.session.request(
+                    method,
+                    self.host + path,
+                    headers=self.request_headers(method, path),
+                    timeout=self.timeout,
+                    **kwargs,
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                self.retry_stats.add("network_errors")
+                delay = self.retry_policy.delay_for(attempt) if retry else None
+                if delay is None:
+                    if attempt:
+                        self.retry_stats.add("gave_up")
+                    raise
+            else:
+                status = response.status_code
+                if status == 429:
+                    self.retry_stats.add("throttled")
+                    self.rate_limiter.throttled(kind)
+                elif status >= 500:
+                    self.retry_stats.add("server_errors")
+                elif status < 300:
+                    self.rate_limiter.succeeded(kind)
+                    return response
+                delay = None
+                if retry and status in RETRYABLE_STATUS:
+                    delay = self.retry_policy.delay_for(attempt, response.headers)
+                if delay is None:
+                    if attempt and status in RETRYABLE_STATUS:
+                        self.retry_stats.add("gave_up")
+                    try:
+                        self.raise_if_bad_response(response)
+                    except requests.HTTPError as e:
+                        e.retried = attempt
+                        raise
+                    return response
+            attempt += 1
+            self.retry_stats.add("retries")
+            self.retry_stats.add("backoff_sec", delay)
+            time.sleep(delay)
+
+    def post(self, path: str, body: dict, cost: float = 1.0, retry: bool = False) -> Any:
+        """Performs an authenticated POST request to the Kalshi API. cost: write tokens to spend.
+        retry=True only for bodies that are safe to resend (e.g. orders with a fixed client_order_id)."""
+        response = self._request("POST", path, "write", cost=cost, retry=retry, json=body)
         return response.json()
 
     def get(self, path: str, params: Dict[str, Any] = {}) -> Any:
-        """Performs an authenticated GET request to the Kalshi API."""
-        self.rate_limit()
-        response = requests.get(
-            self.host + path,
-            headers=self.request_headers("GET", path),
-            params=params
-        )
-        self.raise_if_bad_response(response)
+        """Performs an authenticated GET request to the Kalshi API. Reads are retried with backoff."""
+        response = self._request("GET", path, "read", retry=True, params=params)
         return response.json()
 
-    def delete(self, path: str, params: Dict[str, Any] = None, json_body: Optional[dict] = None) -> Any:
-        """Performs an authenticated DELETE request to the Kalshi API."""
-        self.rate_limit()
-        kwargs = {"headers": self.request_headers("DELETE", path), "params": params or {}}
+    def delete(self, path: str, params: Dict[str, Any] = None, json_body: Optional[dict] = None, cost: float = 1.0) -> Any:
+        """Performs an authenticated DELETE request to the Kalshi API. cost: write tokens to spend."""
+        kwargs = {"params": params or {}}
         if json_body is not None:
             kwargs["json"] = json_body
-        response = requests.delete(self.host + path, **kwargs)
-        self.raise_if_bad_response(response)
+        response = self._request("DELETE", path, "write", cost=cost, **kwargs)
         return response.json() if response.content else {}
 
     def batch_cancel_orders(self, order_ids: list[str]) -> Dict[str, Any]:
-        """Cancel multiple orders in one request. Kalshi limits to 20 per batch. Returns batch response."""
+        """Cancel multiple orders in one request. Kalshi limits to 20 per batch. Returns batch response.
+        Kalshi counts each cancel in a batch as 0.2 of a write."""
         BATCH_SIZE = 20
         all_results = {"cancelled_orders": [], "batch_responses": []}
         for i in range(0, len(order_ids), BATCH_SIZE):
@@ -189,6 +326,7 @@ class KalshiHttpClient(KalshiBaseClient):
                 resp = self.delete(
                     self.portfolio_url + "/orders/batched",
                     json_body={"ids": batch},
+                    cost=0.2 * len(batch),
                 )
                 all_results["batch_responses"].append(resp)
                 all_results["cancelled_orders"].extend(batch)
@@ -213,18 +351,20 @@ class KalshiHttpClient(KalshiBaseClient):
         min_ts: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Retrieves trades based on provided filters."""
-        params = {
+        params = drop_none({
             'ticker': ticker,
             'limit': limit,
             'cursor': cursor,
             'max_ts': max_ts,
             'min_ts': min_ts,
-        }
-        params = {k: v for k, v in params.items() if v is not None}
+        })
         return self.get(self.markets_url + '/trades', params=params)
 
     # Hard cap for batch order operations; no recursion or unbounded loops.
-    MAX_BATCH_ORDERS = 10
+    # Orders per POST /portfolio/orders/batched (server limit).
+    MAX_BATCH_CREATE = 20
+    # Cap for batch_place_orders (the desktop "Place all" button): one batched request.
+    MAX_BATCH_ORDERS = MAX_BATCH_CREATE
 
     def get_markets(
         self,
@@ -237,15 +377,7 @@ class KalshiHttpClient(KalshiBaseClient):
     ) -> Dict[str, Any]:
         """Get markets. Use event_ticker for an event, series_ticker for a series, or tickers (comma-separated) for specific markets.
         status: open, closed, settled; omit for any. Tickers sent lowercase to match Kalshi URLs."""
-        params = {
-            'limit': min(limit or 200, 200),
-            'cursor': cursor,
-            'status': status,
-            'event_ticker': event_ticker.lower() if event_ticker else None,
-            'series_ticker': series_ticker.lower() if series_ticker else None,
-            'tickers': tickers.lower() if tickers else None,
-        }
-        params = {k: v for k, v in params.items() if v is not None}
+        params = markets_params(limit, cursor, status, event_ticker, series_ticker, tickers)
         return self.get(self.markets_url, params=params)
 
     def get_orders(
@@ -257,14 +389,13 @@ class KalshiHttpClient(KalshiBaseClient):
         ticker: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Get portfolio orders. status: resting, canceled, executed."""
-        params = {
+        params = drop_none({
             'limit': limit,
             'cursor': cursor,
             'status': status,
             'event_ticker': event_ticker,
             'ticker': ticker,
-        }
-        params = {k: v for k, v in params.items() if v is not None}
+        })
         return self.get(self.portfolio_url + '/orders', params=params)
 
     def get_positions(
@@ -273,14 +404,119 @@ class KalshiHttpClient(KalshiBaseClient):
         cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Get portfolio positions."""
-        params = {'limit': limit, 'cursor': cursor}
-        params = {k: v for k, v in params.items() if v is not None}
+        params = drop_none({'limit': limit, 'cursor': cursor})
         return self.get(self.portfolio_url + '/positions', params=params)
 
+    def get_fills(
+        self,
+        ticker: Optional[str] = None,
+        order_id: Optional[str] = None,
+        min_ts: Optional[int] = None,
+        max_ts: Optional[int] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Get this account's fills, newest first. min_ts/max_ts are Unix seconds."""
+        params = drop_none({
+            'ticker': ticker,
+            'order_id': order_id,
+            'min_ts': min_ts,
+            'max_ts': max_ts,
+            'limit': limit,
+            'cursor': cursor,
+        })
+        return self.get(self.portfolio_url + '/fills', params=params)
+
+    # Page size the iter_* helpers request (Kalshi's maximum for these list endpoints).
+    PAGE_LIMIT = 200
+
+    def paginate(self, fetch: Callable[..., Dict[str, Any]], items_key: str, **params: Any) -> Iterator[Dict[str, Any]]:
+        """Yield items_key entries from fetch(cursor=..., **params), following Kalshi's cursor one page
+        at a time. Only the current page is held in memory. Stops on an empty or repeated cursor."""
+        cursor = None
+        while True:
+            page = fetch(cursor=cursor, **params)
+            yield from page.get(items_key) or []
+            next_cursor = page.get("cursor")
+            if not next_cursor or next_cursor == cursor:
+                return
+            cursor = next_cursor
+
+    def iter_markets(
+        self,
+        status: Optional[str] = None,
+        event_ticker: Optional[str] = None,
+        series_ticker: Optional[str] = None,
+        tickers: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Every market matching the filters, across all pages."""
+        return self.paginate(
+            self.get_markets, "markets", limit=self.PAGE_LIMIT, status=status,
+            event_ticker=event_ticker, series_ticker=series_ticker, tickers=tickers,
+        )
+
+    def iter_orders(
+        self,
+        status: Optional[str] = None,
+        event_ticker: Optional[str] = None,
+        ticker: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Every portfolio order matching the filters, across all pages (not just the first 200)."""
+        return self.paginate(
+            self.get_orders, "orders", limit=self.PAGE_LIMIT, status=status,
+            event_ticker=event_ticker, ticker=ticker,
+        )
+
+    def iter_positions(self) -> Iterator[Dict[str, Any]]:
+        """Every market position, across all pages."""
+        return self.paginate(self.get_positions, "market_positions", limit=self.PAGE_LIMIT)
+
+    def iter_trades(
+        self,
+        ticker: Optional[str] = None,
+        min_ts: Optional[int] = None,
+        max_ts: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Every public trade matching the filters, across all pages."""
+        return self.paginate(
+            self.get_trades, "trades", limit=self.PAGE_LIMIT, ticker=ticker, min_ts=min_ts, max_ts=max_ts,
+        )
+
+    def iter_fills(
+        self,
+        ticker: Optional[str] = None,
+        order_id: Optional[str] = None,
+        min_ts: Optional[int] = None,
+        max_ts: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Every fill matching the filters, across all pages. With min_ts this is only the fills
+        since a watermark, so incremental polling costs O(new fills)."""
+        return self.paginate(
+            self.get_fills, "fills", limit=self.PAGE_LIMIT, ticker=ticker, order_id=order_id,
+            min_ts=min_ts, max_ts=max_ts,
+        )
+
     def get_orderbook(self, ticker: str) -> Dict[str, Any]:
         """Get order book for a market. Returns {orderbook: {yes: [[price, qty], ...], no: [...]}}."""
         return self.get(self.markets_url + '/' + ticker + '/orderbook')
 
+    def get_orderbooks(self, tickers: list[str]) -> Dict[str, Any]:
+        """Fetch many orderbooks concurrently. Returns {ticker: response or Exception}.
+        One thread per pooled connection, so the requests overlap within the read budget instead
+        of paying a round trip each in turn."""
+        if len(tickers) <= 1:
+            results = {}
+            for t in tickers:
+                try:
+                    results[t] = self.get_orderbook(t)
+                except Exception as e:
+                    results[t] = e
+            return results
+        workers = min(len(tickers), self.pool_maxsize)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kalshi-orderbook") as pool:
+            futures = {t: pool.submit(self.get_orderbook, t) for t in tickers}
+        return {t: (f.exception() or f.result()) for t, f in futures.items()}
+
     def create_order(
         self,
         ticker: str,
@@ -301,57 +537,118 @@ class KalshiHttpClient(KalshiBaseClient):
         - yes_price/no_price: cents (1–99)
         - time_in_force (REST): fill_or_kill, good_till_canceled, immediate_or_cancel
         - expiration_ts: Unix seconds when the order should expire (REST currently still appears as GTC when set)."""
-        body = {
-            "ticker": ticker,
-            "action": action,
-            "side": side,
-            "count": count,
-            "type": order_type,
-        }
-        if yes_price is not None:
-            body["yes_price"] = yes_price
-        if no_price is not None:
-            body["no_price"] = no_price
-        if client_order_id is None:
-            client_order_id = str(uuid.uuid4())
-        body["client_order_id"] = client_order_id
-        if time_in_force:
-            body["time_in_force"] = time_in_force
-        if expiration_ts is not None:
-            body["expiration_ts"] = expiration_ts
-        return self.post(self.portfolio_url + '/orders', body)
+        body = order_body(
+            ticker, action, side, count, order_type, yes_price, no_price,
+            client_order_id, time_in_force, expiration_ts,
+        )
+        # The client_order_id is fixed before the first attempt, so a retry can never double-place:
+        # if an earlier attempt did land, Kalshi answers 409 and we return the order it created.
+        try:
+            return self.post(self.portfolio_url + '/orders', body, retry=True)
+        except requests.HTTPError as e:
+            if getattr(e, "retried", 0) and e.response is not None and e.response.status_code == 409:
+                existing = self.find_order_by_client_id(ticker, body["client_order_id"])
+                if existing is not None:
+                    return {"order": existing}
+            raise
+
+    def find_order_by_client_id(self, ticker: str, client_order_id: str) -> Optional[Dict[str, Any]]:
+        """Most recent order on ticker with this client_order_id, or None."""
+        for o in self.iter_orders(ticker=ticker):
+            if o.get("client_order_id") == client_order_id:
+                return o
+        return None
 
     def cancel_order(self, order_id: str) -> Dict[str, Any]:
         """Cancel an order by id."""
         return self.delete(self.portfolio_url + '/orders/' + order_id)
 
-    def batch_place_orders(
+    def amend_order(
         self,
-        orders: list,
+        order_id: str,
+        ticker: str,
+        side: str,
+        action: str,
+        count: int,
+        yes_price: Optional[int] = None,
+        no_price: Optional[int] = None,
+        client_order_id: Optional[str] = None,
+        updated_client_order_id: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Place up to MAX_BATCH_ORDERS orders sequentially with rate limiting. No recursion.
-        Each item: {ticker, side, count, yes_price?, no_price?, action?}. Returns {placed: [], errors: []}."""
-        results = {"placed": [], "errors": []}
-        cap = min(len(orders), self.MAX_BATCH_ORDERS)
-        for i in range(cap):
-            o = orders[i]
-            try:
-                self.rate_limit()
-                res = self.create_order(
-                    ticker=o["ticker"],
-                    action=o.get("action", "buy"),
-                    side=o["side"],
-                    count=int(o["count"]),
-                    yes_price=o.get("yes_price"),
-                    no_price=o.get("no_price"),
-                    time_in_force=o.get("time_in_force"),
-                    expiration_ts=int(o["expiration_ts"]) if isinstance(o.get("expiration_ts"), (int, float)) else None,
+        """Change a resting order's price and/or size in place: one write instead of cancel + create,
+        and the leg is never uncovered. count is the new max fillable (fill_count + remaining).
+        Returns {old_order, order}."""
+        body = {"ticker": ticker, "side": side, "action": action, "count": count}
+        if yes_price is not None:
+            body["yes_price"] = yes_price
+        if no_price is not None:
+            body["no_price"] = no_price
+        if client_order_id:
+            body["client_order_id"] = client_order_id
+        if updated_client_order_id:
+            body["updated_client_order_id"] = updated_client_order_id
+        return self.post(self.portfolio_url + '/orders/' + order_id + '/amend', body)
+
+    def decrease_order(
+        self, order_id: str, reduce_by: Optional[int] = None, reduce_to: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Shrink a resting order by reduce_by contracts or down to reduce_to remaining.
+        Keeps the order's queue position. Returns {order}."""
+        body = {"reduce_by": reduce_by} if reduce_by is not None else {"reduce_to": reduce_to}
+        return self.post(self.portfolio_url + '/orders/' + order_id + '/decrease', body)
+
+    def batch_create_orders(self, orders: list) -> list[Dict[str, Any]]:
+        """Create many orders with POST /portfolio/orders/batched, MAX_BATCH_CREATE per request.
+        Each item takes create_order's arguments: {ticker, side, count, action?, yes_price?, no_price?,
+        client_order_id?, time_in_force?, expiration_ts?, type?}. Each order in a batch costs one write.
+
+        Returns one result per input, in input order: {"order": {...}} or {"error": ...}. Batches are
+        not retried (a retry could not tell which orders landed); the caller's next reconcile does."""
+        results: list[Dict[str, Any]] = []
+        for start in range(0, len(orders), self.MAX_BATCH_CREATE):
+            chunk = orders[start : start + self.MAX_BATCH_CREATE]
+            bodies = [
+                order_body(
+                    o["ticker"], o.get("action", "buy"), o["side"], int(o["count"]), o.get("type", "limit"),
+                    o.get("yes_price"), o.get("no_price"), o.get("client_order_id"), o.get("time_in_force"),
+                    int(o["expiration_ts"]) if isinstance(o.get("expiration_ts"), (int, float)) else None,
                 )
-                results["placed"].append(res)
+                for o in chunk
+            ]
+            try:
+                resp = self.post(self.portfolio_url + '/orders/batched', {"orders": bodies}, cost=len(bodies))
             except Exception as e:
-                results["errors"].append({"index": i, "ticker": o.get("ticker"), "error": str(e)})
+                results.extend({"error": str(e)} for _ in chunk)
+                continue
+            # Responses come back in request order; match by client_order_id when present.
+            by_cid = {r.get("client_order_id"): r for r in resp.get("orders") or [] if r.get("client_order_id")}
+            listed = resp.get("orders") or []
+            for i, body in enumerate(bodies):
+                r = by_cid.get(body["client_order_id"]) or (listed[i] if i < len(listed) else {})
+                if r.get("order"):
+                    results.append({"order": r["order"]})
+                else:
+                    results.append({"error": r.get("error") or "no result for order"})
         return results
 
+    def batch_place_orders(
+        self,
+        orders: list,
+    ) -> Dict[str, Any]:
+        """Place up to MAX_BATCH_ORDERS orders in one batched create (see batch_create_orders).
+        Each item: {ticker, side, count, yes_price?, no_price?, action?, time_in_force?, expiration_ts?}.
+        Returns {placed: [{order}], errors: [{index, ticker, error}], results: [one per input, in order]}."""
+        cap = min(len(orders), self.MAX_BATCH_ORDERS)
+        results = self.batch_create_orders(orders[:cap])
+        results += [{"error": f"over the {self.MAX_BATCH_ORDERS} order limit per batch"}] * (len(orders) - cap)
+        out = {"placed": [], "errors": [], "results": results}
+        for i, r in enumerate(results):
+            if "order" in r:
+                out["placed"].append(r)
+            else:
+                out["errors"].append({"index": i, "ticker": orders[i].get("ticker"), "error": r["error"]})
+        return out
+
 class KalshiWebSocketClient(KalshiBaseClient):
     """Client for handling WebSocket connections to the Kalshi API."""
     def __init__(
@@ -414,8 +711,8 @@ class KalshiWebSocketClient(KalshiBaseClient):
         print("WebSocket connection closed with code:", close_status_code, "and message:", close_msg)
 
 
-def get_client(environment: str = "DEMO"):
-    """Build HTTP client from env. Needs KALSHI_API_KEY (your Key ID from Kalshi). PEM path: KALSHI_PRIVATE_KEY_PATH or tocotoucan.pem in this folder."""
+def credentials_from_env() -> tuple[str, rsa.RSAPrivateKey]:
+    """(key_id, private_key) from KALSHI_API_KEY and the PEM at KALSHI_PRIVATE_KEY_PATH or tocotoucan.pem in this folder."""
     key_id = os.getenv("KALSHI_API_KEY")
     if not key_id:
         raise ValueError(
@@ -423,8 +720,49 @@ def get_client(environment: str = "DEMO"):
             "PEM: put tocotoucan.pem in betting_outs/kalshi or set KALSHI_PRIVATE_KEY_PATH."
         )
     key_path = _default_private_key_path()
-    key = load_private_key(key_path)
-    return KalshiHttpClient(key_id, key, environment)
+    return key_id, load_private_key(key_path)
+
+
+def get_client(environment: str = "DEMO", **client_kwargs: Any):
+    """Build HTTP client from env. Needs KALSHI_API_KEY (your Key ID from Kalshi). PEM path: KALSHI_PRIVATE_KEY_PATH or tocotoucan.pem in this folder.
+    client_kwargs are passed to KalshiHttpClient (pool_maxsize, timeout, rate_limiter)."""
+    key_id, key = credentials_from_env()
+    return KalshiHttpClient(key_id, key, environment, **client_kwargs)
+
+
+# Process-wide clients, one per environment: {env: (key fingerprint, client)}.
+_shared_clients: Dict[str, tuple] = {}
+# One limiter per environment, kept across client rebuilds so a key rotation never resets the budget.
+_shared_limiters: Dict[str, RateLimiter] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_client(environment: str = "DEMO") -> KalshiHttpClient:
+    """Cached HTTP client for this environment, shared by every caller in the process.
+
+    Holds the parsed PEM and the pooled session, so repeat calls cost one os.stat instead of a
+    key load. Rebuilt automatically when KALSHI_API_KEY or the PEM file (path, mtime, size) changes;
+    the rebuilt client keeps the same RateLimiter so concurrent callers share one account budget.
+    """
+    key_id = os.getenv("KALSHI_API_KEY")
+    key_path = _default_private_key_path() if key_id else None
+    try:
+        st = os.stat(key_path) if key_path else None
+    except OSError:
+        st = None
+    fingerprint = (key_id, key_path, st.st_mtime_ns if st else None, st.st_size if st else None)
+    with _shared_lock:
+        cached = _shared_clients.get(environment)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        key_id, key = credentials_from_env()  # raises the usual setup errors
+        limiter = _shared_limiters.get(environment)
+        if limiter is None:
+            limiter = _shared_limiters[environment] = RateLimiter.from_env()
+        client = KalshiHttpClient(key_id, key, environment, rate_limiter=limiter)
+        _shared_clients[environment] = (fingerprint, client)
+        # The replaced client is not closed: another thread may still be mid-request on it.
+        return client
 
 
 if __name__ == "__main__":
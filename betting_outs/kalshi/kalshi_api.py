@@ -3,11 +3,15 @@ Local HTTP API for the desktop app to call Kalshi.
 Run from project root: python betting_outs/kalshi/kalshi_api.py
 Listens on http://127.0.0.1:8766 by default. Loads .env from project root.
 Env vars: KALSHI_API_KEY, KALSHI_PRIVATE_KEY_PATH, KALSHI_API_PORT, KALSHI_API_HOST.
+Pass --asgi to serve under uvicorn instead of Flask's server (async read routes; see asgi_server.py).
 Set KALSHI_API_HOST=0.0.0.0 on VPS so the desktop app can connect remotely.
 All routes accept ?env=demo or ?env=prod (default demo).
 """
 import os
+import re
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Load .env from project root so KALSHI_API_KEY and KALSHI_PRIVATE_KEY_PATH are set
 _here = os.path.dirname(os.path.abspath(__file__))
@@ -19,13 +23,14 @@ if os.path.isfile(_env_path):
         load_dotenv(_env_path)
     except ImportError:
         pass
-if _here not in sys.path:
-    sys.path.insert(0, _here)
+# Import the client as betting_outs.kalshi.kalshi (not a bare "kalshi") so this server and any
+# in-process bot code share one module, and with it one client cache and rate limiter.
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
 
 from urllib.parse import urlencode
 
-import requests
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 
 app = Flask(__name__)
 
@@ -38,13 +43,31 @@ KALSHI_HOST = os.getenv("KALSHI_API_HOST", "127.0.0.1")
 
 
 def env_from_request():
-    e = (request.args.get("env") or "demo").strip().upper()
+    return env_from(request.args.get("env"))
+
+
+def env_from(value):
+    e = (value or "demo").strip().upper()
     return "DEMO" if e == "DEMO" else "PROD"
 
 
+def int_arg(args, name):
+    """Integer query arg, or None when missing or not an integer (Flask's args.get(name, type=int))."""
+    try:
+        return int(args[name])
+    except (KeyError, ValueError):
+        return None
+
+
+def get_market_cache():
+    from betting_outs.kalshi.kalshi_cache import get_market_cache as _get_market_cache
+    return _get_market_cache()
+
+
 def get_client():
-    from kalshi import get_client
-    return get_client(env_from_request())
+    """Process-wide cached client for the request's environment (parsed key, pooled session, shared rate limiter)."""
+    from betting_outs.kalshi.kalshi import get_shared_client
+    return get_shared_client(env_from_request())
 
 
 @app.route("/health")
@@ -97,23 +120,31 @@ def positions():
         return jsonify({"error": str(e)}), 500
 
 
+def markets_query(args):
+    """GET /markets params passed through from the request's query args."""
+    # Match the working test script: do NOT force a limit param; let Kalshi defaults apply.
+    url_params = {}
+    for key in ("limit", "cursor", "status", "event_ticker", "series_ticker", "tickers"):
+        v = args.get(key)
+        if v is not None and str(v).strip():
+            url_params[key] = str(v).strip()
+    return url_params
+
+
+def markets_url(env, url_params):
+    return KALSHI_BASE_URL.get(env, KALSHI_BASE_URL["DEMO"]) + MARKETS_PATH + "?" + urlencode(url_params)
+
+
 @app.route("/markets")
 def markets():
-    """Call Kalshi markets API the same way as the working test_series.py: simple GET, no auth, preserve ticker case."""
+    """Call Kalshi markets API the same way as the working test_series.py: simple GET, no auth, preserve ticker case.
+    Responses are cached briefly per query (kalshi_cache.py); ?fresh=1 skips the cache."""
     try:
         env = env_from_request()
-        base = KALSHI_BASE_URL.get(env, KALSHI_BASE_URL["DEMO"])
-        # Match the working test script: do NOT force a limit param; let Kalshi defaults apply.
-        url_params = {}
-        for key in ("limit", "cursor", "status", "event_ticker", "series_ticker", "tickers"):
-            v = request.args.get(key)
-            if v is not None and str(v).strip():
-                url_params[key] = str(v).strip()
-        request_url = base + MARKETS_PATH + "?" + urlencode(url_params)
-        resp = requests.get(request_url, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
-        data["request_url"] = request_url
+        url_params = markets_query(request.args)
+        fresh = request.args.get("fresh") in ("1", "true")
+        data = dict(get_market_cache().markets(env, url_params, fresh=fresh))
+        data["request_url"] = markets_url(env, url_params)
         return jsonify(data)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -121,30 +152,20 @@ def markets():
 
 @app.route("/market-reciprocal")
 def market_reciprocal():
-    """If the given ticker's event has exactly 2 markets, return the other market's ticker (for binary pairs like Team A vs Team B). Else 404."""
+    """If the given ticker's event has exactly 2 markets, return the other market's ticker (for binary pairs like Team A vs Team B). Else 404.
+    Answered from the market cache's ticker -> event -> markets index once the event has been seen."""
     try:
         ticker = (request.args.get("ticker") or "").strip()
         if not ticker:
             return jsonify({"error": "ticker required"}), 400
         env = env_from_request()
-        base = KALSHI_BASE_URL.get(env, KALSHI_BASE_URL["DEMO"])
-        # Get this market to learn event_ticker (no auth)
-        url_one = base + MARKETS_PATH + "?" + urlencode({"tickers": ticker})
-        resp = requests.get(url_one, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-        markets_one = data.get("markets") or []
-        if not markets_one:
-            return jsonify({"error": "Market not found", "ticker": ticker}), 404
-        event_ticker = (markets_one[0].get("event_ticker") or "").strip()
-        if not event_ticker:
+        cache = get_market_cache()
+        event_ticker = cache.event_ticker(env, ticker)
+        if event_ticker is None:
+            if not (cache.markets(env, {"tickers": ticker}).get("markets") or []):
+                return jsonify({"error": "Market not found", "ticker": ticker}), 404
             return jsonify({"error": "Market has no event_ticker", "ticker": ticker}), 404
-        # Get all markets for this event
-        url_event = base + MARKETS_PATH + "?" + urlencode({"event_ticker": event_ticker})
-        resp2 = requests.get(url_event, timeout=10)
-        resp2.raise_for_status()
-        data2 = resp2.json()
-        event_markets = data2.get("markets") or []
+        event_markets = cache.event_markets(env, event_ticker)
         if len(event_markets) != 2:
             return jsonify({"error": "Event does not have exactly 2 markets", "event_ticker": event_ticker, "count": len(event_markets)}), 404
         ticker_norm = ticker.strip().upper()
@@ -157,6 +178,12 @@ def market_reciprocal():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/cache/stats")
+def cache_stats():
+    """Market metadata cache counters: hits, misses, coalesced (waited on an in-flight fetch), entries."""
+    return jsonify(get_market_cache().stats())
+
+
 @app.route("/order", methods=["POST"])
 def create_order():
     try:
@@ -217,7 +244,8 @@ def cancel_order(order_id):
 
 @app.route("/orders/batch", methods=["POST"])
 def batch_place_orders():
-    """Place multiple orders sequentially with rate limiting. Body: { orders: [{ ticker, side, count, yes_price?, no_price?, time_in_force?, expiration_ts? }, ...] }. Max 10 per request."""
+    """Place multiple orders in one batched create. Body: { orders: [{ ticker, side, count, yes_price?, no_price?, time_in_force?, expiration_ts? }, ...] }. Max 20 per request.
+    Returns { placed, errors: [{ index, ticker, error }], results } with results in input order."""
     try:
         client = get_client()
         body = request.get_json() or {}
@@ -237,46 +265,447 @@ def batch_place_orders():
 
 # ---- Orderbook proxy ----
 
+# Kalshi market tickers: upper-case letters, digits, "-", "." and "_".
+TICKER_RE = re.compile(r"^[A-Z0-9][A-Z0-9._-]{0,99}$")
+
+
+def normalize_ticker(ticker):
+    """Upper-cased, stripped ticker, or None if it cannot be a Kalshi market ticker."""
+    t = str(ticker or "").strip().upper()
+    return t if TICKER_RE.match(t) else None
+
+
+# Orderbooks are public: fetched without auth on their own pooled session and concurrency cap, so
+# the proxy neither needs a key nor spends the signed client's read budget the bots share.
+PUBLIC_ORDERBOOK_CONCURRENCY = 8
+_public_session = None
+_public_session_lock = threading.Lock()
+
+
+def public_session():
+    """Process-wide keep-alive session for Kalshi's unauthenticated market data endpoints."""
+    global _public_session
+    with _public_session_lock:
+        if _public_session is None:
+            from betting_outs.kalshi.kalshi import make_session
+            _public_session = make_session(PUBLIC_ORDERBOOK_CONCURRENCY)
+        return _public_session
+
+
+def public_orderbook(env, ticker):
+    """Unauthenticated GET /markets/{ticker}/orderbook."""
+    base = KALSHI_BASE_URL.get(env, KALSHI_BASE_URL["DEMO"])
+    resp = public_session().get(f"{base}{MARKETS_PATH}/{ticker}/orderbook", timeout=10)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def public_orderbooks(env, tickers):
+    """{ticker: response or Exception}, at most PUBLIC_ORDERBOOK_CONCURRENCY requests at a time."""
+    workers = min(len(tickers), PUBLIC_ORDERBOOK_CONCURRENCY)
+    with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="kalshi-public-orderbook") as pool:
+        futures = {t: pool.submit(public_orderbook, env, t) for t in tickers}
+    return {t: (f.exception() or f.result()) for t, f in futures.items()}
+
+
+def live_orderbook(env, ticker):
+    """Synced book for ticker from the local market-data service, or None. Never waits: a ticker
+    the service does not have yet is subscribed for next time and this request goes to REST."""
+    from betting_outs.kalshi.kalshi_marketdata import get_marketdata_client
+    md = get_marketdata_client(env)
+    if md is None:
+        return None
+    md.add_tickers([ticker])
+    return md.book(ticker)
+
+
 @app.route("/markets/<ticker>/orderbook")
 def market_orderbook(ticker):
-    """Proxy to Kalshi GET /markets/{ticker}/orderbook (no auth required)."""
+    """Proxy to Kalshi GET /markets/{ticker}/orderbook (no auth required).
+    Served from the local market-data service's live book when it is running (adds "source": "live")."""
     try:
         env = env_from_request()
-        base = KALSHI_BASE_URL.get(env, KALSHI_BASE_URL["DEMO"])
-        url = f"{base}/trade-api/v2/markets/{ticker}/orderbook"
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
-        return jsonify(resp.json())
+        ticker = normalize_ticker(ticker)
+        if ticker is None:
+            return jsonify({"error": "invalid ticker"}), 400
+        book = live_orderbook(env, ticker)
+        if book is not None:
+            return jsonify({"orderbook": {"yes": book.to_levels("yes"), "no": book.to_levels("no")}, "source": "live"})
+        return jsonify(public_orderbook(env, ticker))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+MAX_BULK_ORDERBOOKS = 100
+
+
+def parse_orderbooks_request(body):
+    """(tickers, depth) from a POST /orderbooks body; ValueError if malformed."""
+    tickers = (body or {}).get("tickers") or []
+    if not isinstance(tickers, list):
+        raise ValueError("tickers must be a list")
+    normalized = [normalize_ticker(t) for t in tickers if t and str(t).strip()]
+    if None in normalized:
+        raise ValueError("invalid ticker: " + repr(next(t for t, n in zip(tickers, normalized) if n is None)))
+    tickers = list(dict.fromkeys(normalized))
+    if len(tickers) > MAX_BULK_ORDERBOOKS:
+        raise ValueError(f"at most {MAX_BULK_ORDERBOOKS} tickers per request")
+    depth = (body or {}).get("depth")
+    depth = int(depth) if depth is not None else None
+    if depth is not None and depth < 1:
+        raise ValueError("depth must be at least 1")
+    return tickers, depth
+
+
+def known_orderbooks(env, tickers):
+    """Books available without a Kalshi call: ({ticker: (OrderBook, "live" | "cache")}, missing tickers)."""
+    from betting_outs.kalshi.kalshi_cache import get_orderbook_cache
+    from betting_outs.kalshi.kalshi_marketdata import get_marketdata_client
+
+    out = {}
+    md = get_marketdata_client(env)
+    if md is not None:
+        md.add_tickers(tickers)
+        for t in tickers:
+            book = md.book(t)
+            if book is not None:
+                out[t] = (book, "live")
+    cache = get_orderbook_cache()
+    for t in tickers:
+        if t not in out:
+            book = cache.get((env, t))
+            if book is not None:
+                out[t] = (book, "cache")
+    return out, [t for t in tickers if t not in out]
+
+
+def add_fetched_orderbooks(env, out, responses):
+    """Add {ticker: REST response or Exception} to out as ("rest" | "error") entries, caching the books."""
+    from betting_outs.kalshi.kalshi_cache import ORDERBOOK_TTL_SEC, get_orderbook_cache
+    from betting_outs.kalshi.kalshi_orderbook import OrderBook
+
+    cache = get_orderbook_cache()
+    for t, resp in responses.items():
+        if isinstance(resp, Exception):
+            out[t] = (str(resp), "error")
+        else:
+            book = OrderBook.from_response(resp, t)
+            cache.set((env, t), book, ORDERBOOK_TTL_SEC)
+            out[t] = (book, "rest")
+    return out
+
+
+def collect_orderbooks(env, tickers):
+    """{ticker: (OrderBook, source) or (error message, "error")} for tickers.
+
+    Each book comes from the local market-data service when it has a synced one ("live"), else
+    from the short-lived REST cache ("cache"); the rest are fetched concurrently from the public
+    endpoint ("rest")."""
+    out, missing = known_orderbooks(env, tickers)
+    if missing:
+        add_fetched_orderbooks(env, out, public_orderbooks(env, missing))
+    return out
+
+
+def columnar_orderbooks(tickers, books, depth):
+    """The POST /orderbooks response for collect_orderbooks' result."""
+    out = {"tickers": tickers, "source": [], "age_ms": [], "errors": {}, "depth": depth}
+    for side in ("yes", "no"):
+        out[side + "_price"], out[side + "_qty"] = [], []
+    for t in tickers:
+        book, source = books[t]
+        out["source"].append(source)
+        if source == "error":
+            out["errors"][t] = book
+            out["age_ms"].append(None)
+            for side in ("yes", "no"):
+                out[side + "_price"].append([])
+                out[side + "_qty"].append([])
+            continue
+        out["age_ms"].append(round(book.age() * 1000))
+        for side in ("yes", "no"):
+            levels = book.to_levels(side)[::-1][:depth]
+            out[side + "_price"].append([p for p, _ in levels])
+            out[side + "_qty"].append([q for _, q in levels])
+    return out
+
+
+@app.route("/orderbooks", methods=["POST"])
+def bulk_orderbooks():
+    """Many orderbooks in one call. Body: {"tickers": [...], "depth": optional levels per side}.
+
+    Columnar response, one entry per ticker in request order; levels are best first:
+      {"tickers": [...], "source": ["live" | "cache" | "rest" | "error", ...], "age_ms": [...],
+       "yes_price": [[...], ...], "yes_qty": [[...], ...], "no_price": [[...], ...], "no_qty": [[...], ...],
+       "errors": {ticker: message}}
+    """
+    try:
+        tickers, depth = parse_orderbooks_request(request.get_json(silent=True))
+        env = env_from_request()
+        return jsonify(columnar_orderbooks(tickers, collect_orderbooks(env, tickers), depth))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# ---- Live stream ----
+# One upstream Kalshi WebSocket per environment (kalshi_stream.py), fanned out to any number of clients.
+
+# The UI may read the stream from another origin; buffering proxies must pass events straight through.
+STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "Access-Control-Allow-Origin": "*"}
+
+
+def stream_client_from(args):
+    """StreamClient for /stream's query args. ValueError (a 400) for unknown types or a bad depth."""
+    from betting_outs.kalshi.kalshi_stream import DEFAULT_DEPTH, EVENT_TYPES, StreamClient
+    types = [t for t in (args.get("types") or "").split(",") if t.strip()] or list(EVENT_TYPES)
+    unknown = set(types) - set(EVENT_TYPES)
+    if unknown:
+        raise ValueError(f"unknown event types: {sorted(unknown)}")
+    tickers = (args.get("tickers") or "").split(",")
+    depth = int(args.get("depth") or DEFAULT_DEPTH)
+    return StreamClient(types, tickers, depth)
+
+
+@app.route("/stream")
+def stream():
+    """Server-sent events: book, order, fill, balance and resync (refetch state) events as they happen.
+    Filters: ?types=order,fill,balance (default all), ?tickers=KX-A,KX-B (book events need tickers;
+    other events are limited to them when given), ?depth=10 levels per book side."""
+    from betting_outs.kalshi.kalshi_stream import get_stream_hub
+    try:
+        client = stream_client_from(request.args)
+        hub = get_stream_hub(env_from_request())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+    return Response(stream_with_context(hub.events(client)), mimetype="text/event-stream", headers=STREAM_HEADERS)
+
+
+@app.route("/stream/stats")
+def stream_stats():
+    """Per-environment stream hub counters and connected clients."""
+    from betting_outs.kalshi.kalshi_stream import _hubs
+    return jsonify({env: hub.status() for env, hub in list(_hubs.items())})
+
 
+# ---- Market Making bot control ----
+# Strategies run in this process (market_making/runner.py) on the shared client and rate limiter.
+
+def get_runner():
+    from market_making.runner import get_runner as _get_runner
+    return _get_runner()
 
-# ---- Market Making bot control (stubs until bot exists) ----
 
 @app.route("/market-making/strategies", methods=["GET"])
 def market_making_list():
-    """List strategies and status. Stub: returns empty list until bot exists."""
-    return jsonify({"strategies": []})
+    """List strategies with live status: fills, resting orders, last cycle latency, rate limit headroom."""
+    try:
+        return jsonify({"strategies": get_runner().list()})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
 
 @app.route("/market-making/strategies", methods=["POST"])
 def market_making_create():
-    """Create and start a strategy. Stub: returns 501 until bot exists."""
+    """Create and start a strategy. Body: a bot config (stakes / tickers) or the desktop form (markets, ...)."""
     try:
+        from market_making.runner import config_from_request
+
         body = request.get_json() or {}
-        return jsonify({
-            "error": "Market making bot not implemented yet",
-            "config": body,
-        }), 501
+        config = config_from_request(body, env_from_request())
+        runner = get_runner()
+        strategy_id = runner.create(config, body.get("id"))
+        return jsonify({"id": strategy_id, "strategy": runner.status(strategy_id)}), 201
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @app.route("/market-making/strategy/<strategy_id>/restart", methods=["POST"])
 def market_making_restart(strategy_id):
-    """Restart a stopped strategy. Stub: returns 501 until bot exists."""
-    return jsonify({"error": "Market making bot not implemented yet", "strategy_id": strategy_id}), 501
+    """Restart a strategy with its saved config."""
+    try:
+        runner = get_runner()
+        runner.restart(strategy_id)
+        return jsonify({"id": strategy_id, "strategy": runner.status(strategy_id)})
+    except KeyError:
+        return jsonify({"error": "Unknown strategy", "strategy_id": strategy_id}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/market-making/strategy/<strategy_id>/stop", methods=["POST"])
+def market_making_stop(strategy_id):
+    """Stop a strategy and cancel its resting orders; it stays listed and can be restarted."""
+    try:
+        runner = get_runner()
+        runner.stop(strategy_id)
+        return jsonify({"id": strategy_id, "strategy": runner.status(strategy_id)})
+    except KeyError:
+        return jsonify({"error": "Unknown strategy", "strategy_id": strategy_id}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/market-making/strategy/<strategy_id>", methods=["DELETE"])
+def market_making_delete(strategy_id):
+    """Stop a strategy, cancel its resting orders and forget it."""
+    try:
+        get_runner().delete(strategy_id)
+        return jsonify({"ok": True, "id": strategy_id})
+    except KeyError:
+        return jsonify({"error": "Unknown strategy", "strategy_id": strategy_id}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# ---- ASGI mode (--asgi) ----
+# The read routes the UI and bots hit most run as coroutines on pooled aiohttp connections
+# (AsyncKalshiHttpClient shares each environment's key and rate limiter with the sync client);
+# /stream waits on the event loop; everything else is served by the Flask app above on a pool of
+# threads. See asgi_server.py.
+
+# Keep-alive connections to Kalshi's public endpoints in ASGI mode (Flask mode opens one per request).
+PUBLIC_POOL_MAXSIZE = 32
+
+
+def build_asgi_app():
+    import asyncio
+
+    import aiohttp
+    from asgi_server import AsgiRouter, Streaming, wsgi_fallback
+    from betting_outs.kalshi.kalshi import get_shared_client
+    from betting_outs.kalshi.kalshi_async import AsyncKalshiHttpClient
+    from betting_outs.kalshi.kalshi_cache import get_orderbook_cache
+    from betting_outs.kalshi.kalshi_stream import get_stream_hub
+
+    router = AsgiRouter(fallback=wsgi_fallback(app))
+    clients = {}
+    public = {}
+
+    def async_client(env):
+        """One async client per environment for the process, so its connection pool is reused."""
+        if env not in clients:
+            clients[env] = AsyncKalshiHttpClient.from_client(get_shared_client(env))
+        return clients[env]
+
+    def public_aiohttp_session():
+        """Pooled session for Kalshi's unauthenticated market data endpoints."""
+        if "session" not in public or public["session"].closed:
+            public["session"] = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=PUBLIC_POOL_MAXSIZE, keepalive_timeout=30),
+                timeout=aiohttp.ClientTimeout(total=15),
+            )
+        return public["session"]
+
+    async def public_get(env, path, params=None):
+        base = KALSHI_BASE_URL.get(env, KALSHI_BASE_URL["DEMO"])
+        async with public_aiohttp_session().get(base + path, params=params) as resp:
+            resp.raise_for_status()
+            return await resp.json()
+
+    async def public_orderbooks_async(env, tickers):
+        """public_orderbooks without threads: at most PUBLIC_ORDERBOOK_CONCURRENCY in flight."""
+        if "orderbook_slots" not in public:
+            public["orderbook_slots"] = asyncio.Semaphore(PUBLIC_ORDERBOOK_CONCURRENCY)
+
+        async def one(t):
+            async with public["orderbook_slots"]:
+                return await public_get(env, f"{MARKETS_PATH}/{t}/orderbook")
+
+        results = await asyncio.gather(*(one(t) for t in tickers), return_exceptions=True)
+        return dict(zip(tickers, results))
+
+    async def close():
+        for c in clients.values():
+            await c.close()
+        if "session" in public:
+            await public["session"].close()
+
+    router.on_shutdown.append(close)
+
+    @router.route("/health")
+    async def health_async(req):
+        return {"ok": True}
+
+    @router.route("/balance")
+    async def balance_async(req):
+        return await async_client(env_from(req.args.get("env"))).get_balance()
+
+    @router.route("/exchange-status")
+    async def exchange_status_async(req):
+        return await async_client(env_from(req.args.get("env"))).get_exchange_status()
+
+    @router.route("/orders")
+    async def orders_async(req):
+        return await async_client(env_from(req.args.get("env"))).get_orders(
+            limit=int_arg(req.args, "limit"), cursor=req.args.get("cursor"), status=req.args.get("status"))
+
+    @router.route("/positions")
+    async def positions_async(req):
+        return await async_client(env_from(req.args.get("env"))).get_positions(
+            limit=int_arg(req.args, "limit"), cursor=req.args.get("cursor"))
+
+    @router.route("/markets")
+    async def markets_async(req):
+        env = env_from(req.args.get("env"))
+        url_params = markets_query(req.args)
+        fresh = req.args.get("fresh") in ("1", "true")
+        data = dict(await get_market_cache().amarkets(env, url_params, lambda e, p: public_get(e, MARKETS_PATH, p), fresh=fresh))
+        data["request_url"] = markets_url(env, url_params)
+        return data
+
+    @router.route("/markets/<ticker>/orderbook")
+    async def market_orderbook_async(req):
+        env, ticker = env_from(req.args.get("env")), normalize_ticker(req.params["ticker"])
+        if ticker is None:
+            return {"error": "invalid ticker"}, 400
+        # The service's subscribe is a blocking socket send: keep it off the event loop.
+        book = await asyncio.to_thread(live_orderbook, env, ticker)
+        if book is not None:
+            return {"orderbook": {"yes": book.to_levels("yes"), "no": book.to_levels("no")}, "source": "live"}
+        # Identical requests in flight share one upstream call (nothing is kept after it returns).
+        return await get_orderbook_cache().aget_or_load(
+            ("proxy", env, ticker), lambda: public_get(env, f"{MARKETS_PATH}/{ticker}/orderbook"), 0)
+
+    @router.route("/orderbooks", methods=("POST",))
+    async def bulk_orderbooks_async(req):
+        try:
+            tickers, depth = parse_orderbooks_request(req.json())
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        env = env_from(req.args.get("env"))
+        out, missing = await asyncio.to_thread(known_orderbooks, env, tickers)
+        if missing:
+            add_fetched_orderbooks(env, out, await public_orderbooks_async(env, missing))
+        return columnar_orderbooks(tickers, out, depth)
+
+    @router.route("/stream")
+    async def stream_async(req):
+        """/stream without a thread per open connection (a Flask stream would hold one for its life)."""
+        try:
+            client = stream_client_from(req.args)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        # First use starts the environment's feed (key load, WebSocket connect): off the loop.
+        hub = await asyncio.to_thread(get_stream_hub, env_from(req.args.get("env")))
+        return Streaming(hub.aevents(client), headers=STREAM_HEADERS)
+
+    return router
 
 
 if __name__ == "__main__":
-    app.run(host=KALSHI_HOST, port=KALSHI_PORT, debug=False, use_reloader=False)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local HTTP API for the desktop app to call Kalshi")
+    parser.add_argument("--asgi", action="store_true", help="serve with uvicorn: async read routes, pooled upstream connections")
+    args = parser.parse_args()
+    if args.asgi:
+        from asgi_server import serve
+        serve(build_asgi_app(), KALSHI_HOST, KALSHI_PORT)
+    else:
+        app.run(host=KALSHI_HOST, port=KALSHI_PORT, debug=False, use_reloader=False, threaded=True)
@@ -0,0 +1,372 @@
+"""
+Asyncio Kalshi HTTP client (aiohttp). Same methods as KalshiHttpClient, but coroutines, so many
+reads can be in flight at once over one pooled keep-alive connector.
+
+    client = AsyncKalshiHttpClient.from_client(get_client("PROD"))  # shares key and rate limiter
+    books = await client.get_orderbooks(["KX-A", "KX-B", "KX-C"])    # ~one RTT, not three
+    await client.close()
+"""
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+import aiohttp
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+try:
+    from .kalshi import KalshiBaseClient, KalshiHttpClient, credentials_from_env, drop_none, markets_params, order_body
+    from .kalshi_ratelimit import RateLimiter
+    from .kalshi_retry import RETRYABLE_STATUS, RetryPolicy, RetryStats
+except ImportError:  # imported as a top-level module (kalshi_api.py puts this folder on sys.path)
+    from kalshi import KalshiBaseClient, KalshiHttpClient, credentials_from_env, drop_none, markets_params, order_body
+    from kalshi_ratelimit import RateLimiter
+    from kalshi_retry import RETRYABLE_STATUS, RetryPolicy, RetryStats
+
+
+class AsyncKalshiHttpClient(KalshiBaseClient):
+    """Async client for the Kalshi REST API.
+
+    The aiohttp session is created lazily on first use, inside the running event loop, and keeps up
+    to pool_maxsize keep-alive connections. Every call spends tokens from rate_limiter without
+    blocking the loop; pass the sync client's limiter to share one account budget.
+    """
+    DEFAULT_POOL_MAXSIZE = KalshiHttpClient.DEFAULT_POOL_MAXSIZE
+    DEFAULT_TIMEOUT = KalshiHttpClient.DEFAULT_TIMEOUT
+
+    def __init__(
+        self,
+        key_id: str,
+        private_key: rsa.RSAPrivateKey,
+        environment: str = "DEMO",
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        timeout: Optional[tuple[float, float]] = DEFAULT_TIMEOUT,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
+        super().__init__(key_id, private_key, environment)
+        self.host = self.HTTP_BASE_URL
+        self.exchange_url = "/trade-api/v2/exchange"
+        self.markets_url = "/trade-api/v2/markets"
+        self.portfolio_url = "/trade-api/v2/portfolio"
+        self.pool_maxsize = pool_maxsize
+        connect, read = timeout or (None, None)
+        self.timeout = aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+        self.rate_limiter = rate_limiter or RateLimiter.from_env()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_stats = RetryStats()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @classmethod
+    def from_client(cls, client: KalshiHttpClient, **kwargs: Any) -> "AsyncKalshiHttpClient":
+        """Async twin of a sync client: same key, environment, host and rate limiter."""
+        kwargs.setdefault("rate_limiter", client.rate_limiter)
+        kwargs.setdefault("retry_policy", client.retry_policy)
+        kwargs.setdefault("timeout", client.timeout)
+        twin = cls(client.key_id, client.private_key, client.environment, **kwargs)
+        twin.host = client.host
+        return twin
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_maxsize, keepalive_timeout=30)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    async def close(self) -> None:
+        """Close pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self) -> "AsyncKalshiHttpClient":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        kind: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_body: Optional[dict] = None,
+        cost: float = 1.0,
+        retry: bool = False,
+    ) -> Any:
+        """Async twin of KalshiHttpClient._request: same 429 feedback, retry policy and counters."""
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire_async(kind, cost)
+            try:
+                async with self.session.request(
+                    method,
+                    self.host + path,
+                    params=params or None,
+                    json=json_body,
+                    headers=self.request_headers(method, path),
+                ) as response:
+                    status = response.status
+                    if status < 300:
+                        self.rate_limiter.succeeded(kind)
+                        body = await response.read()
+                        return await response.json(content_type=None) if body else {}
+                    if status == 429:
+                        self.retry_stats.add("throttled")
+                        self.rate_limiter.throttled(kind)
+                    elif status >= 500:
+                        self.retry_stats.add("server_errors")
+                    delay = None
+                    if retry and status in RETRYABLE_STATUS:
+                        delay = self.retry_policy.delay_for(attempt, response.headers)
+                    if delay is None:
+                        if attempt and status in RETRYABLE_STATUS:
+                            self.retry_stats.add("gave_up")
+                        try:
+                            response.raise_for_status()
+                        except aiohttp.ClientResponseError as e:
+                            e.retried = attempt
+                            raise
+                        # 3xx (not followed): returned like the sync client does
+                        body = await response.read()
+                        return await response.json(content_type=None) if body else {}
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                self.retry_stats.add("network_errors")
+                delay = self.retry_policy.delay_for(attempt) if retry else None
+                if delay is None:
+                    if attempt:
+                        self.retry_stats.add("gave_up")
+                    raise
+            attempt += 1
+            self.retry_stats.add("retries")
+            self.retry_stats.add("backoff_sec", delay)
+            await asyncio.sleep(delay)
+
+    async def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Performs an authenticated GET request to the Kalshi API. Reads are retried with backoff."""
+        return await self._request("GET", path, "read", params=params, retry=True)
+
+    async def post(self, path: str, body: dict, cost: float = 1.0, retry: bool = False) -> Any:
+        """Performs an authenticated POST request to the Kalshi API. cost: write tokens to spend."""
+        return await self._request("POST", path, "write", json_body=body, cost=cost, retry=retry)
+
+    async def delete(self, path: str, params: Optional[Dict[str, Any]] = None, json_body: Optional[dict] = None, cost: float = 1.0) -> Any:
+        """Performs an authenticated DELETE request to the Kalshi API. cost: write tokens to spend."""
+        return await self._request("DELETE", path, "write", params=params, json_body=json_body, cost=cost)
+
+    async def get_balance(self) -> Dict[str, Any]:
+        """Retrieves the account balance."""
+        return await self.get(self.portfolio_url + '/balance')
+
+    async def get_exchange_status(self) -> Dict[str, Any]:
+        """Retrieves the exchange status."""
+        return await self.get(self.exchange_url + "/status")
+
+    async def get_trades(
+        self,
+        ticker: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        max_ts: Optional[int] = None,
+        min_ts: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Retrieves trades based on provided filters."""
+        params = drop_none({'ticker': ticker, 'limit': limit, 'cursor': cursor, 'max_ts': max_ts, 'min_ts': min_ts})
+        return await self.get(self.markets_url + '/trades', params=params)
+
+    async def get_markets(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        event_ticker: Optional[str] = None,
+        series_ticker: Optional[str] = None,
+        tickers: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Get markets. Same filters as KalshiHttpClient.get_markets."""
+        params = markets_params(limit, cursor, status, event_ticker, series_ticker, tickers)
+        return await self.get(self.markets_url, params=params)
+
+    async def get_orders(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        event_ticker: Optional[str] = None,
+        ticker: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Get portfolio orders. status: resting, canceled, executed."""
+        params = drop_none({'limit': limit, 'cursor': cursor, 'status': status, 'event_ticker': event_ticker, 'ticker': ticker})
+        return await self.get(self.portfolio_url + '/orders', params=params)
+
+    async def get_positions(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Get portfolio positions."""
+        params = drop_none({'limit': limit, 'cursor': cursor})
+        return await self.get(self.portfolio_url + '/positions', params=params)
+
+    async def get_fills(
+        self,
+        ticker: Optional[str] = None,
+        order_id: Optional[str] = None,
+        min_ts: Optional[int] = None,
+        max_ts: Optional[int] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Get this account's fills, newest first. min_ts/max_ts are Unix seconds."""
+        params = drop_none({
+            'ticker': ticker, 'order_id': order_id, 'min_ts': min_ts, 'max_ts': max_ts,
+            'limit': limit, 'cursor': cursor,
+        })
+        return await self.get(self.portfolio_url + '/fills', params=params)
+
+    PAGE_LIMIT = KalshiHttpClient.PAGE_LIMIT
+
+    async def paginate(
+        self, fetch: Callable[..., Awaitable[Dict[str, Any]]], items_key: str, **params: Any
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Async generator over items_key entries across all pages. The next page is requested
+        before the current one is handed out, so network time overlaps the caller's processing.
+        At most two pages are held at once; an abandoned prefetch is cancelled."""
+        cursor = None
+        page = await fetch(cursor=cursor, **params)
+        while True:
+            next_cursor = page.get("cursor")
+            prefetch = None
+            if next_cursor and next_cursor != cursor:
+                prefetch = asyncio.ensure_future(fetch(cursor=next_cursor, **params))
+            try:
+                for item in page.get(items_key) or []:
+                    yield item
+            except BaseException:
+                if prefetch is not None:
+                    prefetch.cancel()
+                raise
+            if prefetch is None:
+                return
+            cursor = next_cursor
+            page = await prefetch
+
+    def iter_markets(
+        self,
+        status: Optional[str] = None,
+        event_ticker: Optional[str] = None,
+        series_ticker: Optional[str] = None,
+        tickers: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Every market matching the filters, across all pages (prefetching)."""
+        return self.paginate(
+            self.get_markets, "markets", limit=self.PAGE_LIMIT, status=status,
+            event_ticker=event_ticker, series_ticker=series_ticker, tickers=tickers,
+        )
+
+    def iter_orders(
+        self,
+        status: Optional[str] = None,
+        event_ticker: Optional[str] = None,
+        ticker: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Every portfolio order matching the filters, across all pages (prefetching)."""
+        return self.paginate(
+            self.get_orders, "orders", limit=self.PAGE_LIMIT, status=status,
+            event_ticker=event_ticker, ticker=ticker,
+        )
+
+    def iter_positions(self) -> AsyncIterator[Dict[str, Any]]:
+        """Every market position, across all pages (prefetching)."""
+        return self.paginate(self.get_positions, "market_positions", limit=self.PAGE_LIMIT)
+
+    def iter_trades(
+        self,
+        ticker: Optional[str] = None,
+        min_ts: Optional[int] = None,
+        max_ts: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Every public trade matching the filters, across all pages (prefetching)."""
+        return self.paginate(
+            self.get_trades, "trades", limit=self.PAGE_LIMIT, ticker=ticker, min_ts=min_ts, max_ts=max_ts,
+        )
+
+    def iter_fills(
+        self,
+        ticker: Optional[str] = None,
+        order_id: Optional[str] = None,
+        min_ts: Optional[int] = None,
+        max_ts: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Every fill matching the filters, across all pages (prefetching)."""
+        return self.paginate(
+            self.get_fills, "fills", limit=self.PAGE_LIMIT, ticker=ticker, order_id=order_id,
+            min_ts=min_ts, max_ts=max_ts,
+        )
+
+    async def get_orderbook(self, ticker: str) -> Dict[str, Any]:
+        """Get order book for a market. Returns {orderbook: {yes: [[price, qty], ...], no: [...]}}."""
+        return await self.get(self.markets_url + '/' + ticker + '/orderbook')
+
+    async def get_orderbooks(self, tickers: list[str]) -> Dict[str, Any]:
+        """Fetch many orderbooks concurrently. Returns {ticker: response or Exception}.
+        Requests overlap on the pooled connector, bounded only by the read budget."""
+        results = await asyncio.gather(*(self.get_orderbook(t) for t in tickers), return_exceptions=True)
+        return dict(zip(tickers, results))
+
+    async def create_order(
+        self,
+        ticker: str,
+        action: str,
+        side: str,
+        count: int,
+        order_type: str = "limit",
+        yes_price: Optional[int] = None,
+        no_price: Optional[int] = None,
+        client_order_id: Optional[str] = None,
+        time_in_force: Optional[str] = None,
+        expiration_ts: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Create an order. Arguments as KalshiHttpClient.create_order."""
+        body = order_body(
+            ticker, action, side, count, order_type, yes_price, no_price,
+            client_order_id, time_in_force, expiration_ts,
+        )
+        # Retry-safe for the same reason as the sync client: the client_order_id is fixed up front.
+        try:
+            return await self.post(self.portfolio_url + '/orders', body, retry=True)
+        except aiohttp.ClientResponseError as e:
+            if getattr(e, "retried", 0) and e.status == 409:
+                async for o in self.iter_orders(ticker=ticker):
+                    if o.get("client_order_id") == body["client_order_id"]:
+                        return {"order": o}
+            raise
+
+    async def cancel_order(self, order_id: str) -> Dict[str, Any]:
+        """Cancel an order by id."""
+        return await self.delete(self.portfolio_url + '/orders/' + order_id)
+
+    async def batch_cancel_orders(self, order_ids: list[str]) -> Dict[str, Any]:
+        """Cancel multiple orders, 20 per request, all chunks in flight at once. Same result shape as the sync client."""
+        BATCH_SIZE = 20
+        batches = [order_ids[i : i + BATCH_SIZE] for i in range(0, len(order_ids), BATCH_SIZE)]
+        responses = await asyncio.gather(
+            *(
+                self.delete(self.portfolio_url + "/orders/batched", json_body={"ids": b}, cost=0.2 * len(b))
+                for b in batches
+            ),
+            return_exceptions=True,
+        )
+        all_results = {"cancelled_orders": [], "batch_responses": []}
+        for batch, resp in zip(batches, responses):
+            if isinstance(resp, Exception):
+                all_results["batch_responses"].append({"error": str(resp)})
+            else:
+                all_results["batch_responses"].append(resp)
+                all_results["cancelled_orders"].extend(batch)
+        return all_results
+
+
+def get_async_client(environment: str = "DEMO", **client_kwargs: Any) -> AsyncKalshiHttpClient:
+    """Async counterpart of kalshi.get_client (same env vars and PEM lookup)."""
+    key_id, key = credentials_from_env()
+    return AsyncKalshiHttpClient(key_id, key, environment, **client_kwargs)
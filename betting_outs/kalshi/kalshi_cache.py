@@ -0,0 +1,281 @@
+"""
+In-process cache for Kalshi's public market metadata, used by kalshi_api.py's /markets and
+/market-reciprocal proxies.
+
+TTLCache keeps one value per key for a per-key TTL and coalesces identical concurrent loads
+(single flight): while one request is fetching a key, other requests for it wait for that result
+instead of making their own call. Errors are not cached.
+
+MarketCache adds the Kalshi side: GET /markets responses by query, and an index built from every
+response that passes through, ticker -> event_ticker and event_ticker -> markets. A reciprocal
+lookup for any ticker already seen is then answered without a call.
+
+    cache = get_market_cache()
+    data = cache.markets("PROD", {"event_ticker": "KXEV"})
+    event_ticker = cache.event_ticker("PROD", "KXEV-A")    # from the index: no call
+    cache.event_markets("PROD", event_ticker)             # cached for EVENT_TTL_SEC
+    cache.stats()                                         # hits, misses, coalesced, ...
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+import requests
+
+KALSHI_BASE_URL = {"DEMO": "https://demo-api.kalshi.co", "PROD": "https://api.elections.kalshi.com"}
+MARKETS_PATH = "/trade-api/v2/markets"
+
+# Market lists carry prices and volume, so they are kept briefly; which markets make up an event
+# and a market's event_ticker practically never change.
+MARKETS_TTL_SEC = 10.0
+EVENT_TTL_SEC = 600.0
+# Orderbooks fetched over REST for POST /orderbooks: long enough to absorb a UI refresh burst.
+ORDERBOOK_TTL_SEC = 1.0
+MAX_ENTRIES = 2000
+
+
+class _Flight:
+    """One in-progress load; threads block on done, coroutines await a future in waiters."""
+
+    __slots__ = ("done", "value", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+        self.waiters: list = []  # (loop, future) from aget_or_load
+
+
+class TTLCache:
+    """Thread-safe key -> value cache with per-key TTLs and single-flight loading. Threads
+    (get_or_load) and coroutines (aget_or_load) share entries, flights and stats."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: Dict[Hashable, tuple] = {}  # key -> (expires_at, value)
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "errors": 0, "evictions": 0}
+
+    def get(self, key: Hashable) -> Any:
+        """The cached value for key, or None if missing or expired (not counted in stats)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[1] if entry is not None and entry[0] > self.clock() else None
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def _store(self, key: Hashable, value: Any, ttl: float) -> None:
+        if key not in self._entries and len(self._entries) >= self.max_entries:
+            now = self.clock()
+            expired = [k for k, (exp, _) in self._entries.items() if exp <= now]
+            for k in expired or [min(self._entries, key=lambda k: self._entries[k][0])]:
+                del self._entries[k]
+                self.stats["evictions"] += 1
+        self._entries[key] = (self.clock() + ttl, value)
+
+    def _claim(self, key: Hashable) -> tuple:
+        """Under the lock: (entry, None, False) on a hit, else (None, flight, leader)."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > self.clock():
+            self.stats["hits"] += 1
+            return entry, None, False
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.stats["coalesced"] += 1
+            return None, flight, False
+        self.stats["misses"] += 1
+        flight = self._flights[key] = _Flight()
+        return None, flight, True
+
+    def _finish(self, key: Hashable, flight: _Flight, ttl: float) -> None:
+        """Leader is done: cache the value (not an error; not at all when ttl is 0, which only
+        coalesces) and wake every waiter."""
+        with self._lock:
+            if flight.error is not None:
+                self.stats["errors"] += 1
+            elif ttl > 0:
+                self._store(key, flight.value, ttl)
+            self._flights.pop(key, None)
+            flight.done.set()
+            waiters, flight.waiters = flight.waiters, []
+        for loop, fut in waiters:
+            loop.call_soon_threadsafe(_resolve, fut)
+
+    def get_or_load(self, key: Hashable, load: Callable[[], Any], ttl: float) -> Any:
+        """Cached value for key, else load() once for all concurrent callers and cache it for ttl
+        seconds. load()'s exception is raised to every caller waiting on it."""
+        with self._lock:
+            entry, flight, leader = self._claim(key)
+        if entry is not None:
+            return entry[1]
+        if leader:
+            try:
+                flight.value = load()
+            except BaseException as e:
+                flight.error = e
+            self._finish(key, flight, ttl)
+        else:
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    async def aget_or_load(self, key: Hashable, load: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        """get_or_load for coroutines: await load() once; waiting never blocks the event loop."""
+        with self._lock:
+            entry, flight, leader = self._claim(key)
+            if flight is not None and not leader and not flight.done.is_set():
+                fut = asyncio.get_running_loop().create_future()
+                flight.waiters.append((asyncio.get_running_loop(), fut))
+            else:
+                fut = None
+        if entry is not None:
+            return entry[1]
+        if leader:
+            try:
+                flight.value = await load()
+            except BaseException as e:
+                flight.error = e
+            self._finish(key, flight, ttl)
+        elif fut is not None:
+            await fut
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _resolve(fut: "asyncio.Future") -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+def fetch_markets(env: str, params: Dict[str, str], timeout: float = 15) -> dict:
+    """Unauthenticated GET /markets?params."""
+    base = KALSHI_BASE_URL.get(env, KALSHI_BASE_URL["DEMO"])
+    resp = requests.get(base + MARKETS_PATH, params=params, timeout=timeout)
+    resp.raise_for_status()
+    return resp.json()
+
+
+class MarketCache:
+    """Cached GET /markets plus the ticker -> event_ticker -> markets index."""
+
+    def __init__(self, fetch: Callable[[str, Dict[str, str]], dict] = fetch_markets, cache: Optional[TTLCache] = None):
+        self.fetch = fetch
+        self.cache = cache if cache is not None else TTLCache()
+        self._event_of: Dict[tuple, str] = {}  # (env, TICKER) -> event_ticker
+        self._lock = threading.Lock()
+        self.index_hits = 0
+
+    def markets(self, env: str, params: Dict[str, str], fresh: bool = False) -> dict:
+        """GET /markets response for params (shared; do not mutate). fresh skips the cached copy."""
+        key = ("markets", env, tuple(sorted(params.items())))
+        if fresh:
+            self.cache.invalidate(key)
+        return self.cache.get_or_load(key, lambda: self._load(env, params), MARKETS_TTL_SEC)
+
+    async def amarkets(self, env: str, params: Dict[str, str], afetch: Callable[[str, Dict[str, str]], Awaitable[dict]],
+                       fresh: bool = False) -> dict:
+        """markets() for coroutines; afetch(env, params) does the GET without blocking the loop."""
+        key = ("markets", env, tuple(sorted(params.items())))
+        if fresh:
+            self.cache.invalidate(key)
+
+        async def load() -> dict:
+            return self._absorb(env, params, await afetch(env, params))
+
+        return await self.cache.aget_or_load(key, load, MARKETS_TTL_SEC)
+
+    def _load(self, env: str, params: Dict[str, str]) -> dict:
+        return self._absorb(env, params, self.fetch(env, params))
+
+    def _absorb(self, env: str, params: Dict[str, str], data: dict) -> dict:
+        """Index a fresh response; returns it."""
+        self._index(env, data.get("markets") or [])
+        event_ticker = params.get("event_ticker")
+        if event_ticker and not data.get("cursor") and set(params) <= {"event_ticker", "limit"}:
+            # The complete market list of one event.
+            self.cache.set(("event", env, event_ticker), data.get("markets") or [], EVENT_TTL_SEC)
+        return data
+
+    def _index(self, env: str, markets: list) -> None:
+        with self._lock:
+            for m in markets:
+                ticker, event_ticker = (m.get("ticker") or "").strip().upper(), (m.get("event_ticker") or "").strip()
+                if ticker and event_ticker:
+                    self._event_of[(env, ticker)] = event_ticker
+
+    def event_ticker(self, env: str, ticker: str) -> Optional[str]:
+        """The market's event_ticker: from the index, else one GET /markets?tickers=ticker."""
+        with self._lock:
+            event_ticker = self._event_of.get((env, ticker.strip().upper()))
+        if event_ticker is not None:
+            self.index_hits += 1
+            return event_ticker
+        markets = self.markets(env, {"tickers": ticker}).get("markets") or []
+        if not markets:
+            return None
+        return (markets[0].get("event_ticker") or "").strip() or None
+
+    def event_markets(self, env: str, event_ticker: str) -> list:
+        """Every market in the event (cached for EVENT_TTL_SEC)."""
+        key = ("event", env, event_ticker)
+        markets = self.cache.get(key)
+        if markets is not None:
+            self.index_hits += 1
+            return markets
+        data = self.markets(env, {"event_ticker": event_ticker})
+        return self.cache.get(key) or data.get("markets") or []
+
+    def stats(self) -> dict:
+        stats = dict(self.cache.stats)
+        lookups = stats["hits"] + stats["misses"] + stats["coalesced"]
+        stats.update(
+            entries=len(self.cache),
+            indexed_tickers=len(self._event_of),
+            index_hits=self.index_hits,
+            hit_rate=round((stats["hits"] + stats["coalesced"]) / lookups, 3) if lookups else None,
+            ttl_sec={"markets": MARKETS_TTL_SEC, "event": EVENT_TTL_SEC},
+        )
+        return stats
+
+
+_market_cache: Optional[MarketCache] = None
+_market_cache_lock = threading.Lock()
+
+
+def get_market_cache() -> MarketCache:
+    """Process-wide MarketCache."""
+    global _market_cache
+    with _market_cache_lock:
+        if _market_cache is None:
+            _market_cache = MarketCache()
+        return _market_cache
+
+
+_orderbook_cache: Optional[TTLCache] = None
+
+
+def get_orderbook_cache() -> TTLCache:
+    """Process-wide (env, ticker) -> OrderBook cache for REST-fetched books."""
+    global _orderbook_cache
+    with _market_cache_lock:
+        if _orderbook_cache is None:
+            _orderbook_cache = TTLCache()
+        return _orderbook_cache
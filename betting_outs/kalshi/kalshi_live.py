@@ -0,0 +1,449 @@
+"""
+Live Kalshi data over the WebSocket API.
+
+OrderBookEngine subscribes to the orderbook_delta channel for a set of tickers and keeps one
+OrderBook per ticker from the snapshot + delta stream. Tickers added later join the existing
+subscription (update_subscription), so books already synced stay synced. Sequence gaps trigger
+a resubscribe (fresh snapshots), and dropped connections reconnect with backoff. FillFeed
+streams this account's fills and order updates to any number of subscribers; AccountFeed does
+both on one connection. Each runs its own event loop in a daemon thread, so the synchronous
+bots can use them directly:
+
+    engine = start_orderbook_engine(client, ["KX-A", "KX-B"])
+    engine.best_bid_ask("KX-A")  # None until the first snapshot arrives
+    sub = start_fill_feed(client).subscribe()
+    kind, msg = sub.events.get()  # ("fill", {...}) or ("user_order", {...})
+"""
+import asyncio
+import json
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import websockets
+
+try:
+    from .kalshi import KalshiHttpClient, KalshiWebSocketClient
+    from .kalshi_orderbook import OrderBook
+except ImportError:  # imported as a top-level module (kalshi_api.py puts this folder on sys.path)
+    from kalshi import KalshiHttpClient, KalshiWebSocketClient
+    from kalshi_orderbook import OrderBook
+
+# Reconnect backoff bounds (seconds).
+RECONNECT_MIN_SEC = 0.5
+RECONNECT_MAX_SEC = 30.0
+
+
+class LiveFeed(KalshiWebSocketClient):
+    """A WebSocket connection that reconnects with backoff and runs on its own event loop thread.
+
+    Subclasses subscribe in on_open and handle messages in on_message; connection_lost() is
+    called every time the socket drops, before the next reconnect attempt.
+    """
+
+    feed_name = "Live feed"
+
+    def __init__(self, key_id: str, private_key: Any, environment: str):
+        super().__init__(key_id, private_key, environment)
+        self.stats: Dict[str, int] = {"reconnects": 0}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    @classmethod
+    def for_client(cls, client: KalshiHttpClient, *args, **kwargs):
+        """Feed that authenticates with the same key and environment as an HTTP client."""
+        return cls(client.key_id, client.private_key, client.environment, *args, **kwargs)
+
+    def connection_lost(self) -> None:
+        """Hook: the connection dropped (or failed); state derived from it may be stale."""
+
+    async def on_close(self, close_status_code, close_msg):
+        self.connection_lost()
+
+    async def on_error(self, error):
+        print(f"{self.feed_name} error:", error)
+        self.connection_lost()
+
+    async def run_forever(self) -> None:
+        """Connect and keep reconnecting (with backoff) until stop() is called."""
+        delay = RECONNECT_MIN_SEC
+        while not self._stopping:
+            started = time.monotonic()
+            try:
+                await self.connect()
+            except (OSError, websockets.WebSocketException) as e:
+                print(f"{self.feed_name} connect failed:", e)
+            self.ws = None
+            self.connection_lost()
+            if self._stopping:
+                break
+            self.stats["reconnects"] += 1
+            if time.monotonic() - started > RECONNECT_MAX_SEC:
+                delay = RECONNECT_MIN_SEC  # the last connection was healthy for a while
+            await asyncio.sleep(delay)
+            delay = min(RECONNECT_MAX_SEC, delay * 2)
+
+    def start(self):
+        """Run the feed on its own event loop in a daemon thread. Returns self."""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stopping = False
+        self._loop = asyncio.new_event_loop()
+
+        def _run() -> None:
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.run_forever())
+
+        name = "kalshi-" + self.feed_name.lower().replace(" ", "-")
+        self._thread = threading.Thread(target=_run, name=name, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stopping = True
+        if self._loop is not None and self.ws is not None:
+            asyncio.run_coroutine_threadsafe(self.ws.close(), self._loop)
+
+
+class OrderBookEngine(LiveFeed):
+    """Maintains in-memory orderbooks from Kalshi's orderbook_delta channel.
+
+    All book mutation happens on the engine's loop under self.lock; query methods take the same
+    lock and are safe to call from any thread. A book is only returned once it has a snapshot and
+    while its subscription has no sequence gap.
+    """
+
+    feed_name = "Orderbook feed"
+
+    def __init__(self, key_id: str, private_key: Any, environment: str, tickers: Iterable[str] = ()):
+        super().__init__(key_id, private_key, environment)
+        self.tickers = {t.strip() for t in tickers if t and t.strip()}
+        self.books: Dict[str, OrderBook] = {}
+        self.lock = threading.Lock()
+        self.stats.update({"snapshots": 0, "deltas": 0, "gaps": 0, "resyncs": 0, "rejected": 0})
+        self._sid: Optional[int] = None
+        self._requested: set = set()  # tickers sent in the current subscription
+        self._commands: Dict[int, set] = {}  # message id -> tickers it added, until Kalshi answers
+        self._dropped_sids: set = set()
+        self._last_seq: Optional[int] = None
+        self._listeners: list = []
+
+    # ---- queries (any thread) ----
+
+    def book(self, ticker: str) -> Optional[OrderBook]:
+        """A point-in-time copy of the live book for ticker if it is synced, else None."""
+        with self.lock:
+            book = self.books.get(ticker)
+            return book.copy() if book is not None and book.synced else None
+
+    def best_bid_ask(self, ticker: str) -> Optional[tuple[int, int, int, int]]:
+        """(best_yes_bid, best_no_bid, yes_depth_at_best, no_depth_at_best) or None if not synced."""
+        with self.lock:
+            book = self.books.get(ticker)
+            if book is None or not book.synced:
+                return None
+            yes, no = book.best_yes_bid, book.best_no_bid
+            return yes, no, book.depth_at("yes", yes), book.depth_at("no", no)
+
+    def depth_at(self, ticker: str, side: str, price: int) -> Optional[int]:
+        with self.lock:
+            book = self.books.get(ticker)
+            return book.depth_at(side, price) if book is not None and book.synced else None
+
+    def add_listener(self, fn: Callable[[str, OrderBook], None]) -> None:
+        """Call fn(ticker, book) on the engine thread after every snapshot or delta, and when a
+        synced book goes stale (book.synced False: resync or lost connection)."""
+        self._listeners.append(fn)
+
+    # ---- websocket callbacks (engine loop) ----
+
+    async def on_open(self):
+        """Subscribe to orderbook_delta for all tracked tickers."""
+        self._dropped_sids.clear()  # sids and message ids are per connection
+        self._commands.clear()
+        await self._subscribe()
+
+    async def _subscribe(self) -> None:
+        self._sid = None
+        self._last_seq = None
+        self._requested = set(self.tickers)
+        if not self.tickers or self.ws is None:
+            return
+        await self._send_command("subscribe", {"channels": ["orderbook_delta"], "market_tickers": sorted(self.tickers)},
+                                 self._requested)
+
+    async def _send_command(self, cmd: str, params: Dict[str, Any], tickers: set) -> None:
+        self._commands[self.message_id] = set(tickers)
+        await self.ws.send(json.dumps({"id": self.message_id, "cmd": cmd, "params": params}))
+        self.message_id += 1
+
+    async def _add_markets(self) -> None:
+        """Add tracked tickers missing from the current subscription to it. Before the first
+        subscription is confirmed they wait for its "subscribed" reply (or start it)."""
+        if self.ws is None:
+            return
+        if self._sid is None:
+            if not self._requested:
+                await self._subscribe()
+            return
+        new = self.tickers - self._requested
+        if not new:
+            return
+        self._requested |= new
+        await self._send_command("update_subscription",
+                                 {"sids": [self._sid], "market_tickers": sorted(new), "action": "add_markets"}, new)
+
+    async def resync(self) -> None:
+        """Drop the current subscription and subscribe again; Kalshi replies with fresh snapshots."""
+        self.stats["resyncs"] += 1
+        self._mark_unsynced()
+        if self.ws is None:
+            return
+        if self._sid is not None:
+            self._dropped_sids.add(self._sid)
+            await self.ws.send(json.dumps({"id": self.message_id, "cmd": "unsubscribe", "params": {"sids": [self._sid]}}))
+            self.message_id += 1
+        await self._subscribe()
+
+    BOOK_TYPES = ("orderbook_snapshot", "orderbook_delta")
+
+    async def on_message(self, message):
+        await self._on_book_message(json.loads(message))
+
+    async def _on_book_message(self, data: Dict[str, Any]) -> None:
+        kind = data.get("type")
+        rejected = self._commands.pop(data.get("id"), None) if kind == "error" else None
+        if kind in ("subscribed", "ok"):
+            self._commands.pop(data.get("id"), None)
+        if kind == "ok":
+            # The reply to update_subscription may take the next seq of the subscription.
+            if data.get("sid") == self._sid and self._last_seq is not None and data.get("seq") == self._last_seq + 1:
+                self._last_seq = data["seq"]
+            return
+        if kind == "subscribed":
+            if (data.get("msg") or {}).get("channel") == "orderbook_delta":
+                self._sid = data["msg"].get("sid")
+                await self._add_markets()  # tickers added while the subscribe was in flight
+            return
+        if kind not in self.BOOK_TYPES:
+            if kind == "error":
+                print(f"{self.feed_name} error:", data.get("msg"))
+                if rejected:
+                    # Stop tracking what Kalshi refused (e.g. unknown tickers), so later
+                    # subscribes do not carry it.
+                    self.stats["rejected"] += len(rejected)
+                    self.tickers -= rejected
+                    self._requested -= rejected
+            return
+        sid, seq = data.get("sid"), data.get("seq")
+        if sid in self._dropped_sids or (self._sid is not None and sid != self._sid):
+            return  # late message from a subscription we already dropped
+        if seq is not None and self._last_seq is not None and seq != self._last_seq + 1:
+            self.stats["gaps"] += 1
+            await self.resync()
+            return
+        if seq is not None:
+            self._last_seq = seq
+        msg = data.get("msg") or {}
+        ticker = msg.get("market_ticker")
+        if not ticker or ticker not in self.tickers:
+            return
+        with self.lock:
+            book = self.books.get(ticker)
+            if book is None:
+                book = self.books[ticker] = OrderBook(ticker)
+            if kind == "orderbook_snapshot":
+                book.apply_snapshot(msg.get("yes") or [], msg.get("no") or [])
+                self.stats["snapshots"] += 1
+            elif book.synced:
+                book.apply_delta(msg.get("side"), int(msg.get("price")), int(msg.get("delta")))
+                self.stats["deltas"] += 1
+            book.seq = seq
+        for fn in self._listeners:
+            try:
+                fn(ticker, book)
+            except Exception as e:
+                print("Orderbook listener failed:", e)
+
+    def _mark_unsynced(self) -> None:
+        with self.lock:
+            stale = [book for book in self.books.values() if book.synced]
+            for book in stale:
+                book.synced = False
+        for book in stale:
+            for fn in self._listeners:
+                try:
+                    fn(book.ticker, book)
+                except Exception as e:
+                    print("Orderbook listener failed:", e)
+
+    connection_lost = _mark_unsynced
+
+    def add_tickers(self, tickers: Iterable[str]) -> None:
+        """Track more tickers. Thread-safe; when the engine is running only the new markets are
+        added to the subscription, and books already synced are left alone."""
+        new = {t.strip() for t in tickers if t and t.strip()} - self.tickers
+        if not new:
+            return
+        self.tickers = self.tickers | new
+        if self._loop is not None and self.ws is not None:
+            asyncio.run_coroutine_threadsafe(self._add_markets(), self._loop)
+
+    def remove_tickers(self, tickers: Iterable[str]) -> None:
+        """Stop tracking tickers: their books are dropped and, when the engine is running, the
+        markets are removed from the subscription. Thread-safe."""
+        gone = {t.strip() for t in tickers if t and t.strip()} & self.tickers
+        if not gone:
+            return
+        self.tickers = self.tickers - gone
+        with self.lock:
+            for t in gone:
+                self.books.pop(t, None)
+        if self._loop is not None and self.ws is not None:
+            asyncio.run_coroutine_threadsafe(self._remove_markets(gone), self._loop)
+
+    async def _remove_markets(self, gone: set) -> None:
+        gone = (gone & self._requested) - self.tickers  # unless added back meanwhile
+        if not gone or self.ws is None or self._sid is None:
+            return  # a subscribe in flight still carries them; their messages are ignored
+        self._requested -= gone
+        await self._send_command("update_subscription",
+                                 {"sids": [self._sid], "market_tickers": sorted(gone), "action": "delete_markets"}, set())
+
+
+class FillSubscription:
+    """One consumer of a FillFeed: its own event queue and "events may have been lost" flag.
+
+    wake, if set, is called on the feed thread after each event or missed flag, so a consumer can
+    be woken (e.g. on an asyncio loop) instead of holding a thread blocked on the queue."""
+
+    def __init__(self):
+        self.events: "queue.Queue[tuple[str, Dict[str, Any]]]" = queue.Queue()
+        self.missed = threading.Event()
+        self.wake: Optional[Callable[[], None]] = None
+
+    def put(self, event: tuple) -> None:
+        self.events.put(event)
+        self._wake()
+
+    def flag_missed(self) -> None:
+        self.missed.set()
+        self._wake()
+
+    def _wake(self) -> None:
+        wake = self.wake
+        if wake is not None:
+            try:
+                wake()
+            except Exception as e:
+                print("Fill subscriber wake failed:", e)
+
+
+class FillFeed(LiveFeed):
+    """Streams this account's fills and order updates from the authenticated WebSocket channels.
+
+    Every "fill" and "user_order" message is put on each subscriber's events queue as
+    (type, msg). Each channel is subscribed separately, so an account or environment without one
+    still gets the other. A subscriber's missed flag is set whenever events may have been lost
+    (reconnect or sequence gap); it should reconcile over REST and clear it.
+    """
+
+    feed_name = "Fill feed"
+    CHANNELS = ("fill", "user_orders")
+    EVENT_TYPES = ("fill", "user_order")
+
+    def __init__(self, key_id: str, private_key: Any, environment: str, channels: Iterable[str] = CHANNELS):
+        super().__init__(key_id, private_key, environment)
+        self.channels = tuple(channels)
+        self._subscribers: list[FillSubscription] = []
+        self._subscribers_lock = threading.Lock()
+        self.stats.update({"fills": 0, "order_updates": 0, "gaps": 0})
+        self._channel_seq: Dict[Any, int] = {}  # sid -> last seq
+
+    def subscribe(self) -> FillSubscription:
+        """A new consumer; receives every event from now on. Thread-safe."""
+        sub = FillSubscription()
+        with self._subscribers_lock:
+            self._subscribers = self._subscribers + [sub]
+        return sub
+
+    def unsubscribe(self, sub: FillSubscription) -> None:
+        with self._subscribers_lock:
+            self._subscribers = [s for s in self._subscribers if s is not sub]
+
+    def _flag_missed(self) -> None:
+        for sub in self._subscribers:
+            sub.flag_missed()
+
+    async def on_open(self):
+        self._channel_seq.clear()
+        for channel in self.channels:
+            await self.ws.send(json.dumps({"id": self.message_id, "cmd": "subscribe", "params": {"channels": [channel]}}))
+            self.message_id += 1
+
+    async def on_message(self, message):
+        self._on_account_message(json.loads(message))
+
+    def _on_account_message(self, data: Dict[str, Any]) -> None:
+        kind = data.get("type")
+        if kind not in self.EVENT_TYPES:
+            if kind == "error":
+                print(f"{self.feed_name} error:", data.get("msg"))
+            return
+        sid, seq = data.get("sid"), data.get("seq")
+        if seq is not None:
+            last = self._channel_seq.get(sid)
+            if last is not None and seq != last + 1:
+                self.stats["gaps"] += 1
+                self._flag_missed()
+            self._channel_seq[sid] = seq
+        self.stats["fills" if kind == "fill" else "order_updates"] += 1
+        event = (kind, data.get("msg") or {})
+        for sub in self._subscribers:
+            sub.put(event)
+
+    connection_lost = _flag_missed
+
+
+class AccountFeed(OrderBookEngine, FillFeed):
+    """OrderBookEngine and FillFeed on one WebSocket connection: books for the tracked tickers plus
+    this account's fills and order updates, for consumers that want both (kalshi_api.py's /stream).
+    Same query, listener and subscription API as the two feeds."""
+
+    feed_name = "Account feed"
+
+    def __init__(self, key_id: str, private_key: Any, environment: str, tickers: Iterable[str] = ()):
+        super().__init__(key_id, private_key, environment, tickers)
+        self.channels = FillFeed.CHANNELS
+
+    async def on_open(self):
+        await OrderBookEngine.on_open(self)
+        await FillFeed.on_open(self)
+
+    async def on_message(self, message):
+        data = json.loads(message)
+        if data.get("type") in self.EVENT_TYPES:
+            self._on_account_message(data)
+        else:
+            await self._on_book_message(data)
+
+    def connection_lost(self) -> None:
+        self._mark_unsynced()
+        self._flag_missed()
+
+
+def start_orderbook_engine(client: KalshiHttpClient, tickers: Iterable[str]) -> OrderBookEngine:
+    """Start a background OrderBookEngine using client's credentials."""
+    return OrderBookEngine.for_client(client, tickers).start()
+
+
+def start_fill_feed(client: KalshiHttpClient, channels: Iterable[str] = FillFeed.CHANNELS) -> FillFeed:
+    """Start a background FillFeed using client's credentials."""
+    return FillFeed.for_client(client, channels).start()
+
+
+def start_account_feed(client: KalshiHttpClient, tickers: Iterable[str] = ()) -> AccountFeed:
+    """Start a background AccountFeed using client's credentials."""
+    return AccountFeed.for_client(client, tickers).start()
@@ -0,0 +1,426 @@
+"""
+Local market-data service: one live orderbook per ticker, shared by every process on the host.
+
+The service runs one OrderBookEngine (one Kalshi WebSocket) per environment and serves its books
+over a Unix socket. Bots, the supervisor and kalshi_api.py subscribe to the tickers they need and
+get a snapshot straight away, then a fresh one whenever the book changes. Kalshi read traffic then
+scales with distinct tickers, not processes x tickers x poll rate.
+
+    python -m betting_outs.kalshi.kalshi_marketdata --env prod      # run the service
+
+    md = MarketDataClient(socket_path("PROD"))                       # in a consumer
+    md.add_tickers(["KX-A", "KX-B"])
+    md.best_bid_ask("KX-A")    # same query methods as OrderBookEngine; None until synced
+
+Updates are conflated per client: a slow reader gets the latest book for each ticker it is
+behind on, never an unbounded backlog.
+
+Wire format. Every frame is a 4-byte big-endian length, a 1-byte type, then the body.
+  client -> server  b"S" subscribe, b"U" unsubscribe: tickers joined by "\\n"
+  server -> client  b"B" book: u8 ticker length, ticker, u8 flags (1 = synced), i64 seq (-1 when
+                    unknown), u32 age in ms (since the engine last applied a snapshot or delta),
+                    u8 yes level count, u8 no level count, then (u8 price, u32 qty) per level, yes
+                    levels then no levels, ascending price.
+A frame is 5 bytes per price level plus the ticker and 20 bytes of header, and decodes
+without a JSON parse. The age (not the engine's monotonic timestamp, which means nothing in
+another process) lets a consumer's book.age() count from the upstream update, not from receipt.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import struct
+import tempfile
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+try:
+    from .kalshi_orderbook import OrderBook
+except ImportError:  # imported as a top-level module (kalshi_api.py puts this folder on sys.path)
+    from kalshi_orderbook import OrderBook
+
+SUBSCRIBE = b"S"
+UNSUBSCRIBE = b"U"
+BOOK = b"B"
+SYNCED = 1
+RECONNECT_MIN_SEC = 0.5
+RECONNECT_MAX_SEC = 10.0
+
+_LEN = struct.Struct(">I")
+_META = struct.Struct(">BqIBB")
+MAX_AGE_MS = 2**32 - 1
+
+
+def socket_path(env: str) -> str:
+    """KALSHI_MARKETDATA_SOCKET_<ENV> if set, else <tmp>/kalshi-marketdata-<env>.sock."""
+    env = env.upper()
+    return os.environ.get(f"KALSHI_MARKETDATA_SOCKET_{env}") or os.path.join(
+        tempfile.gettempdir(), f"kalshi-marketdata-{env.lower()}.sock"
+    )
+
+
+def service_available(env: str) -> bool:
+    """True when this platform has Unix sockets and the service's socket exists for env."""
+    return hasattr(socket, "AF_UNIX") and os.path.exists(socket_path(env))
+
+
+def frame(kind: bytes, body: bytes) -> bytes:
+    return _LEN.pack(len(body) + 1) + kind + body
+
+
+def encode_book(ticker: str, book: Optional[OrderBook]) -> bytes:
+    """Body of a BOOK frame. A missing or unsynced book is sent as unsynced with no levels."""
+    t = ticker.encode()
+    if book is None or not book.synced:
+        return bytes((len(t),)) + t + _META.pack(0, -1, 0, 0, 0)
+    flat = []
+    counts = []
+    for arr in (book.yes, book.no):
+        n = 0
+        for price in range(1, len(arr)):
+            qty = arr[price]
+            if qty:
+                flat += (price, qty)
+                n += 1
+        counts.append(n)
+    seq = book.seq if book.seq is not None else -1
+    age_ms = min(MAX_AGE_MS, max(0, round(book.age() * 1000)))
+    return (
+        bytes((len(t),)) + t + _META.pack(SYNCED, seq, age_ms, counts[0], counts[1])
+        + struct.pack(">" + "BI" * (len(flat) // 2), *flat)
+    )
+
+
+def decode_book(body: bytes) -> OrderBook:
+    """OrderBook from a BOOK frame body (synced False when the service has no live book)."""
+    n = body[0]
+    ticker = body[1 : 1 + n].decode()
+    flags, seq, age_ms, n_yes, n_no = _META.unpack_from(body, 1 + n)
+    flat = struct.unpack_from(">" + "BI" * (n_yes + n_no), body, 1 + n + _META.size)
+    levels = list(zip(flat[0::2], flat[1::2]))
+    book = OrderBook(ticker)
+    book.apply_snapshot(levels[:n_yes], levels[n_yes:])
+    book.synced = bool(flags & SYNCED)
+    book.seq = seq if seq >= 0 else None
+    book.updated_at = time.monotonic() - age_ms / 1000
+    return book
+
+
+# ---- server ----
+
+
+class _Connection:
+    """One consumer: the tickers it follows and the ones whose latest book it has not been sent."""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.tickers: set = set()
+        self.dirty: set = set()
+        self.wake = asyncio.Event()
+
+    def mark(self, ticker: str) -> None:
+        self.dirty.add(ticker)
+        self.wake.set()
+
+
+class MarketDataServer:
+    """Serves an OrderBookEngine's books over a Unix socket. Runs on one asyncio loop; the engine
+    keeps its own thread and WebSocket."""
+
+    def __init__(self, engine, path: str):
+        self.engine = engine
+        self.path = path
+        self._subscribers: Dict[str, set] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.stats = {"clients": 0, "subscriptions": 0, "books_sent": 0, "bytes_sent": 0}
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # stale socket from a previous run
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        os.chmod(self.path, 0o660)
+        self.engine.add_listener(self._on_book)
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _on_book(self, ticker: str, book: OrderBook) -> None:
+        """Engine listener (engine thread): hand the change to the server loop."""
+        if ticker in self._subscribers and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._changed, ticker)
+
+    def _changed(self, ticker: str) -> None:
+        for conn in self._subscribers.get(ticker, ()):
+            conn.mark(ticker)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        conn = _Connection(writer)
+        self.stats["clients"] += 1
+        sender = asyncio.create_task(self._send_loop(conn))
+        try:
+            while True:
+                (length,) = _LEN.unpack(await reader.readexactly(_LEN.size))
+                payload = await reader.readexactly(length)
+                kind, tickers = payload[:1], [t for t in payload[1:].decode().split("\n") if t]
+                if kind == SUBSCRIBE:
+                    self._subscribe(conn, tickers)
+                elif kind == UNSUBSCRIBE:
+                    self._unsubscribe(conn, tickers)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._unsubscribe(conn, list(conn.tickers))
+            sender.cancel()
+            self.stats["clients"] -= 1
+            writer.close()
+
+    def _subscribe(self, conn: _Connection, tickers: list) -> None:
+        new = [t for t in tickers if t not in conn.tickers]
+        for t in new:
+            conn.tickers.add(t)
+            self._subscribers.setdefault(t, set()).add(conn)
+            self.stats["subscriptions"] += 1
+            conn.mark(t)  # current state now, updates after
+        self.engine.add_tickers(new)
+
+    def _unsubscribe(self, conn: _Connection, tickers: list) -> None:
+        gone = []
+        for t in tickers:
+            if t in conn.tickers:
+                conn.tickers.discard(t)
+                conn.dirty.discard(t)
+                subs = self._subscribers.get(t)
+                if subs is not None:
+                    subs.discard(conn)
+                    if not subs:
+                        del self._subscribers[t]
+                        gone.append(t)
+                self.stats["subscriptions"] -= 1
+        if gone:
+            # Last consumer left: drop the ticker from the engine's WebSocket subscription too
+            self.engine.remove_tickers(gone)
+
+    async def _send_loop(self, conn: _Connection) -> None:
+        """Send the latest book for every dirty ticker; while drain() waits on a slow reader, new
+        changes only re-mark tickers (conflation)."""
+        while True:
+            await conn.wake.wait()
+            conn.wake.clear()
+            dirty, conn.dirty = conn.dirty, set()
+            frames = []
+            with self.engine.lock:
+                for t in dirty:
+                    frames.append(frame(BOOK, encode_book(t, self.engine.books.get(t))))
+            data = b"".join(frames)
+            conn.writer.write(data)
+            self.stats["books_sent"] += len(frames)
+            self.stats["bytes_sent"] += len(data)
+            try:
+                await conn.writer.drain()
+            except ConnectionError:
+                return
+
+
+# ---- client ----
+
+
+class MarketDataClient:
+    """Consumer side of the service. A reader thread keeps a local OrderBook per subscribed ticker;
+    queries mirror OrderBookEngine (book, best_bid_ask, depth_at, add_tickers, remove_tickers,
+    stop), so the bots can use either. Reconnects with backoff and resubscribes if the service restarts."""
+
+    def __init__(self, path: str, connect_timeout: float = 2.0):
+        self.path = path
+        self.tickers: set = set()
+        self.books: Dict[str, OrderBook] = {}
+        self.lock = threading.Lock()
+        self._changed = threading.Condition(self.lock)
+        self._send_lock = threading.Lock()
+        self._stopping = False
+        self.stats = {"books": 0, "reconnects": 0}
+        self._sock = self._connect(connect_timeout)
+        self._thread = threading.Thread(target=self._read_loop, name="kalshi-marketdata-client", daemon=True)
+        self._thread.start()
+
+    def _connect(self, timeout: Optional[float] = None) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        sock.connect(self.path)
+        sock.settimeout(None)
+        return sock
+
+    def _send(self, kind: bytes, tickers: Iterable[str]) -> None:
+        """Send a request; if the service is gone, shut the socket so the reader thread reconnects
+        and resubscribes self.tickers, instead of raising to the caller."""
+        body = "\n".join(tickers).encode()
+        with self._send_lock:
+            try:
+                self._sock.sendall(frame(kind, body))
+            except OSError:
+                try:
+                    self._sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+    # ---- subscriptions ----
+
+    def add_tickers(self, tickers: Iterable[str]) -> None:
+        new = {t.strip() for t in tickers if t and t.strip()} - self.tickers
+        if new:
+            self.tickers |= new
+            self._send(SUBSCRIBE, sorted(new))
+
+    subscribe = add_tickers
+
+    def unsubscribe(self, tickers: Iterable[str]) -> None:
+        gone = {t.strip() for t in tickers if t} & self.tickers
+        if gone:
+            self.tickers -= gone
+            with self.lock:
+                for t in gone:
+                    self.books.pop(t, None)
+            self._send(UNSUBSCRIBE, sorted(gone))
+
+    remove_tickers = unsubscribe
+
+    def wait_for(self, ticker: str, timeout: float) -> Optional[OrderBook]:
+        """Block until ticker has a synced book (subscribing if needed); a copy, or None on timeout."""
+        self.add_tickers([ticker])
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while True:
+                book = self.books.get(ticker)
+                if book is not None and book.synced:
+                    return book.copy()
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    return None
+                self._changed.wait(left)
+
+    # ---- queries (OrderBookEngine-compatible) ----
+
+    def book(self, ticker: str) -> Optional[OrderBook]:
+        with self.lock:
+            book = self.books.get(ticker)
+            return book.copy() if book is not None and book.synced else None
+
+    def best_bid_ask(self, ticker: str) -> Optional[tuple]:
+        with self.lock:
+            book = self.books.get(ticker)
+            if book is None or not book.synced:
+                return None
+            yes, no = book.best_yes_bid, book.best_no_bid
+            return yes, no, book.depth_at("yes", yes), book.depth_at("no", no)
+
+    def depth_at(self, ticker: str, side: str, price: int) -> Optional[int]:
+        with self.lock:
+            book = self.books.get(ticker)
+            return book.depth_at(side, price) if book is not None and book.synced else None
+
+    def stop(self) -> None:
+        self._stopping = True
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+
+    # ---- reader thread ----
+
+    def _recv_exact(self, n: int) -> bytes:
+        buf = bytearray()
+        while len(buf) < n:
+            chunk = self._sock.recv(n - len(buf))
+            if not chunk:
+                raise ConnectionError("market data service closed the connection")
+            buf += chunk
+        return bytes(buf)
+
+    def _read_loop(self) -> None:
+        delay = RECONNECT_MIN_SEC
+        while not self._stopping:
+            try:
+                while True:
+                    (length,) = _LEN.unpack(self._recv_exact(_LEN.size))
+                    payload = self._recv_exact(length)
+                    if payload[:1] == BOOK:
+                        book = decode_book(payload[1:])
+                        with self._changed:
+                            if book.ticker in self.tickers:
+                                self.books[book.ticker] = book
+                                self.stats["books"] += 1
+                            self._changed.notify_all()
+                        delay = RECONNECT_MIN_SEC
+            except (OSError, ConnectionError, struct.error):
+                if self._stopping:
+                    return
+            with self.lock:
+                for book in self.books.values():
+                    book.synced = False
+            time.sleep(delay)
+            delay = min(RECONNECT_MAX_SEC, delay * 2)
+            try:
+                self._sock = self._connect(RECONNECT_MAX_SEC)
+                self.stats["reconnects"] += 1
+                if self.tickers:
+                    self._send(SUBSCRIBE, sorted(self.tickers))
+            except OSError as e:
+                print("Market data service reconnect failed:", e)
+
+
+# ---- shared clients ----
+
+_clients: Dict[str, MarketDataClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_marketdata_client(env: str) -> Optional[MarketDataClient]:
+    """Process-wide client for env's service, or None when the service is not running."""
+    env = env.upper()
+    with _clients_lock:
+        md = _clients.get(env)
+        if md is None and service_available(env):
+            try:
+                md = _clients[env] = MarketDataClient(socket_path(env))
+            except OSError as e:
+                print(f"Market data service unavailable ({socket_path(env)}): {e}")
+        return md
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve live Kalshi orderbooks to local processes over a Unix socket")
+    parser.add_argument("--env", default=os.environ.get("KALSHI_ENV", "DEMO"))
+    parser.add_argument("--socket", default=None, help="socket path (default: socket_path(env))")
+    args = parser.parse_args()
+    env = args.env.upper()
+
+    from betting_outs.kalshi.kalshi import get_shared_client
+    from betting_outs.kalshi.kalshi_live import start_orderbook_engine
+
+    engine = start_orderbook_engine(get_shared_client(env), [])
+    server = MarketDataServer(engine, args.socket or socket_path(env))
+    print(f"Market data service ({env}) on {server.path}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.stop()
+        if os.path.exists(server.path):
+            os.unlink(server.path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+In-memory orderbook for one Kalshi binary market.
+Kalshi books only carry bids: a Yes bid at p cents is the same as a No ask at 100 - p.
+Prices are whole cents 1–99, so each side is a fixed 100-slot integer array indexed by price
+(slot 0 unused). Updates are in place and the best bid per side is cached.
+"""
+import time
+from array import array
+from itertools import accumulate
+from typing import Any, Dict, Iterable, Optional
+
+SIDES = ("yes", "no")
+MIN_PRICE = 1
+MAX_PRICE = 99
+_SLOTS = MAX_PRICE + 1
+_EMPTY = array('i', bytes(_SLOTS * array('i').itemsize))
+
+
+def _fill(arr: array, rows: Iterable) -> int:
+    """Reset arr in place to integer [[price, qty], ...] rows and return the best price."""
+    arr[:] = _EMPTY
+    best = 0
+    for p, q in rows:
+        if 0 < p < _SLOTS and q > 0:
+            arr[p] = q
+            if p > best:
+                best = p
+    return best
+
+
+class OrderBook:
+    """Yes and No bid quantities in array('i') slots indexed by price, with cached best prices.
+
+    best_bid() and depth_at() are O(1). An update only rescans a side (at most 99 slots) when it
+    empties the current best level.
+    """
+
+    __slots__ = ("ticker", "yes", "no", "_best", "seq", "synced", "updated_at")
+
+    def __init__(self, ticker: str = ""):
+        self.ticker = ticker
+        self.yes = array('i', _EMPTY)
+        self.no = array('i', _EMPTY)
+        self._best: Dict[str, int] = {"yes": 0, "no": 0}
+        self.seq: Optional[int] = None
+        self.synced = False
+        self.updated_at = 0.0  # time.monotonic() of the last snapshot/delta
+
+    @classmethod
+    def from_response(cls, data: Dict[str, Any], ticker: str = "") -> "OrderBook":
+        """Build from a REST GET /markets/{ticker}/orderbook response."""
+        ob = data.get("orderbook") or {}
+        book = cls(ticker)
+        book.apply_snapshot(ob.get("yes") or [], ob.get("no") or [])
+        return book
+
+    def copy(self) -> "OrderBook":
+        other = OrderBook(self.ticker)
+        other.yes = array('i', self.yes)
+        other.no = array('i', self.no)
+        other._best = dict(self._best)
+        other.seq, other.synced, other.updated_at = self.seq, self.synced, self.updated_at
+        return other
+
+    def side(self, side: str) -> array:
+        """The 100-slot quantity array for "yes" or "no" (index = price in cents)."""
+        return self.yes if side == "yes" else self.no
+
+    def _rescan(self, side: str, below: int = _SLOTS) -> int:
+        arr = self.side(side)
+        for price in range(below - 1, 0, -1):
+            if arr[price] > 0:
+                return price
+        return 0
+
+    def apply_snapshot(self, yes_levels: Iterable, no_levels: Iterable) -> None:
+        """Replace both sides with [[price, qty], ...] lists. Out-of-range prices are ignored."""
+        for side, rows in (("yes", yes_levels), ("no", no_levels)):
+            arr = self.side(side)
+            try:
+                self._best[side] = _fill(arr, rows)
+            except TypeError:  # prices/quantities given as strings
+                self._best[side] = _fill(arr, [(int(p), int(q)) for p, q in rows])
+        self.synced = True
+        self.updated_at = time.monotonic()
+
+    def apply_delta(self, side: str, price: int, delta: int) -> None:
+        """Add delta contracts (negative to remove) at price on side, in place."""
+        if not MIN_PRICE <= price <= MAX_PRICE:
+            return
+        arr = self.side(side)
+        qty = arr[price] + delta
+        if qty > 0:
+            arr[price] = qty
+            if price > self._best[side]:
+                self._best[side] = price
+        else:
+            arr[price] = 0
+            if price == self._best[side]:
+                self._best[side] = self._rescan(side, price)
+        self.updated_at = time.monotonic()
+
+    def best_bid(self, side: str) -> int:
+        """Best bid price on side, 0 if that side is empty."""
+        return self._best[side]
+
+    def depth_at(self, side: str, price: int) -> int:
+        """Contracts bid at exactly price on side."""
+        return self.side(side)[price] if 0 <= price < _SLOTS else 0
+
+    @property
+    def best_yes_bid(self) -> int:
+        return self._best["yes"]
+
+    @property
+    def best_no_bid(self) -> int:
+        return self._best["no"]
+
+    @property
+    def best_yes_ask(self) -> Optional[int]:
+        """Implied Yes ask = 100 - best No bid; None when nobody bids No."""
+        return 100 - self._best["no"] if self._best["no"] else None
+
+    @property
+    def best_no_ask(self) -> Optional[int]:
+        """Implied No ask = 100 - best Yes bid; None when nobody bids Yes."""
+        return 100 - self._best["yes"] if self._best["yes"] else None
+
+    def cumulative_depth(self, side: str) -> list:
+        """Index p holds the contracts bid at p or better (>= p) on side; 100 slots."""
+        return list(accumulate(self.side(side)[::-1]))[::-1]
+
+    def vwap_to_size(self, side: str, size: int) -> Optional[tuple[float, int]]:
+        """Walk side's bids from the best price down until size contracts are covered.
+        Returns (volume-weighted price, contracts available up to size), None if the side is empty.
+        Selling into Yes bids uses side="yes"; buying Yes is 100 minus the No-side VWAP."""
+        arr = self.side(side)
+        remaining = size
+        notional = 0
+        for price in range(self._best[side], 0, -1):
+            qty = arr[price]
+            if qty:
+                take = qty if qty < remaining else remaining
+                notional += take * price
+                remaining -= take
+                if remaining == 0:
+                    break
+        filled = size - remaining
+        return (notional / filled, filled) if filled else None
+
+    def age(self) -> float:
+        """Seconds since the last update."""
+        return time.monotonic() - self.updated_at
+
+    def to_levels(self, side: str) -> list:
+        """[[price, qty], ...] ascending, like the REST response."""
+        arr = self.side(side)
+        return [[p, arr[p]] for p in range(MIN_PRICE, _SLOTS) if arr[p]]
@@ -0,0 +1,178 @@
+"""
+Token-bucket rate limiting for the Kalshi API.
+Kalshi meters reads and writes separately (Basic tier: 20 reads / 10 writes per second),
+so RateLimiter keeps one bucket per kind. Buckets refill continuously and allow bursts up
+to their capacity. Safe to share across threads and asyncio tasks.
+
+Env vars (RateLimiter.from_env): KALSHI_RATE_TIER (basic|advanced|premier|prime),
+KALSHI_READ_PER_SEC, KALSHI_WRITE_PER_SEC override the tier numbers.
+"""
+import asyncio
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+# (reads/sec, writes/sec) per Kalshi API tier.
+KALSHI_TIERS = {
+    "basic": (20.0, 10.0),
+    "advanced": (30.0, 30.0),
+    "premier": (100.0, 100.0),
+    "prime": (400.0, 400.0),
+}
+
+# Fraction of the published limit we actually use, to absorb clock skew against Kalshi's own window.
+DEFAULT_SAFETY = 0.9
+
+# Adaptive throttling after a 429: halve the rate (never below MIN_RATE_FRACTION of the configured
+# rate), then win back RECOVER_FRACTION of the configured rate per successful call.
+THROTTLE_FACTOR = 0.5
+MIN_RATE_FRACTION = 0.1
+RECOVER_FRACTION = 0.02
+
+
+class TokenBucket:
+    """Continuous-refill token bucket.
+
+    Acquiring reserves tokens immediately (the balance may go negative) and returns how long the
+    caller must wait before using them. Waiting happens outside the lock, so the same bucket works
+    for blocking threads and asyncio tasks, and costs larger than the capacity never deadlock.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = float(rate)
+        self.base_rate = self.rate
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.tokens = self.capacity
+        self._clock = clock
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self._last = now
+
+    def reserve(self, cost: float = 1.0) -> float:
+        """Take cost tokens and return the seconds to wait before proceeding (0.0 if available now)."""
+        with self._lock:
+            self._refill(self._clock())
+            self.tokens -= cost
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def try_acquire(self, cost: float = 1.0) -> bool:
+        """Take cost tokens only if they are available right now. Never waits."""
+        with self._lock:
+            self._refill(self._clock())
+            if self.tokens >= cost:
+                self.tokens -= cost
+                return True
+            return False
+
+    def available(self) -> float:
+        """Tokens available now (negative while callers are still waiting on reservations)."""
+        with self._lock:
+            self._refill(self._clock())
+            return self.tokens
+
+    def set_rate(self, rate: float, capacity: Optional[float] = None) -> None:
+        """Change the refill rate (and optionally capacity) in place, keeping the current balance."""
+        with self._lock:
+            self._refill(self._clock())
+            self.rate = float(rate)
+            self.base_rate = self.rate
+            if capacity is not None:
+                self.capacity = float(capacity)
+            self.tokens = min(self.tokens, self.capacity)
+
+    def throttle(self) -> None:
+        """The server said 429: cut the rate multiplicatively and drop any banked burst."""
+        with self._lock:
+            self._refill(self._clock())
+            self.rate = max(self.base_rate * MIN_RATE_FRACTION, self.rate * THROTTLE_FACTOR)
+            self.tokens = min(self.tokens, 0.0)
+
+    def recover(self) -> None:
+        """A call succeeded: step the rate back toward the configured rate."""
+        if self.rate >= self.base_rate:
+            return
+        with self._lock:
+            self._refill(self._clock())
+            self.rate = min(self.base_rate, self.rate + self.base_rate * RECOVER_FRACTION)
+
+
+class RateLimiter:
+    """Separate read and write token buckets sized from a Kalshi tier.
+
+    kind is "read" (GET) or "write" (POST/DELETE). burst_sec is how many seconds of traffic a
+    bucket may spend at once after being idle.
+    """
+
+    def __init__(
+        self,
+        read_per_sec: float = KALSHI_TIERS["basic"][0],
+        write_per_sec: float = KALSHI_TIERS["basic"][1],
+        burst_sec: float = 1.0,
+        safety: float = DEFAULT_SAFETY,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        read_rate = read_per_sec * safety
+        write_rate = write_per_sec * safety
+        self.buckets = {
+            "read": TokenBucket(read_rate, max(1.0, read_rate * burst_sec), clock),
+            "write": TokenBucket(write_rate, max(1.0, write_rate * burst_sec), clock),
+        }
+        self._sleep = time.sleep
+
+    @classmethod
+    def from_tier(cls, tier: str = "basic", **kwargs) -> "RateLimiter":
+        reads, writes = KALSHI_TIERS.get((tier or "basic").strip().lower(), KALSHI_TIERS["basic"])
+        return cls(reads, writes, **kwargs)
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        reads, writes = KALSHI_TIERS.get((os.getenv("KALSHI_RATE_TIER") or "basic").strip().lower(), KALSHI_TIERS["basic"])
+        reads = float(os.getenv("KALSHI_READ_PER_SEC") or reads)
+        writes = float(os.getenv("KALSHI_WRITE_PER_SEC") or writes)
+        return cls(reads, writes)
+
+    def bucket(self, kind: str) -> TokenBucket:
+        try:
+            return self.buckets[kind]
+        except KeyError:
+            raise ValueError(f"Unknown rate limit kind: {kind!r} (use 'read' or 'write')")
+
+    def acquire(self, kind: str = "read", cost: float = 1.0) -> None:
+        """Block the calling thread until cost tokens of this kind are available."""
+        wait = self.bucket(kind).reserve(cost)
+        if wait > 0:
+            self._sleep(wait)
+
+    async def acquire_async(self, kind: str = "read", cost: float = 1.0) -> None:
+        """Asyncio variant of acquire: yields to the event loop instead of blocking it."""
+        wait = self.bucket(kind).reserve(cost)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def try_acquire(self, kind: str = "read", cost: float = 1.0) -> bool:
+        """Non-blocking: take cost tokens if available now, else return False and take nothing."""
+        return self.bucket(kind).try_acquire(cost)
+
+    def throttled(self, kind: str) -> None:
+        """Feed back a 429 so this kind's bucket slows down (see TokenBucket.throttle)."""
+        self.bucket(kind).throttle()
+
+    def succeeded(self, kind: str) -> None:
+        """Feed back a successful call so a throttled bucket recovers toward its configured rate."""
+        self.bucket(kind).recover()
+
+    def rates(self) -> dict:
+        """Current refill rate per kind (lower than configured while recovering from 429s)."""
+        return {kind: round(b.rate, 2) for kind, b in self.buckets.items()}
+
+    def headroom(self) -> dict:
+        """Tokens currently available per kind, e.g. for status pages."""
+        return {kind: round(b.available(), 2) for kind, b in self.buckets.items()}
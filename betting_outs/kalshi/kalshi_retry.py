@@ -0,0 +1,88 @@
+"""
+Retry policy for Kalshi REST calls: jittered exponential backoff, Retry-After support and
+counters for monitoring. The clients decide what is safe to retry (reads, and order creation
+because the client_order_id is fixed before the first attempt).
+"""
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+
+# 429 = rate limited; 5xx = transient server trouble.
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class RetryPolicy:
+    """How many times to retry and how long to wait between attempts.
+
+    backoff() uses "full jitter": a uniform wait in [0, min(max_delay, base_delay * 2**attempt)],
+    so many clients retrying together spread out instead of hitting the API in lockstep.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 0.25,
+        max_delay: float = 8.0,
+        max_retry_after: float = 30.0,
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def delay_for(self, attempt: int, headers: Optional[Mapping[str, str]] = None) -> Optional[float]:
+        """Seconds to wait before retry number attempt+1, or None to give up.
+        A Retry-After header wins over backoff; one longer than max_retry_after means give up."""
+        if attempt >= self.max_retries:
+            return None
+        retry_after = parse_retry_after(headers)
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_retry_after else None
+        return self.backoff(attempt)
+
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Retry-After as seconds (accepts delta-seconds or an HTTP date). None if absent or invalid."""
+    if not headers:
+        return None
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryStats:
+    """Thread-safe retry counters. snapshot() returns a plain dict for logs and status endpoints."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, float] = {
+            "retries": 0,
+            "throttled": 0,
+            "server_errors": 0,
+            "network_errors": 0,
+            "gave_up": 0,
+            "backoff_sec": 0.0,
+        }
+
+    def add(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + amount
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            out = dict(self._counts)
+        out["backoff_sec"] = round(out["backoff_sec"], 3)
+        return out
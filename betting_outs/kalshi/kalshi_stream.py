@@ -0,0 +1,298 @@
+"""
+Server-sent event fan-out for kalshi_api.py's GET /stream.
+
+One StreamHub per environment owns one AccountFeed (a single Kalshi WebSocket carrying orderbook
+deltas for the tickers any client asked for, plus this account's fills and order updates) and
+pushes what it sees to every connected client:
+
+    book     {"ticker", "seq", "yes": [[price, qty], ...], "no": [...]}   best level first
+    order    the user_orders message (order state changes)
+    fill     the fill message
+    balance  GET /portfolio/balance, refreshed once per burst of fills instead of UI polling
+    resync   events may have been lost (feed reconnect or this client fell behind): refetch state
+
+Each client has its own filters (event types, tickers) and its own bounded queue. Book updates
+are conflated per ticker, so a slow client gets the latest book rather than every delta; if its
+queue of other events overflows, the queue is dropped and replaced by one "resync" event. The
+feed thread never blocks on a client. Book tickers are reference-counted across clients and
+leave the feed's subscription when the last client following them disconnects.
+"""
+import asyncio
+import json
+import queue
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, Optional
+
+try:
+    from .kalshi_live import AccountFeed, start_account_feed
+except ImportError:  # imported as a top-level module (kalshi_api.py puts this folder on sys.path)
+    from kalshi_live import AccountFeed, start_account_feed
+
+EVENT_TYPES = ("book", "order", "fill", "balance", "resync")
+MAX_QUEUE = 500
+DEFAULT_DEPTH = 10
+HEARTBEAT_SEC = 15.0
+# Fills usually arrive in bursts (one order sweeping several levels): fetch the balance once after.
+BALANCE_DEBOUNCE_SEC = 1.0
+
+
+class StreamClient:
+    """One /stream connection: its filters, pending events and conflated book tickers."""
+
+    def __init__(self, types: Iterable[str] = EVENT_TYPES, tickers: Iterable[str] = (), depth: int = DEFAULT_DEPTH,
+                 max_queue: int = MAX_QUEUE):
+        self.types = set(types) | {"resync"}
+        self.tickers = {t.strip().upper() for t in tickers if t and t.strip()}
+        self.depth = depth
+        self.max_queue = max_queue
+        self.events: list = []
+        self.dirty_books: Dict[str, None] = {}  # insertion-ordered set
+        self.cond = threading.Condition()
+        # Set by atake(): wakes an asyncio waiter from the feed thread
+        self._wake: Optional[Callable[[], None]] = None
+        self._ready: Optional[asyncio.Event] = None
+        self.stats = {"sent": 0, "conflated": 0, "overflows": 0}
+
+    def wants(self, kind: str, ticker: Optional[str]) -> bool:
+        if kind not in self.types:
+            return False
+        if kind == "book":
+            return ticker in self.tickers
+        return not self.tickers or ticker is None or ticker in self.tickers
+
+    def push(self, kind: str, data: Any) -> None:
+        with self.cond:
+            if len(self.events) >= self.max_queue:
+                self.events = [("resync", {"reason": "client too slow"})]
+                self.stats["overflows"] += 1
+            else:
+                self.events.append((kind, data))
+            self._notify()
+
+    def mark_book(self, ticker: str) -> None:
+        with self.cond:
+            if ticker in self.dirty_books:
+                self.stats["conflated"] += 1
+            self.dirty_books[ticker] = None
+            self._notify()
+
+    def _notify(self) -> None:
+        self.cond.notify()
+        if self._wake is not None:
+            try:
+                self._wake()
+            except RuntimeError:  # the consumer's loop is closed
+                self._wake = None
+
+    def take(self, timeout: float) -> tuple:
+        """(events, dirty book tickers), waiting up to timeout for either; both empty on timeout."""
+        with self.cond:
+            if not self.events and not self.dirty_books:
+                self.cond.wait(timeout)
+            events, self.events = self.events, []
+            books, self.dirty_books = list(self.dirty_books), {}
+        return events, books
+
+    async def atake(self, timeout: float) -> tuple:
+        """take() for an asyncio consumer: waits on the event loop, not in a thread."""
+        if self._wake is None:
+            loop, ready = asyncio.get_running_loop(), asyncio.Event()
+            self._ready = ready
+            self._wake = lambda: loop.call_soon_threadsafe(ready.set)
+        with self.cond:
+            pending = not self.events and not self.dirty_books
+            if pending:
+                self._ready.clear()
+        if pending:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.take(0)
+
+
+def sse(kind: str, data: Any) -> str:
+    return f"event: {kind}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+class StreamHub:
+    """Fans one AccountFeed out to StreamClients. feed needs the AccountFeed API (add_tickers,
+    remove_tickers, add_listener, book, subscribe); client is the HTTP client used for balance
+    refreshes."""
+
+    def __init__(self, feed: AccountFeed, client: Any = None):
+        self.feed = feed
+        self.client = client
+        self.clients: list[StreamClient] = []
+        self._ticker_refs: Dict[str, int] = {}  # book ticker -> clients following it
+        self._lock = threading.Lock()
+        self._sub = feed.subscribe()
+        self.balance: Optional[dict] = None
+        self._balance_timer: Optional[threading.Timer] = None
+        self._stopping = False
+        self.stats = {"events": 0, "book_updates": 0, "balance_fetches": 0}
+        feed.add_listener(self._on_book)
+        self._pump = threading.Thread(target=self._pump_account_events, name="kalshi-stream-hub", daemon=True)
+        self._pump.start()
+
+    # ---- clients ----
+
+    def connect(self, client: StreamClient) -> StreamClient:
+        books = client.tickers if "book" in client.types else set()
+        with self._lock:
+            self.clients = self.clients + [client]
+            for t in books:
+                self._ticker_refs[t] = self._ticker_refs.get(t, 0) + 1
+        if books:
+            self.feed.add_tickers(books)
+            for t in books:
+                client.mark_book(t)  # current book first (sent once synced)
+        if "balance" in client.types:
+            if self.balance is not None:
+                client.push("balance", self.balance)
+            else:
+                self.refresh_balance_soon(0)
+        return client
+
+    def disconnect(self, client: StreamClient) -> None:
+        gone = []
+        with self._lock:
+            if client not in self.clients:
+                return
+            self.clients = [c for c in self.clients if c is not client]
+            for t in (client.tickers if "book" in client.types else ()):
+                self._ticker_refs[t] -= 1
+                if not self._ticker_refs[t]:
+                    del self._ticker_refs[t]
+                    gone.append(t)
+        if gone:
+            self.feed.remove_tickers(gone)
+
+    def events(self, client: StreamClient, heartbeat: float = HEARTBEAT_SEC) -> Iterator[str]:
+        """SSE text for client until the caller stops iterating (the HTTP connection closes)."""
+        self.connect(client)
+        try:
+            yield self._hello(client)
+            while not self._stopping:
+                yield self._chunk(client, *client.take(heartbeat))
+        finally:
+            self.disconnect(client)
+
+    async def aevents(self, client: StreamClient, heartbeat: float = HEARTBEAT_SEC) -> AsyncIterator[str]:
+        """events() for an ASGI server: waits on the event loop, so an open stream holds no thread."""
+        self.connect(client)
+        try:
+            yield self._hello(client)
+            while not self._stopping:
+                yield self._chunk(client, *await client.atake(heartbeat))
+        finally:
+            self.disconnect(client)
+
+    def _hello(self, client: StreamClient) -> str:
+        return sse("hello", {"types": sorted(client.types), "tickers": sorted(client.tickers)})
+
+    def _chunk(self, client: StreamClient, events: list, books: list) -> str:
+        """SSE text for one take(): the events, then the current book of each dirty ticker."""
+        chunks = [sse(kind, data) for kind, data in events]
+        for t in books:
+            book = self.feed.book(t)
+            if book is not None:
+                chunks.append(sse("book", book_event(t, book, client.depth)))
+        if not chunks:
+            return ": ping\n\n"
+        client.stats["sent"] += len(chunks)
+        return "".join(chunks)
+
+    def _publish(self, kind: str, ticker: Optional[str], data: Any) -> None:
+        self.stats["events"] += 1
+        for c in self.clients:
+            if c.wants(kind, ticker):
+                c.push(kind, data)
+
+    # ---- feed side ----
+
+    def _on_book(self, ticker: str, book: Any) -> None:
+        """Feed listener (feed thread): mark the ticker for clients following it; never blocks."""
+        self.stats["book_updates"] += 1
+        for c in self.clients:
+            if c.wants("book", ticker):
+                c.mark_book(ticker)
+
+    def _pump_account_events(self) -> None:
+        while not self._stopping:
+            if self._sub.missed.is_set():
+                self._sub.missed.clear()
+                self._publish("resync", None, {"reason": "feed reconnected"})
+            try:
+                kind, msg = self._sub.events.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            if kind == "fill":
+                self._publish("fill", msg.get("market_ticker") or msg.get("ticker"), msg)
+                self.refresh_balance_soon()
+            else:
+                self._publish("order", msg.get("ticker") or msg.get("market_ticker"), msg)
+
+    def refresh_balance_soon(self, delay: Optional[float] = None) -> None:
+        """Fetch the balance after delay (default BALANCE_DEBOUNCE_SEC), once however many times
+        this is called meanwhile."""
+        if self.client is None:
+            return
+        if delay is None:
+            delay = BALANCE_DEBOUNCE_SEC
+        with self._lock:
+            if self._balance_timer is not None and self._balance_timer.is_alive():
+                return
+            self._balance_timer = threading.Timer(delay, self._refresh_balance)
+            self._balance_timer.daemon = True
+            self._balance_timer.start()
+
+    def _refresh_balance(self) -> None:
+        try:
+            balance = self.client.get_balance()
+        except Exception as e:
+            print("Stream balance refresh failed:", e)
+            return
+        self.stats["balance_fetches"] += 1
+        if balance != self.balance:
+            self.balance = balance
+            self._publish("balance", None, balance)
+
+    def status(self) -> dict:
+        return {
+            **self.stats,
+            "clients": [{"types": sorted(c.types), "tickers": sorted(c.tickers), **c.stats} for c in self.clients],
+            "feed": dict(self.feed.stats),
+        }
+
+    def stop(self) -> None:
+        self._stopping = True
+        self.feed.unsubscribe(self._sub)
+        self.feed.stop()
+
+
+def book_event(ticker: str, book: Any, depth: Optional[int]) -> dict:
+    return {
+        "ticker": ticker,
+        "seq": book.seq,
+        "yes": book.to_levels("yes")[::-1][:depth],
+        "no": book.to_levels("no")[::-1][:depth],
+        "age_ms": round(book.age() * 1000),
+    }
+
+
+_hubs: Dict[str, StreamHub] = {}
+_hubs_lock = threading.Lock()
+
+
+def get_stream_hub(env: str) -> StreamHub:
+    """Process-wide hub for env; starts its AccountFeed on first use."""
+    from betting_outs.kalshi.kalshi import get_shared_client
+
+    env = env.upper()
+    with _hubs_lock:
+        hub = _hubs.get(env)
+        if hub is None:
+            client = get_shared_client(env)
+            hub = _hubs[env] = StreamHub(start_account_feed(client), client)
+        return hub
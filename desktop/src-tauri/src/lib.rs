@@ -1081,6 +1081,12 @@ fn kalshi_delete(env: &str, path: &str) -> Result<serde_json::Value, String> {
     Ok(body)
 }
 
+/// Base URL of the Kalshi API server, for the UI's EventSource on /stream.
+#[tauri::command]
+fn kalshi_api_url() -> String {
+    kalshi_base_url().trim_end_matches('/').to_string()
+}
+
 #[tauri::command]
 fn kalshi_server_status() -> Result<bool, String> {
     let url = format!("{}/health", kalshi_base_url().trim_end_matches('/'));
@@ -1300,6 +1306,8 @@ fn kalshi_market_making_create(
     env: Option<String>,
     markets: Vec<String>,
     order_size: u32,
+    yes_price: Option<u32>,
+    no_price: Option<u32>,
     refill_mode: String,
     stop_max_shares: Option<u64>,
     stop_max_dollars: Option<u64>,
@@ -1309,6 +1317,8 @@ fn kalshi_market_making_create(
     let body = serde_json::json!({
         "markets": markets,
         "order_size": order_size,
+        "yes_price": yes_price,
+        "no_price": no_price,
         "refill_mode": refill_mode,
         "stop_max_shares": stop_max_shares,
         "stop_max_dollars": stop_max_dollars,
@@ -1324,6 +1334,17 @@ fn kalshi_orderbook(env: Option<String>, ticker: String) -> Result<serde_json::V
     kalshi_get(env, &path, &[])
 }
 
+#[tauri::command]
+fn kalshi_orderbooks(
+    env: Option<String>,
+    tickers: Vec<String>,
+    depth: Option<u32>,
+) -> Result<serde_json::Value, String> {
+    let env = env.as_deref().unwrap_or("demo");
+    let body = serde_json::json!({ "tickers": tickers, "depth": depth });
+    kalshi_post_json(env, "/orderbooks", body)
+}
+
 fn market_maker_script_content(tickers: &[String]) -> String {
     let ticker_list = if tickers.is_empty() {
         r#""TICKER1", "TICKER2"  # Add your market tickers"#.to_string()
@@ -2112,6 +2133,7 @@ pub fn run() {
             tweets_server_status,
             tweets_server_status_blocking,
             kalshi_server_status,
+            kalshi_api_url,
             start_kalshi_server,
             stop_kalshi_server,
             kalshi_balance,
@@ -2127,6 +2149,7 @@ pub fn run() {
             kalshi_market_making_restart,
             kalshi_market_making_create,
             kalshi_orderbook,
+            kalshi_orderbooks,
             generate_market_maker_script,
             generate_combined_no_strategy_script,
             write_combined_no_script,
@@ -772,16 +772,119 @@ async function refreshKalshiStatus() {
   }
 }
 
+function renderKalshiBalance(b) {
+  if (!kalshiBalanceEl) return;
+  const balanceCents = (b && b.balance) != null ? b.balance : null;
+  const portfolioCents = (b && b.portfolio_value) != null ? b.portfolio_value : null;
+  const balStr = balanceCents != null ? `Balance: $${(balanceCents / 100).toFixed(2)}` : "—";
+  const portStr = portfolioCents != null ? `Portfolio: $${(portfolioCents / 100).toFixed(2)}` : "";
+  kalshiBalanceEl.textContent = [balStr, portStr].filter(Boolean).join(" · ");
+}
+
+// Live updates from the Kalshi API's /stream (server-sent events): balance is pushed directly and
+// order / fill events are applied to the lists in place. Only "resync" (events may have been lost)
+// refetches everything over REST, once per burst.
+let kalshiStream = null;
+let kalshiStreamEnv = null;
+let kalshiStreamRefreshTimer = null;
+// Resting orders by order id and positions by ticker, as last fetched and then updated by events.
+let kalshiOrders = new Map();
+let kalshiPositions = new Map();
+
+function scheduleKalshiStreamRefresh() {
+  if (kalshiStreamRefreshTimer) return;
+  kalshiStreamRefreshTimer = setTimeout(() => {
+    kalshiStreamRefreshTimer = null;
+    kalshiRefreshData();
+  }, 500);
+}
+
+function applyKalshiOrderEvent(o) {
+  const id = String(o.order_id || o.id || "");
+  if (!id) return;
+  if (o.status === "resting") kalshiOrders.set(id, { ...(kalshiOrders.get(id) || {}), ...o });
+  else kalshiOrders.delete(id);
+  renderKalshiOrders();
+}
+
+function applyKalshiFillEvent(f) {
+  const ticker = f.market_ticker || f.ticker;
+  if (!ticker) return;
+  const prev = kalshiPositions.get(ticker) || { ticker };
+  let position = f.post_position;
+  if (position == null) {
+    // Yes contracts count positive, No negative; selling reverses the direction.
+    const sign = (f.side === "no" ? -1 : 1) * (f.action === "sell" ? -1 : 1);
+    position = (prev.position || 0) + sign * (f.count || 0);
+  }
+  if (position === 0) kalshiPositions.delete(ticker);
+  else kalshiPositions.set(ticker, { ...prev, position, position_cost: undefined }); // cost known after the next refetch
+  renderKalshiPositions();
+}
+
+async function startKalshiStream() {
+  const env = kalshiEnv();
+  if ((kalshiStream && kalshiStreamEnv === env) || typeof EventSource === "undefined") return;
+  if (kalshiStream) kalshiStream.close();
+  kalshiStream = null;
+  let base;
+  try {
+    base = await invoke("kalshi_api_url");
+  } catch (_) {
+    return;
+  }
+  kalshiStreamEnv = env;
+  kalshiStream = new EventSource(`${base}/stream?env=${encodeURIComponent(env)}&types=order,fill,balance`);
+  kalshiStream.addEventListener("balance", (e) => renderKalshiBalance(JSON.parse(e.data)));
+  kalshiStream.addEventListener("order", (e) => applyKalshiOrderEvent(JSON.parse(e.data)));
+  kalshiStream.addEventListener("fill", (e) => applyKalshiFillEvent(JSON.parse(e.data)));
+  kalshiStream.addEventListener("resync", scheduleKalshiStreamRefresh);
+}
+
+function renderKalshiOrders() {
+  if (!kalshiOrdersListEl) return;
+  const orders = [...kalshiOrders.values()];
+  if (orders.length === 0) {
+    kalshiOrdersListEl.innerHTML = "<p class=\"empty-state\">No resting orders.</p>";
+    return;
+  }
+  kalshiOrdersListEl.innerHTML = orders.map((o) => {
+    const id = escapeHtml(o.order_id || o.id || "?");
+    const ticker = escapeHtml(o.ticker || "?");
+    const side = escapeHtml((o.side || "yes").toUpperCase());
+    const count = o.remaining_count ?? o.count ?? "?";
+    const price = o.yes_price ?? o.no_price ?? "?";
+    return `<div class="kalshi-order-row">
+      <span class="kalshi-order-ticker">${ticker}</span> ${side} ${count} @ ${price}¢
+      <button type="button" class="kalshi-cancel-btn secondary" data-order-id="${escapeAttr(String(o.order_id || o.id || ""))}">Cancel</button>
+    </div>`;
+  }).join("");
+  kalshiOrdersListEl.querySelectorAll(".kalshi-cancel-btn").forEach((btn) => {
+    btn.addEventListener("click", () => kalshiCancelOrder(btn.dataset.orderId));
+  });
+}
+
+function renderKalshiPositions() {
+  if (!kalshiPositionsListEl) return;
+  const positions = [...kalshiPositions.values()];
+  if (!positions.length) {
+    kalshiPositionsListEl.innerHTML = "<p class=\"empty-state\">No positions.</p>";
+    return;
+  }
+  kalshiPositionsListEl.innerHTML = positions.map((p) => {
+    const ticker = escapeHtml(p.ticker || p.market_ticker || "?");
+    const pos = p.position ?? p.contracts ?? "?";
+    const cost = p.position_cost != null ? (p.position_cost / 10000).toFixed(2) : "";
+    return `<div class="kalshi-position-row"><span class="kalshi-position-ticker">${ticker}</span> position: ${pos}${cost ? " · cost: $" + cost : ""}</div>`;
+  }).join("");
+}
+
 async function kalshiRefreshData() {
   const env = kalshiEnv();
+  startKalshiStream();
   if (kalshiBalanceEl) {
     try {
-      const b = await invoke("kalshi_balance", { env });
-      const balanceCents = (b && b.balance) != null ? b.balance : null;
-      const portfolioCents = (b && b.portfolio_value) != null ? b.portfolio_value : null;
-      const balStr = balanceCents != null ? `Balance: $${(balanceCents / 100).toFixed(2)}` : "—";
-      const portStr = portfolioCents != null ? `Portfolio: $${(portfolioCents / 100).toFixed(2)}` : "";
-      kalshiBalanceEl.textContent = [balStr, portStr].filter(Boolean).join(" · ");
+      renderKalshiBalance(await invoke("kalshi_balance", { env }));
     } catch (e) {
       kalshiBalanceEl.textContent = "Error: " + (e && e.toString());
     }
@@ -799,44 +902,16 @@ async function kalshiRefreshData() {
   try {
     const ordersResp = await invoke("kalshi_orders", { env, limit: 50, status: "resting" });
     const orders = (ordersResp && ordersResp.orders) || [];
-    if (kalshiOrdersListEl) {
-      if (orders.length === 0) {
-        kalshiOrdersListEl.innerHTML = "<p class=\"empty-state\">No resting orders.</p>";
-      } else {
-        kalshiOrdersListEl.innerHTML = orders.map((o) => {
-          const id = escapeHtml(o.order_id || o.id || "?");
-          const ticker = escapeHtml(o.ticker || "?");
-          const side = escapeHtml((o.side || "yes").toUpperCase());
-          const count = o.remaining_count ?? o.count ?? "?";
-          const price = o.yes_price ?? o.no_price ?? "?";
-          return `<div class="kalshi-order-row">
-            <span class="kalshi-order-ticker">${ticker}</span> ${side} ${count} @ ${price}¢
-            <button type="button" class="kalshi-cancel-btn secondary" data-order-id="${escapeAttr(String(o.order_id || o.id || ""))}">Cancel</button>
-          </div>`;
-        }).join("");
-        kalshiOrdersListEl.querySelectorAll(".kalshi-cancel-btn").forEach((btn) => {
-          btn.addEventListener("click", () => kalshiCancelOrder(btn.dataset.orderId));
-        });
-      }
-    }
+    kalshiOrders = new Map(orders.map((o) => [String(o.order_id || o.id || ""), o]));
+    renderKalshiOrders();
   } catch (e) {
     if (kalshiOrdersListEl) kalshiOrdersListEl.innerHTML = "<p class=\"empty-state\">Error: " + escapeHtml(String(e)) + "</p>";
   }
   try {
     const posResp = await invoke("kalshi_positions", { env, limit: 50 });
     const positions = (posResp && posResp.market_positions) || posResp?.positions || [];
-    if (kalshiPositionsListEl) {
-      if (!positions.length) {
-        kalshiPositionsListEl.innerHTML = "<p class=\"empty-state\">No positions.</p>";
-      } else {
-        kalshiPositionsListEl.innerHTML = positions.map((p) => {
-          const ticker = escapeHtml(p.ticker || p.market_ticker || "?");
-          const pos = p.position ?? p.contracts ?? "?";
-          const cost = p.position_cost != null ? (p.position_cost / 10000).toFixed(2) : "";
-          return `<div class="kalshi-position-row"><span class="kalshi-position-ticker">${ticker}</span> position: ${pos}${cost ? " · cost: $" + cost : ""}</div>`;
-        }).join("");
-      }
-    }
+    kalshiPositions = new Map(positions.map((p) => [p.ticker || p.market_ticker, p]));
+    renderKalshiPositions();
   } catch (e) {
     if (kalshiPositionsListEl) kalshiPositionsListEl.innerHTML = "<p class=\"empty-state\">Error: " + escapeHtml(String(e)) + "</p>";
   }
@@ -1052,7 +1127,7 @@ if (btnKalshiPlaceBatch) {
     if (expirationType === "good_till_canceled") extra.time_in_force = "good_till_canceled";
     else if (expirationTs != null) extra.expiration_ts = expirationTs;
     const orders = [];
-    const maxOrders = 10;
+    const maxOrders = 20;
     for (const ticker of kalshiBatchTickers) {
       if (orders.length >= maxOrders) break;
       if (sides === "both") {
@@ -1547,13 +1622,21 @@ async function loadMmStrategies() {
     const data = await invoke("kalshi_market_making_strategies", { env: mmEnv() });
     const strategies = (data && data.strategies) || [];
     if (strategies.length === 0) {
-      mmStrategiesListEl.innerHTML = "<p class=\"empty-state\">No active strategies. Start one above. (Bot engine not yet implemented.)</p>";
+      mmStrategiesListEl.innerHTML = "<p class=\"empty-state\">No active strategies. Start one above.</p>";
     } else {
       mmStrategiesListEl.innerHTML = strategies.map((s) => {
         const id = s.id || "?";
         const status = s.status || "unknown";
+        const resting = typeof s.resting_orders === "object" && s.resting_orders !== null
+          ? Object.keys(s.resting_orders).length : s.resting_orders;
+        const details = [
+          s.fills != null ? `${s.fills} filled` : "",
+          resting != null ? `${resting} resting` : "",
+          s.last_cycle_ms != null ? `${s.last_cycle_ms} ms/cycle` : "",
+        ].filter(Boolean).join(" · ");
         return `<div class="strategy-row">
           <span>${escapeHtml(id)}</span>
+          <span class="meta">${escapeHtml(details)}</span>
           <span class="status-pill status-${status === "running" ? "on" : "off"}">${escapeHtml(status)}</span>
           <button type="button" class="secondary mm-restart-btn" data-id="${escapeAttr(id)}">Restart</button>
         </div>`;
@@ -1581,13 +1664,16 @@ if (btnMmRefreshStrategies) {
 
 if (btnMmLoadOrderbook && mmOrderbookTicker && mmOrderbookDisplay) {
   btnMmLoadOrderbook.addEventListener("click", async () => {
-    const ticker = (mmOrderbookTicker && mmOrderbookTicker.value.trim()) || "";
-    if (!ticker) {
+    const tickers = ((mmOrderbookTicker && mmOrderbookTicker.value) || "").split(/[\s,]+/).filter(Boolean);
+    if (tickers.length === 0) {
       showToast("Enter a market ticker.", "error");
       return;
     }
     try {
-      const data = await invoke("kalshi_orderbook", { env: mmEnv(), ticker });
+      // Several tickers (e.g. a strike ladder) load in one POST /orderbooks call.
+      const data = tickers.length === 1
+        ? await invoke("kalshi_orderbook", { env: mmEnv(), ticker: tickers[0] })
+        : await invoke("kalshi_orderbooks", { env: mmEnv(), tickers, depth: 10 });
       mmOrderbookDisplay.innerHTML = "<pre>" + escapeHtml(JSON.stringify(data, null, 2)) + "</pre>";
     } catch (err) {
       mmOrderbookDisplay.innerHTML = "<p class=\"empty-state\">Error: " + escapeHtml(String(err)) + "</p>";
@@ -1,14 +1,14 @@
 """
 Kalshi per-stake market making bot.
 Reads config from market_making/config.json (or MARKET_MAKING_CONFIG path).
+Fill totals, paused stakes and open orders persist in market_making/state/state.db, so a
+restart resumes where it left off instead of re-placing initial orders.
 Run: python -m market_making.bot
 """
 from __future__ import annotations
 
 import json
-import math
 import os
-import signal
 import sys
 import time
 import urllib.request
@@ -30,9 +30,15 @@ try:
 except ImportError:
     pass
 
-from betting_outs.kalshi.kalshi import get_client
+from betting_outs.kalshi.kalshi_live import FillSubscription, OrderBookEngine
+from betting_outs.kalshi.kalshi_orderbook import OrderBook
+from market_making.fills import BoundedSet, FillTracker, FillWatermark, fill_ts, next_events
+from market_making.stakes import Stake, StakeIndex, market_mean_cents  # noqa: F401  (market_mean_cents re-exported)
+from market_making.strategy import Strategy, new_client_order_id
 
 DEFAULT_CONFIG_PATH = os.path.join(_script_dir, "config.json")
+# With the WebSocket fill feed on, executed orders are still polled this often as a safety net.
+DEFAULT_RECONCILE_SEC = 300
 
 
 def load_config(path: Optional[str] = None) -> dict:
@@ -42,11 +48,6 @@ def load_config(path: Optional[str] = None) -> dict:
         return json.load(f)
 
 
-def market_mean_cents(best_bid: int, best_ask: int) -> int:
-    """Round down: (48+49)/2 = 48.5 -> 48."""
-    return math.floor((best_bid + best_ask) / 2)
-
-
 def repost_price_from_base(
     stake: dict,
     prev_fill: Optional[int],
@@ -55,17 +56,7 @@ def repost_price_from_base(
     side: str,
 ) -> int:
     """Compute repost price from base, then subtract cents_off."""
-    base = stake.get("repost_base") or "previous_fill"
-    if base == "previous_fill" and prev_fill is not None:
-        base_price = prev_fill
-    elif base == "market_mean":
-        base_price = market_mean_cents(best_bid, best_ask)
-    elif base == "market_best_offer":
-        base_price = best_ask if side == "yes" else (100 - best_bid)
-    else:
-        base_price = prev_fill or 50
-    cents_off = max(0, int(stake.get("cents_off") or 0))
-    return max(1, min(99, base_price - cents_off))
+    return Stake(stake).repost_price(prev_fill, best_bid, best_ask, side)
 
 
 def send_alert(url: Optional[str], ticker: str, reason: str) -> None:
@@ -84,72 +75,141 @@ def send_alert(url: Optional[str], ticker: str, reason: str) -> None:
             print(f"Alert webhook failed: {e}")
 
 
-def get_orderbook(client: Any, ticker: str, env: str) -> tuple[int, int]:
-    """Fetch orderbook and return (best_bid, best_ask). Yes at best bid, no at best ask."""
-    try:
-        data = client.get_orderbook(ticker)
-        ob = data.get("orderbook") or {}
-        yes_bids = ob.get("yes") or []
-        no_bids = ob.get("no") or []
-        # Yes bids: [[price, qty], ...] sorted ascending; best bid = last
-        # No bid at price X = Yes ask at 100-X
-        best_yes_bid = int(yes_bids[-1][0]) if yes_bids else 1
-        best_no_bid = int(no_bids[-1][0]) if no_bids else 1
-        best_yes_ask = 100 - best_no_bid  # No bid at 51 = Yes ask at 49
-        best_no_ask = 100 - best_yes_bid
-        return best_yes_bid, best_yes_ask
-    except Exception as e:
-        print(f"Orderbook fetch failed for {ticker}: {e}")
-        return 1, 99
-
+def get_orderbook(client: Any, ticker: str, env: str, live: Optional[OrderBookEngine] = None) -> tuple[int, int]:
+    """Return (best_bid, best_ask) from the live book when synced, else from REST. Yes at best bid, no at best ask."""
+    return get_orderbooks(client, [ticker], env, live)[ticker]
 
-def run(config: dict, env: Optional[str] = None) -> None:
-    """Run the market making loop. KALSHI_ENV (from env) overrides config env."""
-    env = (os.environ.get("KALSHI_ENV") or env or config.get("env") or "DEMO").upper()
-    event_ticker = config.get("event_ticker") or ""
-    check_interval = int(config.get("check_interval_sec") or 30)
-    alert_url = config.get("alert_webhook_url")
-    stakes = config.get("stakes") or []
 
-    if not stakes:
-        print("No stakes in config. Exiting.")
-        return
-
-    client = get_client(env)
+def get_orderbooks(
+    client: Any, tickers: list[str], env: str, live: Optional[OrderBookEngine] = None
+) -> dict[str, tuple[int, int]]:
+    """get_orderbook for many tickers: synced live books from memory, the rest fetched from REST
+    concurrently (client.get_orderbooks). (1, 99) for a book that could not be read."""
+    tops: dict[str, tuple[int, int]] = {}
+    missing = []
+    for ticker in tickers:
+        top = live.best_bid_ask(ticker) if live is not None else None
+        if top is None:
+            missing.append(ticker)
+            continue
+        best_yes_bid, best_no_bid = top[0] or 1, top[1] or 1
+        tops[ticker] = (best_yes_bid, 100 - best_no_bid)
+    if missing:
+        for ticker, data in client.get_orderbooks(missing).items():
+            try:
+                if isinstance(data, Exception):
+                    raise data
+                book = OrderBook.from_response(data, ticker)
+                # No bid at price X = Yes ask at 100-X; an empty side counts as a 1c bid
+                best_yes_bid = book.best_yes_bid or 1
+                best_no_bid = book.best_no_bid or 1
+                tops[ticker] = (best_yes_bid, 100 - best_no_bid)  # No bid at 51 = Yes ask at 49
+            except Exception as e:
+                print(f"Orderbook fetch failed for {ticker}: {e}")
+                tops[ticker] = (1, 99)
+    return tops
+
+
+class StakeBot(Strategy):
+    """Per-stake market maker for one event: keeps each stake's orders up and reposts after fills."""
+
+    kind = "mm"
+
+    def __init__(self, config: dict, env: Optional[str] = None, **shared: Any):
+        super().__init__(config, env, **shared)
+        self.check_interval = int(config.get("check_interval_sec") or 30)
+        self.stakes = config.get("stakes") or []
+        # Executed orders find their stake by (ticker, side) in O(1)
+        self.index = StakeIndex(self.stakes)
+        self.scope = f"mm:{self.name or self.event_ticker or 'default'}"
+        self.live: Optional[OrderBookEngine] = None
+        self.fills: Optional[FillSubscription] = None
+        self.reconcile_interval = self.check_interval
+        # Per-stake state: ticker -> {total_filled, last_fill_price, our_order_ids, paused}
+        self.state: dict[str, dict] = {}
+        # Bounded (LRU) so a multi-week run does not grow memory
+        self.our_order_ids = BoundedSet()
+        self.processed_order_ids = BoundedSet()
+        self.tracker = FillTracker()
+        self.watermark = FillWatermark()
+        # (executed order, time.monotonic() it was seen) waiting for handle_executed
+        self.ready: list[tuple[dict, float]] = []
+        self.next_reconcile = 0.0
+
+    def setup(self) -> None:
+        config = self.config
+        self.live = self.market_data.orderbooks(config, [s.get("ticker") for s in self.stakes])
+        self.fills = self.market_data.subscribe_fills(config)
+        if self.fills is not None:
+            # A fill or a feed gap runs the next step straight away
+            self.fills.wake = self.wake_up
+            self.reconcile_interval = int(
+                config.get("reconcile_interval_sec") or max(self.check_interval, DEFAULT_RECONCILE_SEC)
+            )
+        saved = self.store.load(self.scope)
+        totals = self.store.fill_totals(self.scope)
+        self.tracker.restore(saved.get("open_orders"))
+        self.our_order_ids.update(saved.get("open_orders") or {})
+        self.watermark = FillWatermark.from_dict(saved.get("fill_watermark"))
+
+        # Initialize state, then place every stake's initial orders in batched requests
+        to_place = []
+        for stake in self.stakes:
+            ticker = stake.get("ticker")
+            if not ticker:
+                continue
+            t = totals.get(ticker) or {}
+            self.state[ticker] = {
+                "total_filled": t.get("total_filled", 0),
+                "last_fill_price": t.get("last_fill_price"),
+                "active_order_ids": [],
+                "paused": bool(saved.get(f"paused:{ticker}")),
+            }
+            if saved.get(f"placed:{ticker}"):
+                print(f"Resuming {ticker}: {self.state[ticker]['total_filled']} filled so far; initial orders already placed")
+                continue
+            to_place.append(stake)
+        for ticker, ids in self.place_initial_orders(to_place).items():
+            self.state[ticker]["our_order_ids"] = ids
+            self.our_order_ids.update(ids)
+            self.store.put(self.scope, f"placed:{ticker}", True)
+            print(f"Placed initial orders for {ticker}: {ids}")
 
-    def shutdown_cancel_all() -> None:
-        """On SIGTERM (systemd stop): batch cancel all resting mm_ orders for this event."""
-        if not event_ticker:
-            return
+        if self.fills is None:
+            print(f"Market making started for {self.event_ticker}. Check interval: {self.check_interval}s")
+        else:
+            print(f"Market making started for {self.event_ticker}. Fills via WebSocket, reconcile every {self.reconcile_interval}s")
+
+    def shutdown(self) -> None:
+        """Batch cancel this strategy's resting mm_ orders and release its feeds."""
+        self.market_data.unsubscribe_fills(self.fills)
+        if self.live is not None:
+            self.market_data.release_orderbooks(s.get("ticker") for s in self.stakes)
+            self.live = None
         try:
-            resp = client.get_orders(limit=200, status="resting", event_ticker=event_ticker)
-            orders = resp.get("orders") or []
-            our_ids = [
-                str(o.get("order_id") or o.get("id") or "")
-                for o in orders
-                if (o.get("client_order_id") or "").strip().startswith("mm_")
-            ]
+            our_ids = self.resting_order_ids("mm_", (s.get("ticker") for s in self.stakes), self.our_order_ids)
             if our_ids:
-                client.batch_cancel_orders(our_ids)
+                self.client.batch_cancel_orders(our_ids)
                 print(f"Shutdown: batch cancelled {len(our_ids)} order(s)")
             else:
                 print("Shutdown: no resting orders to cancel")
+            # Nothing rests now, so the next start places initial orders again
+            self.store.delete_prefix(self.scope, "placed:")
+            self.store.put(self.scope, "open_orders", {})
         except Exception as e:
             print(f"Shutdown cancel failed: {e}")
-        sys.exit(0)
-
-    def _on_sigterm(signum: int, frame: Any) -> None:
-        shutdown_cancel_all()
-
-    signal.signal(signal.SIGTERM, _on_sigterm)
 
-    # Per-stake state: ticker -> {total_filled, last_fill_price, our_order_ids, paused}
-    state: dict[str, dict] = {}
-    our_order_ids: set[str] = set()
-    processed_order_ids: set[str] = set()
-
-    def place_initial_orders(stake: dict) -> list[str]:
-        """Place initial orders for a stake. Returns list of order_ids."""
+    def track_order(self, r: dict, ticker: str, side: str, count: int) -> str:
+        """Order id from a create_order response, registered with the fill tracker."""
+        oid = str(r.get("order", {}).get("order_id") or r.get("order_id") or "")
+        if oid:
+            done = self.tracker.expect(oid, ticker, side, count)
+            if done:
+                self.ready.append((done, time.monotonic()))
+        return oid
+
+    def initial_orders(self, stake: dict) -> list[dict]:
+        """create_order arguments for a stake's initial orders (yes and/or no side)."""
         ticker = stake.get("ticker")
         shares = int(stake.get("shares") or 0)
         side = (stake.get("side") or "yes").lower()
@@ -157,133 +217,175 @@ def run(config: dict, env: Optional[str] = None) -> None:
         no_price = stake.get("no_price")
         if not ticker or shares < 1:
             return []
-        order_ids = []
+        orders = []
         if side in ("yes", "both") and yes_price is not None:
-            try:
-                r = client.create_order(
-                    ticker=ticker,
-                    action="buy",
-                    side="yes",
-                    count=shares,
-                    yes_price=int(yes_price),
-                    client_order_id=f"mm_{ticker}_yes",
-                )
-                order_ids.append(r.get("order", {}).get("order_id") or r.get("order_id", ""))
-            except Exception as e:
-                print(f"Place yes failed {ticker}: {e}")
+            orders.append({"ticker": ticker, "action": "buy", "side": "yes", "count": shares, "yes_price": int(yes_price),
+                           "client_order_id": new_client_order_id(f"mm_{ticker}_yes")})
         if side in ("no", "both") and no_price is not None:
-            try:
-                r = client.create_order(
-                    ticker=ticker,
-                    action="buy",
-                    side="no",
-                    count=shares,
-                    no_price=int(no_price),
-                    client_order_id=f"mm_{ticker}_no",
-                )
-                order_ids.append(r.get("order", {}).get("order_id") or r.get("order_id", ""))
-            except Exception as e:
-                print(f"Place no failed {ticker}: {e}")
-        return [oid for oid in order_ids if oid]
-
-    def process_fill(stake: dict, order: dict) -> None:
-        """Handle a filled order: repost if within limits."""
-        ticker = stake.get("ticker")
-        if not ticker or state.get(ticker, {}).get("paused"):
-            return
-        s = state[ticker]
+            orders.append({"ticker": ticker, "action": "buy", "side": "no", "count": shares, "no_price": int(no_price),
+                           "client_order_id": new_client_order_id(f"mm_{ticker}_no")})
+        return orders
+
+    def place_initial_orders(self, stakes: list[dict]) -> dict[str, list[str]]:
+        """Place initial orders for stakes with batched creates (20 orders per round trip).
+        Returns {ticker: order_ids} for tickers with at least one order placed."""
+        orders = [o for stake in stakes for o in self.initial_orders(stake)]
+        placed: dict[str, list[str]] = {}
+        if not orders:
+            return placed
+        for o, r in zip(orders, self.client.batch_create_orders(orders)):
+            if "error" in r:
+                print(f"Place {o['side']} failed {o['ticker']}: {r['error']}")
+                continue
+            oid = self.track_order(r, o["ticker"], o["side"], o["count"])
+            if oid:
+                placed.setdefault(o["ticker"], []).append(oid)
+        return placed
+
+    def process_fill(self, stake: Stake, order: dict) -> Optional[tuple[Stake, str, int]]:
+        """Record a filled order against its stake. Returns (stake, side, size) to repost, or None
+        when the stake is paused (or now hits max_shares) or does not quote the filled side."""
+        store, scope, alert_url = self.store, self.scope, self.alert_url
+        ticker = stake.ticker
+        if not ticker or self.state.get(ticker, {}).get("paused"):
+            return None
+        s = self.state[ticker]
         # Kalshi Order: fill_count = contracts filled; initial_count = original size; remaining_count = unfilled (0 when executed)
         filled_count = int(order.get("fill_count") or order.get("initial_count") or order.get("count") or 0)
         fill_price = order.get("yes_price") or order.get("no_price")
         if fill_price is not None:
             s["last_fill_price"] = int(fill_price)
         s["total_filled"] = s.get("total_filled", 0) + filled_count
-        max_shares = stake.get("max_shares")
-        if max_shares is not None and s["total_filled"] >= int(max_shares):
+        store.record_fill(scope, ticker, filled_count, s["last_fill_price"], order.get("order_id"), order.get("side"))
+        max_shares = stake.max_shares
+        if max_shares is not None and s["total_filled"] >= max_shares:
             send_alert(alert_url, ticker, f"max_shares reached ({s['total_filled']})")
             s["paused"] = True
-            return
-        pct = int(stake.get("pct_reload") or 100)
-        original = int(stake.get("shares") or 1)
-        repost_size = max(1, int(original * pct / 100))
+            store.put(scope, f"paused:{ticker}", True)
+            return None
+        repost_size = stake.repost_size
         if max_shares is not None:
-            remaining = int(max_shares) - s["total_filled"]
-            if repost_size > remaining:
-                repost_size = remaining  # cap to stay within max_shares
-        best_bid, best_ask = get_orderbook(client, ticker, env)
+            repost_size = min(repost_size, max_shares - s["total_filled"])  # cap to stay within max_shares
         filled_side = (order.get("side") or "yes").lower()
-        stake_side = (stake.get("side") or "yes").lower()
-        new_price = repost_price_from_base(
-            stake, s.get("last_fill_price"), best_bid, best_ask, filled_side
-        )
+        if not stake.reposts(filled_side):
+            return None
+        return stake, filled_side, repost_size
+
+    def repost(self, fills: list[tuple[Stake, str, int, float]]) -> None:
+        """Repost one cycle's fills together: the books they need are read at once (live or one
+        concurrent REST fan-out) and every repost goes out in one batched create. Fills on the same
+        ticker and side become one order. fills: (stake, side, size, seen_at)."""
+        merged: dict[tuple[str, str], list] = {}
+        for stake, side, size, seen_at in fills:
+            m = merged.get((stake.ticker, side))
+            if m is None:
+                merged[(stake.ticker, side)] = [stake, size, seen_at]
+            else:
+                m[1] += size
+                m[2] = min(m[2], seen_at)
+        need_books = list({ticker for (ticker, _), (stake, _, _) in merged.items() if stake.needs_book})
+        tops = get_orderbooks(self.client, need_books, self.env, self.live) if need_books else {}
+        orders = []
+        for (ticker, side), (stake, size, _) in merged.items():
+            best_bid, best_ask = tops.get(ticker, (1, 99))
+            price = stake.repost_price(self.state[ticker].get("last_fill_price"), best_bid, best_ask, side)
+            orders.append({"ticker": ticker, "action": "buy", "side": side, "count": size, f"{side}_price": price,
+                           "client_order_id": new_client_order_id(f"mm_{ticker}_{side}")})
         try:
-            if filled_side == "yes" and stake_side in ("yes", "both"):
-                r = client.create_order(
-                    ticker=ticker,
-                    action="buy",
-                    side="yes",
-                    count=repost_size,
-                    yes_price=new_price,
-                    client_order_id=f"mm_{ticker}_yes",
-                )
-                nid = r.get("order", {}).get("order_id") or r.get("order_id")
-                if nid:
-                    our_order_ids.add(str(nid))
-                print(f"Reposted {ticker} YES {repost_size} @ {new_price}c")
-            if filled_side == "no" and stake_side in ("no", "both"):
-                r = client.create_order(
-                    ticker=ticker,
-                    action="buy",
-                    side="no",
-                    count=repost_size,
-                    no_price=new_price,
-                    client_order_id=f"mm_{ticker}_no",
-                )
-                nid = r.get("order", {}).get("order_id") or r.get("order_id")
-                if nid:
-                    our_order_ids.add(str(nid))
-                print(f"Reposted {ticker} NO {repost_size} @ {new_price}c")
+            results = self.client.batch_create_orders(orders)
         except Exception as e:
-            print(f"Repost failed {ticker}: {e}")
-            send_alert(alert_url, ticker, f"repost failed: {e}")
-
-    # Initialize state and place initial orders
-    for stake in stakes:
-        ticker = stake.get("ticker")
-        if not ticker:
-            continue
-        state[ticker] = {
-            "total_filled": 0,
-            "last_fill_price": None,
-            "active_order_ids": [],
-            "paused": False,
+            results = [{"error": str(e)}] * len(orders)
+        sent_at = time.monotonic()
+        latency = self.histogram("fill_to_repost_ms")
+        for o, r, (_, _, seen_at) in zip(orders, results, merged.values()):
+            ticker, side = o["ticker"], o["side"]
+            if "error" in r:
+                print(f"Repost failed {ticker}: {r['error']}")
+                send_alert(self.alert_url, ticker, f"repost failed: {r['error']}")
+                continue
+            nid = self.track_order(r, ticker, side, o["count"])
+            if nid:
+                self.our_order_ids.add(nid)
+            latency.record((sent_at - seen_at) * 1000)
+            print(f"Reposted {ticker} {side.upper()} {o['count']} @ {o[side + '_price']}c")
+
+    def ingest(self, kind: str, msg: dict, polled: bool = False) -> None:
+        """Feed a fill / order update (WebSocket, or REST when polled) to the tracker; fills seen
+        before are dropped. Only polled fills advance the REST watermark."""
+        if kind == "fill" and not self.watermark.add(msg, advance=polled):
+            return
+        done = self.tracker.on_event(kind, msg)
+        if done:
+            self.ready.append((done, time.monotonic()))
+
+    def handle_executed(self, o: dict) -> Optional[tuple[Stake, str, int]]:
+        """Pass an executed order to its stake, once. Returns what to repost (see process_fill)."""
+        oid = str(o.get("order_id") or o.get("id") or "")
+        if not oid or oid in self.processed_order_ids or oid not in self.our_order_ids:
+            return None
+        self.tracker.forget(oid)
+        stake = self.index.get(o.get("ticker"), o.get("side"))
+        if stake is None:
+            return None
+        self.processed_order_ids.add(oid)
+        # Repost creates new order; add to our set when we place it
+        return self.process_fill(stake, o)
+
+    def status(self) -> dict[str, Any]:
+        status = super().status()
+        status["stakes"] = {
+            ticker: {"total_filled": s.get("total_filled", 0), "last_fill_price": s.get("last_fill_price"), "paused": bool(s.get("paused"))}
+            for ticker, s in list(self.state.items())
         }
-        ids = place_initial_orders(stake)
-        state[ticker]["our_order_ids"] = ids
-        our_order_ids.update(ids)
-        if ids:
-            print(f"Placed initial orders for {ticker}: {ids}")
-
-    print(f"Market making started for {event_ticker}. Check interval: {check_interval}s")
-
-    while True:
+        status["fills"] = sum(s["total_filled"] for s in status["stakes"].values())
+        status["resting_orders"] = self.tracker.tracked()
+        status["fill_feed"] = self.fills is not None
+        return status
+
+    def step(self) -> float:
+        fills = self.fills
+        # REST poll of fills since the watermark: every check_interval without the feed; otherwise a
+        # periodic reconciliation, and straight away after the feed reconnects or skips a sequence number.
+        if fills is None or fills.missed.is_set() or time.monotonic() >= self.next_reconcile:
+            if fills is not None:
+                fills.missed.clear()
+            try:
+                new_fills = sorted(self.client.iter_fills(min_ts=self.watermark.min_ts), key=lambda f: fill_ts(f) or 0)
+                for f in new_fills:
+                    self.ingest("fill", f, polled=True)
+            except Exception as e:
+                print(f"Poll error: {e}")
+            self.next_reconcile = time.monotonic() + self.reconcile_interval
         try:
-            resp = client.get_orders(limit=200, status="executed", event_ticker=event_ticker)
-            orders = resp.get("orders") or []
-            for o in orders:
-                oid = str(o.get("order_id") or o.get("id") or "")
-                if not oid or oid in processed_order_ids or oid not in our_order_ids:
-                    continue
-                ticker = (o.get("ticker") or "").strip()
-                for stake in stakes:
-                    if (stake.get("ticker") or "").strip() == ticker:
-                        processed_order_ids.add(oid)
-                        process_fill(stake, o)
-                        # Repost creates new order; add to our set when we place it
-                        break
+            if fills is not None:
+                for kind, msg in next_events(fills.events, 0):
+                    self.ingest(kind, msg)
+            ready, self.ready = self.ready, []
+            reposts = []
+            for o, seen_at in ready:
+                r = self.handle_executed(o)
+                if r is not None:
+                    reposts.append((*r, seen_at))
+            if reposts:
+                self.repost(reposts)
         except Exception as e:
-            print(f"Poll error: {e}")
-        time.sleep(check_interval)
+            print(f"Fill handling error: {e}")
+        if self.watermark.dirty:
+            self.store.put(self.scope, "fill_watermark", self.watermark.to_dict())
+        if self.tracker.dirty:
+            self.store.put(self.scope, "open_orders", self.tracker.snapshot())
+        if fills is None:
+            return self.check_interval
+        # Until the next reconcile; fills.wake ends the wait when an event arrives
+        return max(0.0, self.next_reconcile - time.monotonic())
+
+
+def run(config: dict, env: Optional[str] = None) -> None:
+    """Run the market making loop. KALSHI_ENV (from env) overrides config env."""
+    if not (config.get("stakes") or []):
+        print("No stakes in config. Exiting.")
+        return
+    StakeBot(config, env).run_forever()
 
 
 def main() -> None:
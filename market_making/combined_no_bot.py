@@ -11,7 +11,6 @@ from __future__ import annotations
 import json
 import math
 import os
-import signal
 import sys
 import time
 import urllib.request
@@ -33,7 +32,10 @@ try:
 except ImportError:
     pass
 
-from betting_outs.kalshi.kalshi import get_client
+from betting_outs.kalshi.kalshi_live import OrderBookEngine
+from betting_outs.kalshi.kalshi_orderbook import OrderBook
+from market_making import reconcile
+from market_making.strategy import Strategy, new_client_order_id
 
 DEFAULT_CONFIG_PATH = os.path.join(_script_dir, "combined_no_config.json")
 
@@ -64,39 +66,78 @@ def send_alert(url: Optional[str], reason: str, details: Optional[dict] = None)
             print(f"Alert webhook failed: {e}")
 
 
-def _get_no_bid_ask(client: Any, ticker: str) -> Optional[tuple[int, int, float, dict[int, int]]]:
+def _no_bid_ask(book: OrderBook) -> Optional[tuple[int, int, float, OrderBook]]:
     """
-    Fetch orderbook and return (no_bid, no_ask, median, no_price_to_qty).
+    (no_bid, no_ask, median, book) for a book, or None if either side is empty.
     No ask = 100 - best_yes_bid. Median = (bid + ask) / 2.
-    no_price_to_qty = {price: qty} from the no orderbook for liquidity lookups.
-    Returns None if orderbook empty/failed.
+    book.depth_at("no", price) gives No liquidity for lookups (array slot, no dict rebuild).
     """
-    try:
-        data = client.get_orderbook(ticker)
-        ob = data.get("orderbook") or {}
-        yes_bids = ob.get("yes") or []
-        no_bids = ob.get("no") or []
-        if not yes_bids or not no_bids:
-            return None
-        best_yes_bid = int(yes_bids[-1][0])
-        best_no_bid = int(no_bids[-1][0])
-        best_no_ask = 100 - best_yes_bid
-        median = (best_no_bid + best_no_ask) / 2.0
-        price_to_qty: dict[int, int] = {int(p): int(q) for p, q in no_bids}
-        return (
-            max(1, min(99, best_no_bid)),
-            max(1, min(99, best_no_ask)),
-            median,
-            price_to_qty,
-        )
-    except Exception as e:
-        print(f"Orderbook fetch failed for {ticker}: {e}")
+    if not book.best_yes_bid or not book.best_no_bid:
         return None
+    best_no_bid = book.best_no_bid
+    best_no_ask = 100 - book.best_yes_bid
+    median = (best_no_bid + best_no_ask) / 2.0
+    return (
+        max(1, min(99, best_no_bid)),
+        max(1, min(99, best_no_ask)),
+        median,
+        book,
+    )
+
+
+def _get_no_bid_ask(
+    client: Any, ticker: str, live: Optional[OrderBookEngine] = None
+) -> Optional[tuple[int, int, float, OrderBook]]:
+    """
+    Read the orderbook (live WebSocket book when synced, else REST) and return
+    (no_bid, no_ask, median, book). Returns None if orderbook empty/failed.
+    """
+    return _get_no_bid_asks(client, [ticker], live)[ticker]
+
+
+def _get_no_bid_asks(
+    client: Any, tickers: list[str], live: Optional[OrderBookEngine] = None
+) -> dict[str, Optional[tuple[int, int, float, OrderBook]]]:
+    """
+    _get_no_bid_ask for every ticker at once: synced live books are read from memory, the rest
+    are fetched from REST concurrently (client.get_orderbooks), so a cycle pays about one round
+    trip instead of one per leg. None for a ticker whose book is empty or failed.
+    """
+    books: dict[str, Optional[OrderBook]] = {t: live.book(t) if live is not None else None for t in tickers}
+    missing = [t for t, book in books.items() if book is None]
+    if missing:
+        for ticker, data in client.get_orderbooks(missing).items():
+            if isinstance(data, Exception):
+                print(f"Orderbook fetch failed for {ticker}: {data}")
+                continue
+            try:
+                books[ticker] = OrderBook.from_response(data, ticker)
+            except Exception as e:
+                print(f"Orderbook fetch failed for {ticker}: {e}")
+    return {t: _no_bid_ask(book) if book is not None else None for t, book in books.items()}
+
+
+def _median_caps(medians: list[float]) -> list[int]:
+    """Just below each market's median, at least 1c."""
+    return [1 if m <= 1 else max(1, int(math.floor(m)) - 1) for m in medians]
+
+
+def _full_passes(reducible: list[int], excess: int) -> int:
+    """Largest k with sum(min(k, r) for r in reducible) <= excess: how many times every leg can
+    take a full 1c cut (legs stop at 1c) before excess runs out. O(n log n)."""
+    n = len(reducible)
+    taken = 0
+    for j, r in enumerate(sorted(reducible)):
+        # Legs before j are at 1c; cutting the other n - j legs down to r costs r each.
+        if taken + r * (n - j) > excess:
+            return (excess - taken) // (n - j)
+        taken += r
+    return max(reducible, default=0)
 
 
 def compute_offer_prices(
     tickers: list[str],
-    bid_ask_data: dict[str, tuple[int, int, float, dict[int, int]]],
+    bid_ask_data: dict[str, tuple[int, int, float, OrderBook]],
     max_combined: int,
 ) -> dict[str, int]:
     """
@@ -105,129 +146,171 @@ def compute_offer_prices(
     - Each leg is capped strictly below its own median.
     - The sum of all legs is <= max_combined, backing off from medians
       as needed (reducing lowest-liquidity legs first).
+
+    Backing off is 1c off every leg above 1c per round, in ascending No liquidity at the leg's
+    price, until the excess is gone. All full rounds are applied at once (water-filling), and
+    only the last, partial round needs the liquidity order: O(n log n) however large the excess.
+    Tickers are assumed distinct.
     """
     n = len(tickers)
     if n == 0:
         return {}
 
-    # Initial cap: just below each market's median.
-    caps: dict[str, int] = {}
-    for t in tickers:
-        _, _, median, _ = bid_ask_data.get(t, (0, 0, 0.0, {}))
-        if median <= 1:
-            caps[t] = 1
-        else:
-            caps[t] = max(1, int(math.floor(median)) - 1)
-
+    medians = [bid_ask_data.get(t, (0, 0, 0.0, None))[2] for t in tickers]
+    caps = dict(zip(tickers, _median_caps(medians)))
     total = sum(caps.values())
     if total <= max_combined:
         return caps
 
-    # Need to reduce total down to max_combined, taking from lowest‑liquidity legs first.
     excess = total - max_combined
+    reducible = [c - 1 for c in caps.values()]
+    k = _full_passes(reducible, excess)
+    for t in tickers:
+        cut = min(k, caps[t] - 1)
+        caps[t] -= cut
+        excess -= cut
 
-    def liquidity_at(ticker: str, price: int) -> int:
-        d = bid_ask_data.get(ticker)
-        if not d:
-            return 0
-        _, _, _, price_to_qty = d
-        return price_to_qty.get(price, 0)
-
-    # Repeatedly reduce prices, starting from the lowest‑liquidity legs.
-    while excess > 0:
-        # Sort tickers by liquidity (ascending), so we shave the least liquid first.
-        ordered = sorted(
-            tickers,
-            key=lambda t: liquidity_at(t, caps.get(t, 1)) if caps.get(t, 1) > 1 else float("inf"),
-        )
-        progress = False
-        for t in ordered:
-            if excess <= 0:
-                break
-            if caps[t] > 1:
-                caps[t] -= 1
-                excess -= 1
-                progress = True
-        if not progress:
-            # All legs are already at 1; cannot reduce further.
-            break
+    if excess > 0:
+        # Partial round: the excess least liquid legs still above 1c lose one more cent.
+        open_legs = [t for t in tickers if caps[t] > 1]
+        open_legs.sort(key=lambda t: bid_ask_data[t][3].depth_at("no", caps[t]))
+        for t in open_legs[:excess]:
+            caps[t] -= 1
 
     return caps
 
 
-def run(config: dict, env: Optional[str] = None) -> None:
-    """Run the combined No spread loop. KALSHI_ENV (from env) overrides config env."""
-    env = (os.environ.get("KALSHI_ENV") or env or config.get("env") or "DEMO").upper()
-    event_ticker = config.get("event_ticker") or ""
-    tickers = config.get("tickers") or []
-    max_combined = int(config.get("max_combined") or 99)
-    shares = int(config.get("shares") or 10)
-    check_interval = int(config.get("check_interval_sec") or 5)
-    alert_url = config.get("alert_webhook_url")
-    always_post_first = bool(config.get("always_post_first"))
-
-    if not tickers:
-        print("No tickers in config. Exiting.")
-        return
+def compute_offer_prices_batch(medians: Any, no_depth: Any, max_combined: Any) -> Any:
+    """
+    compute_offer_prices for many events in one call (NumPy).
 
-    if shares < 1:
-        print("Shares must be >= 1. Exiting.")
-        return
+    medians: (events, legs) per-market No medians; NaN marks padding for events with fewer legs.
+    no_depth: (events, legs, 100) resting No contracts per price in cents (OrderBook.no).
+    max_combined: scalar or (events,).
+    Returns (events, legs) int offer prices, 0 for padding; row e equals compute_offer_prices for
+    that event's legs in column order.
+    """
+    import numpy as np
+
+    medians = np.asarray(medians, dtype=float)
+    no_depth = np.asarray(no_depth)
+    events, legs = medians.shape
+    pad = np.isnan(medians)
+    med = np.where(pad, 0.0, medians)
+    caps = np.where(med <= 1, 1, np.maximum(1, np.floor(med).astype(np.int64) - 1))
+    caps[pad] = 0
+    reducible = np.maximum(caps - 1, 0)
+    excess = np.maximum(caps.sum(axis=1) - np.broadcast_to(np.asarray(max_combined, dtype=np.int64), (events,)), 0)
+
+    # Full rounds, as in _full_passes: cost of cutting every leg to each sorted breakpoint.
+    r = np.sort(reducible, axis=1)
+    before = np.cumsum(r, axis=1) - r
+    remaining_legs = legs - np.arange(legs)
+    fits = before + r * remaining_legs <= excess[:, None]
+    j = fits.sum(axis=1)  # breakpoints reachable; fits is monotone along each row
+    partial = j < legs
+    jj = np.minimum(j, legs - 1)
+    rows = np.arange(events)
+    k = np.where(
+        partial,
+        (excess - before[rows, jj]) // remaining_legs[jj],
+        r[:, -1] if legs else 0,
+    )
+    cut = np.minimum(k[:, None], reducible)
+    caps = caps - cut
+    left = excess - cut.sum(axis=1)
+
+    # Partial round: stable rank by liquidity at the new price among legs still above 1c.
+    open_legs = caps > 1
+    depth = np.take_along_axis(no_depth, np.clip(caps, 0, no_depth.shape[2] - 1)[:, :, None], axis=2)[:, :, 0]
+    key = np.where(open_legs, depth.astype(np.int64), np.iinfo(np.int64).max)
+    order = np.argsort(key, axis=1, kind="stable")
+    rank = np.empty_like(order)
+    np.put_along_axis(rank, order, np.arange(legs)[None, :].repeat(events, axis=0), axis=1)
+    caps = caps - (open_legs & (rank < left[:, None]))
+    return caps
 
-    client = get_client(env)
-    our_order_ids: set[str] = set()
-    orders_up = False
-    first_orders_placed = False
 
-    def shutdown_cancel_all() -> None:
-        """On SIGTERM (systemd stop): batch cancel all resting combined_no_ orders for this event."""
-        if not event_ticker:
-            return
+class CombinedNoBot(Strategy):
+    """Keeps full-size No offers resting on every ticker while the combined No bids allow it."""
+
+    kind = "combined_no"
+
+    def __init__(self, config: dict, env: Optional[str] = None, **shared: Any):
+        super().__init__(config, env, **shared)
+        self.tickers = config.get("tickers") or []
+        self.max_combined = int(config.get("max_combined") or 99)
+        self.shares = int(config.get("shares") or 10)
+        self.check_interval = int(config.get("check_interval_sec") or 5)
+        self.always_post_first = bool(config.get("always_post_first"))
+        # Move fully resting legs to the new offer price each cycle (amend), not only refills.
+        self.reprice = bool(config.get("reprice"))
+        self.scope = f"combined_no:{self.name or self.event_ticker or ','.join(self.tickers)}"
+        self.live: Optional[OrderBookEngine] = None
+        self.our_order_ids: set[str] = set()
+        self.orders_up = False
+        self.first_orders_placed = False
+        # ticker -> contracts still resting on our order, as of the last cycle
+        self.resting: dict[str, int] = {}
+
+    def setup(self) -> None:
+        self.live = self.market_data.orderbooks(self.config, self.tickers)
+        # Persisted so a restart does not re-apply always_post_first
+        self.first_orders_placed = bool(self.store.get(self.scope, "first_orders_placed"))
+        # Without an event_ticker, shutdown finds our orders by id
+        self.our_order_ids.update(self.store.get(self.scope, "our_order_ids") or [])
+
+    def shutdown(self) -> None:
+        """Batch cancel this strategy's resting combined_no_ orders and release its orderbooks."""
+        if self.live is not None:
+            self.market_data.release_orderbooks(self.tickers)
+            self.live = None
         try:
-            resp = client.get_orders(limit=200, status="resting", event_ticker=event_ticker)
-            orders = resp.get("orders") or []
-            our_ids = [
-                str(o.get("order_id") or o.get("id") or "")
-                for o in orders
-                if (o.get("client_order_id") or "").strip().startswith("combined_no_")
-            ]
+            our_ids = self.resting_order_ids("combined_no_", self.tickers, self.our_order_ids)
             if our_ids:
-                client.batch_cancel_orders(our_ids)
+                self.client.batch_cancel_orders(our_ids)
                 print(f"Shutdown: batch cancelled {len(our_ids)} order(s)")
             else:
                 print("Shutdown: no resting orders to cancel")
+            self.our_order_ids.clear()
+            self.store.put(self.scope, "our_order_ids", [])
         except Exception as e:
             print(f"Shutdown cancel failed: {e}")
-        sys.exit(0)
 
-    def _on_sigterm(signum: int, frame: Any) -> None:
-        shutdown_cancel_all()
+    def status(self) -> dict[str, Any]:
+        status = super().status()
+        status["orders_up"] = self.orders_up
+        status["resting_orders"] = dict(self.resting)
+        return status
 
-    signal.signal(signal.SIGTERM, _on_sigterm)
-
-    while True:
+    def step(self) -> float:
+        client, tickers, event_ticker = self.client, self.tickers, self.event_ticker
+        max_combined, shares, alert_url = self.max_combined, self.shares, self.alert_url
         try:
-            # Fetch orderbooks: No bid, No ask, median per ticker
-            bid_ask_data: dict[str, tuple[int, int, float, dict[int, int]]] = {}
+            # Fetch orderbooks: No bid, No ask, median per ticker (all legs at once)
+            t0 = time.monotonic()
+            rows = _get_no_bid_asks(client, tickers, self.live)
+            books_read_at = time.monotonic()
+            self.histogram("book_fetch_ms").record((books_read_at - t0) * 1000)
+            bid_ask_data: dict[str, tuple[int, int, float, OrderBook]] = {}
             for ticker in tickers:
-                row = _get_no_bid_ask(client, ticker)
+                row = rows.get(ticker)
                 if row is not None:
                     bid_ask_data[ticker] = row
                 else:
                     # Conservative: treat as expensive (high median)
-                    bid_ask_data[ticker] = (99, 99, 99.0, {})
+                    bid_ask_data[ticker] = (99, 99, 99.0, OrderBook(ticker))
 
             if len(bid_ask_data) < len(tickers):
                 # Some failed; skip this cycle
-                time.sleep(check_interval)
-                continue
+                return self.check_interval
 
             # Condition: use combined best No bids (not median).
             # We allow combined_no_bids == max_combined; only strictly above blocks orders.
             combined_no_bids = sum(d[0] for d in bid_ask_data.values())
             combined_median = sum(d[2] for d in bid_ask_data.values())
 
-            allow_first_override = always_post_first and not first_orders_placed
+            allow_first_override = self.always_post_first and not self.first_orders_placed
 
             if combined_no_bids > max_combined and not allow_first_override:
                 # Condition failed: leave orders as-is (no cancel). Won't refill if filled.
@@ -244,81 +327,83 @@ def run(config: dict, env: Optional[str] = None) -> None:
                             "max_combined": max_combined,
                         },
                     )
-                orders_up = False
+                self.orders_up = False
             else:
                 # Condition passes: compute offer prices, ensure full shares resting
                 offer_prices = compute_offer_prices(tickers, bid_ask_data, max_combined)
                 target_sum = sum(offer_prices.values())
 
-                our_resting: dict[str, tuple[str, int]] = {}  # ticker -> (order_id, remaining_count)
+                our_resting: list[dict] = []
                 if event_ticker:
                     try:
-                        resp = client.get_orders(limit=200, status="resting", event_ticker=event_ticker)
-                        for o in resp.get("orders") or []:
+                        for o in client.iter_orders(status="resting", event_ticker=event_ticker):
                             cid = (o.get("client_order_id") or "").strip()
-                            if not cid.startswith("combined_no_"):
-                                continue
-                            ticker = (o.get("ticker") or "").strip()
-                            oid = str(o.get("order_id") or o.get("id") or "")
-                            remaining = int(o.get("remaining_count") or 0)
-                            if ticker and oid:
-                                our_resting[ticker] = (oid, remaining)
+                            if cid.startswith("combined_no_") and (o.get("ticker") or "").strip():
+                                our_resting.append(o)
                     except Exception as e:
                         print(f"Could not fetch resting orders: {e}")
-
-                needs_refill = [
-                    t for t in tickers
-                    if t not in our_resting or our_resting[t][1] < shares
-                ]
-
-                if needs_refill:
-                    for ticker in needs_refill:
-                        if ticker in our_resting:
-                            oid, rem = our_resting[ticker]
-                            try:
-                                client.cancel_order(oid)
-                                our_order_ids.discard(oid)
-                                if rem < shares:
-                                    print(f"Refill {ticker}: had {rem}, replacing with {shares}")
-                            except Exception as e:
-                                print(f"Cancel {oid}: {e}")
-
-                    placed_any = False
-                    for ticker in needs_refill:
-                        no_price = offer_prices.get(ticker, max_combined // len(tickers))
-                        # Hard cap: never place at or above this market's median.
-                        _, _, median, _ = bid_ask_data.get(ticker, (0, 0, 0.0, {}))
-                        if median > 0 and no_price >= median:
-                            no_price = max(1, int(math.floor(median)) - 1)
-                        try:
-                            r = client.create_order(
-                                ticker=ticker,
-                                action="buy",
-                                side="no",
-                                count=shares,
-                                no_price=no_price,
-                                client_order_id=f"combined_no_{ticker}",
-                            )
-                            oid = r.get("order", {}).get("order_id") or r.get("order_id")
-                            if oid:
-                                our_order_ids.add(str(oid))
-                            placed_any = True
-                            print(
-                                f"Placed buy No {ticker} @ {no_price}c x{shares} "
-                                f"(median_sum={combined_median:.1f}, target_sum={target_sum})"
-                            )
-                        except Exception as e:
-                            print(f"Place buy No failed {ticker}: {e}")
-                    if placed_any:
-                        first_orders_placed = True
-                    orders_up = True
+                    resting: dict[str, int] = {}
+                    for o in our_resting:
+                        ticker = o["ticker"].strip()
+                        resting[ticker] = resting.get(ticker, 0) + int(o.get("remaining_count") or 0)
+                    self.resting = resting
+
+                desired = []
+                for ticker in tickers:
+                    no_price = offer_prices.get(ticker, max_combined // len(tickers))
+                    # Hard cap: never place at or above this market's median.
+                    _, _, median, _ = bid_ask_data.get(ticker, (0, 0, 0.0, None))
+                    if median > 0 and no_price >= median:
+                        no_price = max(1, int(math.floor(median)) - 1)
+                    desired.append({"ticker": ticker, "side": "no", "price": no_price, "count": shares})
+                # Legs with full size resting keep their price unless "reprice" is set.
+                legs = [(t, "no") for t in tickers if self.reprice or self.resting.get(t, 0) < shares]
+                actions = reconcile.plan(desired, our_resting, legs)
+
+                if any(actions.values()):
+                    # How stale the book behind these prices is when the orders go out.
+                    book_age_ms = (time.monotonic() - books_read_at) * 1000
+                    self.histogram("book_age_at_order_ms").record(book_age_ms)
+                    self.stats["last_book_age_ms"] = round(book_age_ms, 1)
+                    done = reconcile.execute(
+                        client, actions, client_order_id=lambda q: new_client_order_id(f"combined_no_{q['ticker']}")
+                    )
+                    for oid in done["cancelled"]:
+                        self.our_order_ids.discard(oid)
+                    for o in done["orders"]:
+                        self.our_order_ids.add(str(o.get("order_id") or ""))
+                        print(
+                            f"Quoted buy No {o.get('ticker')} @ {o.get('no_price')}c x{o.get('remaining_count', shares)} "
+                            f"(median_sum={combined_median:.1f}, target_sum={target_sum})"
+                        )
+                    for err in done["errors"]:
+                        print(f"{err['action'].capitalize()} failed {err['ticker'] or ''}: {err['error']}")
+                    self.store.put(self.scope, "our_order_ids", sorted(self.our_order_ids))
+                    self.stats["last_write_cost"] = done["write_cost"]
+                    if done["orders"] and not self.first_orders_placed:
+                        self.first_orders_placed = True
+                        self.store.put(self.scope, "first_orders_placed", True)
+                    self.orders_up = True
 
         except Exception as e:
             print(f"Loop error: {e}")
             if alert_url:
                 send_alert(alert_url, "combined_no_loop_error", {"error": str(e)})
 
-        time.sleep(check_interval)
+        return self.check_interval
+
+
+def run(config: dict, env: Optional[str] = None) -> None:
+    """Run the combined No spread loop. KALSHI_ENV (from env) overrides config env."""
+    if not (config.get("tickers") or []):
+        print("No tickers in config. Exiting.")
+        return
+
+    if int(config.get("shares") or 10) < 1:
+        print("Shares must be >= 1. Exiting.")
+        return
+
+    CombinedNoBot(config, env).run_forever()
 
 
 if __name__ == "__main__":
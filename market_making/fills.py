@@ -0,0 +1,221 @@
+"""
+Turns the WebSocket fill / order-update stream into "order executed" events for the bots.
+
+Kalshi sends one fill message per match, so a resting order can fill in several pieces. The
+bots act once an order is fully filled (as they did when polling status=executed), so
+FillTracker adds up fills per order until the placed count is reached, or until a user_order
+update reports the order executed. Only orders registered with expect() are tracked; events that
+arrive before expect() (a fill can beat the create_order response) are held briefly and replayed.
+
+FillWatermark is the REST side: the newest fill timestamp seen so far plus a bounded window of
+recent fill ids, persisted in the bot's state store, so each poll of /portfolio/fills asks only for fills since
+the watermark and never counts a fill twice (whether it came over REST or the WebSocket).
+"""
+from __future__ import annotations
+
+import queue
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+# Events held for order ids we have not registered yet (bounded; oldest dropped first).
+MAX_PENDING_ORDERS = 1000
+# Recent fill ids / order ids remembered for dedupe. A multi-week run stays at this size.
+DEDUPE_WINDOW = 10000
+# Fill ids kept in the persisted watermark (enough to cover fills sharing the watermark second).
+PERSISTED_FILL_IDS = 500
+# A new watermark starts this many seconds before the bot does.
+WATERMARK_LOOKBACK_SEC = 60
+
+
+class BoundedSet:
+    """Set that remembers only the maxlen most recently added keys (LRU eviction)."""
+
+    def __init__(self, maxlen: int = DEDUPE_WINDOW, items: Iterable[str] = ()):
+        self.maxlen = maxlen
+        self._items: OrderedDict[str, None] = OrderedDict()
+        for item in items:
+            self.add(item)
+
+    def add(self, key: str) -> None:
+        self._items[key] = None
+        self._items.move_to_end(key)
+        if len(self._items) > self.maxlen:
+            self._items.popitem(last=False)
+
+    def update(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self.add(key)
+
+    def discard(self, key: str) -> None:
+        self._items.pop(key, None)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+
+def fill_id(fill: dict) -> str:
+    return str(fill.get("trade_id") or fill.get("fill_id") or "")
+
+
+def fill_ts(fill: dict) -> Optional[int]:
+    """Unix seconds of a fill: "ts" when present, else parsed from "created_time"."""
+    ts = fill.get("ts")
+    if ts is not None:
+        return int(ts)
+    created = fill.get("created_time")
+    if created:
+        try:
+            return int(datetime.fromisoformat(created.replace("Z", "+00:00")).timestamp())
+        except ValueError:
+            return None
+    return None
+
+
+class FillWatermark:
+    """Newest fill time seen plus a dedupe window of fill ids.
+
+    Poll with client.iter_fills(min_ts=watermark.min_ts); min_ts is inclusive, so fills in the
+    watermark second come back again and are dropped by add(). Only polled fills move min_ts:
+    WebSocket fills can arrive after a gap in the feed, and moving past the gap would hide the
+    fills the next poll is meant to recover. Persist with to_dict() whenever dirty is set.
+    Not thread-safe.
+    """
+
+    def __init__(self, min_ts: Optional[int] = None, window: int = DEDUPE_WINDOW):
+        self.min_ts = int(min_ts if min_ts is not None else time.time() - WATERMARK_LOOKBACK_SEC)
+        self.recent = BoundedSet(window)
+        self.dirty = False
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict], window: int = DEDUPE_WINDOW) -> "FillWatermark":
+        """Watermark from to_dict() output, or a fresh one starting now when data is empty."""
+        if not data:
+            return cls(window=window)
+        wm = cls(data.get("min_ts"), window)
+        wm.recent.update(data.get("recent") or [])
+        return wm
+
+    def add(self, fill: dict, advance: bool = True) -> bool:
+        """Record a fill; False if it was already seen (drop it). advance=False (WebSocket fills)
+        only dedupes and leaves min_ts alone."""
+        fid = fill_id(fill)
+        if fid:
+            if fid in self.recent:
+                return False
+            self.recent.add(fid)
+        ts = fill_ts(fill) if advance else None
+        if ts is not None and ts > self.min_ts:
+            self.min_ts = ts
+        self.dirty = True
+        return True
+
+    def to_dict(self) -> dict:
+        """The watermark and the newest PERSISTED_FILL_IDS fill ids. Clears dirty."""
+        self.dirty = False
+        return {"min_ts": self.min_ts, "recent": list(self.recent)[-PERSISTED_FILL_IDS:]}
+
+
+def _order_id(msg: dict) -> str:
+    return str(msg.get("order_id") or msg.get("id") or "")
+
+
+class FillTracker:
+    """Per-order fill accounting. Not thread-safe: feed it from the bot's main loop."""
+
+    def __init__(self):
+        self._orders: dict[str, dict] = {}
+        self._pending: OrderedDict[str, list] = OrderedDict()
+        self.dirty = False  # tracked orders changed since snapshot() was last taken
+
+    def snapshot(self) -> dict[str, dict]:
+        """Tracked orders as plain data, for persisting across restarts. Clears dirty."""
+        self.dirty = False
+        return {oid: dict(o) for oid, o in self._orders.items()}
+
+    def restore(self, orders: dict[str, dict]) -> None:
+        """Resume tracking orders from a snapshot() taken by a previous run."""
+        for oid, o in (orders or {}).items():
+            self._orders[oid] = dict(o)
+
+    def expect(self, order_id: str, ticker: str, side: str, count: int) -> Optional[dict]:
+        """Track an order we just placed. Returns its executed record if held events already fill it."""
+        if not order_id:
+            return None
+        self._orders[order_id] = {"ticker": ticker, "side": side, "count": int(count), "filled": 0}
+        self.dirty = True
+        done = None
+        for kind, msg in self._pending.pop(order_id, ()):
+            done = self.on_event(kind, msg) or done
+        return done
+
+    def forget(self, order_id: str) -> None:
+        """Stop tracking an order (handled elsewhere, e.g. by the REST reconciliation)."""
+        if self._orders.pop(order_id, None) is not None:
+            self.dirty = True
+        self._pending.pop(order_id, None)
+
+    def tracked(self) -> int:
+        return len(self._orders)
+
+    def on_event(self, kind: str, msg: dict) -> Optional[dict]:
+        """Apply one FillFeed event. Returns an executed-order record (the fields process_fill
+        reads from a REST order) when this event completes a tracked order, else None."""
+        oid = _order_id(msg)
+        if not oid:
+            return None
+        o = self._orders.get(oid)
+        if o is None:
+            self._pending.setdefault(oid, []).append((kind, msg))
+            self._pending.move_to_end(oid)
+            while len(self._pending) > MAX_PENDING_ORDERS:
+                self._pending.popitem(last=False)
+            return None
+        self.dirty = True
+        if kind == "fill":
+            o["filled"] += int(msg.get("count") or 0)
+            o["yes_price"] = msg.get("yes_price")
+            o["no_price"] = msg.get("no_price")
+            if o["filled"] < o["count"]:
+                return None
+        elif kind == "user_order":
+            if (msg.get("status") or "").lower() != "executed":
+                return None
+            o["filled"] = int(msg.get("fill_count") or o["count"])
+            o["yes_price"] = msg.get("yes_price", o.get("yes_price"))
+            o["no_price"] = msg.get("no_price", o.get("no_price"))
+        else:
+            return None
+        del self._orders[oid]
+        yes_price, no_price = o.get("yes_price"), o.get("no_price")
+        if no_price is None and yes_price is not None:
+            no_price = 100 - int(yes_price)
+        return {
+            "order_id": oid,
+            "ticker": o["ticker"],
+            "side": o["side"],
+            "status": "executed",
+            "fill_count": o["filled"],
+            "yes_price": yes_price,
+            "no_price": no_price,
+        }
+
+
+def next_events(events: "queue.Queue", timeout: float) -> list:
+    """Wait up to timeout seconds for one event, then take everything else already queued."""
+    try:
+        out = [events.get(timeout=max(0.0, timeout))]
+    except queue.Empty:
+        return []
+    while True:
+        try:
+            out.append(events.get_nowait())
+        except queue.Empty:
+            return out
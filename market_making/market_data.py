@@ -0,0 +1,116 @@
+"""
+Market data plumbing shared by the market making bots.
+
+MarketData owns the WebSocket orderbook engine and fill feed for one Kalshi environment. A bot
+run on its own creates one; the supervisor creates one per environment and hands it to every
+strategy, so N strategies share one socket per feed instead of N. When the local market-data
+service (betting_outs/kalshi/kalshi_marketdata.py) is running for the environment, orderbooks come
+from it instead, so every process on the host shares one orderbook socket.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Any, Iterable, Optional
+
+from betting_outs.kalshi.kalshi_live import FillFeed, FillSubscription, OrderBookEngine, start_fill_feed as _start_fill_feed, start_orderbook_engine
+from betting_outs.kalshi.kalshi_marketdata import MarketDataClient, service_available, socket_path
+
+
+def start_live_orderbooks(client: Any, config: dict, tickers: list) -> Optional[OrderBookEngine]:
+    """Start the WebSocket orderbook engine unless config sets "orderbook_source": "rest".
+    Connects to the local market-data service instead when it is running for client's environment.
+    Reads fall back to REST while a book is not synced, or if the engine cannot start."""
+    if (config.get("orderbook_source") or "ws").lower() != "ws":
+        return None
+    env = getattr(client, "environment", None)
+    if env and service_available(env):
+        try:
+            md = MarketDataClient(socket_path(env))
+            md.add_tickers([t for t in tickers if t])
+            return md
+        except OSError as e:
+            print(f"Market data service unavailable, starting own orderbook feed: {e}")
+    try:
+        return start_orderbook_engine(client, [t for t in tickers if t])
+    except Exception as e:
+        print(f"Live orderbook unavailable, using REST: {e}")
+        return None
+
+
+def start_fill_feed(client: Any, config: dict) -> Optional[FillFeed]:
+    """Start the WebSocket fill feed unless config sets "fill_source": "poll".
+    Without it the bots find fills by polling every check_interval_sec."""
+    if (config.get("fill_source") or "ws").lower() != "ws":
+        return None
+    try:
+        return _start_fill_feed(client)
+    except Exception as e:
+        print(f"Fill feed unavailable, polling fills: {e}")
+        return None
+
+
+class MarketData:
+    """Lazily started, shared orderbook engine and fill feed for one client/environment.
+
+    Each strategy passes its own config, so "orderbook_source": "rest" or "fill_source": "poll"
+    still opts that strategy out. Orderbook tickers are reference-counted across strategies and
+    leave the engine's subscription when the last strategy using them releases them. Thread-safe.
+    """
+
+    def __init__(self, client: Any):
+        self.client = client
+        self.engine: Optional[OrderBookEngine] = None
+        self.feed: Optional[FillFeed] = None
+        self._ticker_refs: dict[str, int] = {}  # orderbook ticker -> strategies using it
+        self._lock = threading.Lock()
+
+    def orderbooks(self, config: dict, tickers: Iterable[str]) -> Optional[OrderBookEngine]:
+        """The live engine (or market-data service client), now also tracking tickers; None if config opts out or it cannot start."""
+        if (config.get("orderbook_source") or "ws").lower() != "ws":
+            return None
+        tickers = list(dict.fromkeys(t for t in tickers if t))
+        with self._lock:
+            if self.engine is None:
+                self.engine = start_live_orderbooks(self.client, config, tickers)
+            else:
+                self.engine.add_tickers(tickers)
+            if self.engine is not None:
+                for t in tickers:
+                    self._ticker_refs[t] = self._ticker_refs.get(t, 0) + 1
+            return self.engine
+
+    def release_orderbooks(self, tickers: Iterable[str]) -> None:
+        """Undo one orderbooks() call for tickers (a strategy stopping)."""
+        gone = []
+        with self._lock:
+            for t in dict.fromkeys(t for t in tickers if t):
+                n = self._ticker_refs.get(t, 0) - 1
+                if n > 0:
+                    self._ticker_refs[t] = n
+                elif t in self._ticker_refs:
+                    del self._ticker_refs[t]
+                    gone.append(t)
+            engine = self.engine
+        if gone and engine is not None:
+            engine.remove_tickers(gone)
+
+    def subscribe_fills(self, config: dict) -> Optional[FillSubscription]:
+        """A new fill subscription; None if config opts out or the feed cannot start."""
+        with self._lock:
+            if self.feed is None:
+                self.feed = start_fill_feed(self.client, config)
+            elif (config.get("fill_source") or "ws").lower() != "ws":
+                return None
+            return self.feed.subscribe() if self.feed is not None else None
+
+    def unsubscribe_fills(self, sub: Optional[FillSubscription]) -> None:
+        if sub is not None and self.feed is not None:
+            self.feed.unsubscribe(sub)
+
+    def stop(self) -> None:
+        with self._lock:
+            for feed in (self.engine, self.feed):
+                if feed is not None:
+                    feed.stop()
+            self.engine = self.feed = None
+            self._ticker_refs.clear()
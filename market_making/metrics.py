@@ -0,0 +1,66 @@
+"""
+Small in-process metrics for the market making bots.
+
+Histogram keeps counts in fixed, roughly log-spaced millisecond buckets, so recording is O(1),
+memory is constant however long a bot runs, and status() can report percentiles without keeping
+samples. Percentiles are bucket upper bounds (good to the bucket width, which is what a dashboard
+needs).
+
+    age = Histogram()
+    age.record(42.0)
+    age.summary()   # {"count": 1, "mean_ms": 42.0, "max_ms": 42.0, "p50_ms": 50, ...}
+"""
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Any, Iterable
+
+# Upper bounds in milliseconds; the last bucket catches everything slower.
+DEFAULT_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000)
+
+
+class Histogram:
+    """Bucketed latency/age distribution in milliseconds. Thread-safe."""
+
+    def __init__(self, bounds_ms: Iterable[float] = DEFAULT_BOUNDS_MS):
+        self.bounds = tuple(bounds_ms)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = None
+        self._lock = threading.Lock()
+
+    def record(self, ms: float) -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(self.bounds, ms)] += 1
+            self.count += 1
+            self.total += ms
+            self.last = ms
+            if ms > self.max:
+                self.max = ms
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the pct-th percentile (max for the overflow bucket)."""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(1, int(round(pct / 100.0 * self.count)))
+            seen = 0
+            for i, n in enumerate(self.counts):
+                seen += n
+                if seen >= rank:
+                    return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+            return self.max
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "last_ms": None if self.last is None else round(self.last, 1),
+            "mean_ms": round(self.total / self.count, 1) if self.count else None,
+            "max_ms": round(self.max, 1),
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+        }
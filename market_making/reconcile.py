@@ -0,0 +1,132 @@
+"""
+Diff-based order reconciliation for the market making bots.
+
+A bot describes the quotes it wants resting, one per (ticker, side):
+
+    desired = [{"ticker": "KX-A", "side": "no", "price": 41, "count": 10}, ...]
+
+and passes its own resting orders (from iter_orders, filtered to the bot's client_order_id
+prefix). plan() returns the fewest writes that turn one into the other:
+
+  - cancel: orders for quotes no longer wanted, and duplicates   (batch cancel, 0.2 write each)
+  - amend: wrong price, or too few contracts left                 (1 write, order stays up)
+  - decrease: right price, too many contracts                     (1 write, keeps queue priority)
+  - create: quotes with no order yet                              (batch create, 1 write each)
+
+Refilling or repricing a leg therefore costs one write instead of cancel + create (two), and the
+leg is never uncovered between the calls. execute() sends the plan.
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable, Optional
+
+# Write tokens per action, as Kalshi meters them.
+CANCEL_COST = 0.2
+WRITE_COST = 1.0
+
+
+def order_price(order: dict) -> Optional[int]:
+    """The order's limit price in cents on its own side."""
+    side = (order.get("side") or "").lower()
+    price = order.get("yes_price") if side == "yes" else order.get("no_price")
+    return int(price) if price is not None else None
+
+
+def _order_id(order: dict) -> str:
+    return str(order.get("order_id") or order.get("id") or "")
+
+
+def plan(desired: Iterable[dict], resting: Iterable[dict], keys: Optional[Iterable[tuple]] = None) -> dict[str, list]:
+    """
+    Actions that make resting match desired: {"cancel": [order_id], "amend": [(order, quote)],
+    "decrease": [(order, quote)], "create": [quote]}.
+
+    keys limits reconciliation to those (ticker, side) pairs; orders on other keys are left
+    alone. By default every key that appears in desired or resting is reconciled.
+    """
+    wanted: dict[tuple, dict] = {}
+    for q in desired:
+        wanted[(q["ticker"], q["side"].lower())] = q
+    orders: dict[tuple, list] = {}
+    for o in resting:
+        orders.setdefault(((o.get("ticker") or "").strip(), (o.get("side") or "").lower()), []).append(o)
+    scope = set(keys) if keys is not None else set(wanted) | set(orders)
+
+    actions: dict[str, list] = {"cancel": [], "amend": [], "decrease": [], "create": []}
+    for key in sorted(scope):
+        q, have = wanted.get(key), orders.get(key, [])
+        if q is None:
+            actions["cancel"].extend(_order_id(o) for o in have)
+            continue
+        if not have:
+            actions["create"].append(q)
+            continue
+        # Keep the order closest to the quote: same price first, then most contracts left.
+        have = sorted(have, key=lambda o: (order_price(o) != q["price"], -int(o.get("remaining_count") or 0)))
+        keep = have[0]
+        actions["cancel"].extend(_order_id(o) for o in have[1:])
+        remaining = int(keep.get("remaining_count") or 0)
+        if order_price(keep) != q["price"] or remaining < q["count"]:
+            actions["amend"].append((keep, q))
+        elif remaining > q["count"]:
+            actions["decrease"].append((keep, q))
+    return actions
+
+
+def write_cost(actions: dict[str, list]) -> float:
+    """Write tokens execute(actions) will spend."""
+    return CANCEL_COST * len(actions["cancel"]) + WRITE_COST * (
+        len(actions["amend"]) + len(actions["decrease"]) + len(actions["create"])
+    )
+
+
+def execute(client: Any, actions: dict[str, list], client_order_id: Any = None) -> dict[str, Any]:
+    """
+    Send a plan: batch cancel, then amends and decreases, then one batch create.
+    client_order_id(quote) names new orders (default: Kalshi client picks a uuid).
+
+    Returns {"orders": [order dicts now resting for our quotes], "cancelled": [ids],
+    "errors": [{"action", "ticker", "error"}], "write_cost": tokens}.
+    """
+    result: dict[str, Any] = {"orders": [], "cancelled": [], "errors": [], "write_cost": write_cost(actions)}
+    if actions["cancel"]:
+        resp = client.batch_cancel_orders(actions["cancel"])
+        result["cancelled"] = resp.get("cancelled_orders", [])
+        for r in resp.get("batch_responses", []):
+            if "error" in r:
+                result["errors"].append({"action": "cancel", "ticker": None, "error": r["error"]})
+    for order, q in actions["amend"]:
+        price = {"yes_price": q["price"]} if q["side"].lower() == "yes" else {"no_price": q["price"]}
+        try:
+            resp = client.amend_order(
+                _order_id(order),
+                ticker=q["ticker"],
+                side=q["side"].lower(),
+                action=q.get("action", "buy"),
+                count=int(order.get("fill_count") or 0) + int(q["count"]),
+                client_order_id=order.get("client_order_id"),
+                **price,
+            )
+            result["orders"].append(resp.get("order") or order)
+        except Exception as e:
+            result["errors"].append({"action": "amend", "ticker": q["ticker"], "error": str(e)})
+    for order, q in actions["decrease"]:
+        try:
+            resp = client.decrease_order(_order_id(order), reduce_to=int(q["count"]))
+            result["orders"].append(resp.get("order") or order)
+        except Exception as e:
+            result["errors"].append({"action": "decrease", "ticker": q["ticker"], "error": str(e)})
+    if actions["create"]:
+        orders = []
+        for q in actions["create"]:
+            o = {"ticker": q["ticker"], "action": q.get("action", "buy"), "side": q["side"].lower(), "count": int(q["count"])}
+            o["yes_price" if o["side"] == "yes" else "no_price"] = q["price"]
+            if client_order_id is not None:
+                o["client_order_id"] = client_order_id(q)
+            orders.append(o)
+        for q, r in zip(actions["create"], client.batch_create_orders(orders)):
+            if "order" in r:
+                result["orders"].append(r["order"])
+            else:
+                result["errors"].append({"action": "create", "ticker": q["ticker"], "error": r["error"]})
+    return result
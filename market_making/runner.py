@@ -0,0 +1,161 @@
+"""
+In-process strategy runner for the local API (betting_outs/kalshi/kalshi_api.py).
+
+The API's /market-making/* routes are plain Flask handlers on request threads; the runner keeps a
+Supervisor on its own asyncio loop in a daemon thread and hands it coroutines, so strategies run
+as tasks next to the API and share its Kalshi client and rate limiter. Status comes straight from
+the strategy objects in memory, so the desktop UI can poll it every second without touching disk
+or Kalshi.
+
+Configs created through the API are saved in the state store. After an API restart they are
+listed as "stopped" and start again only when restarted (no surprise trading on boot).
+"""
+from __future__ import annotations
+
+import asyncio
+import atexit
+import re
+import threading
+from typing import Any, Optional
+
+from market_making.state_store import StateStore, open_state_store
+from market_making.supervisor import Supervisor, strategy_kind
+
+RUNNER_SCOPE = "runner"
+# Seconds a request thread waits on the runner loop; stopping waits for order cancels.
+CALL_TIMEOUT_SEC = 60.0
+# Desktop "refill_mode" -> bot.py repost_base
+REFILL_MODES = {"same": "previous_fill", "median": "market_mean", "offset": "market_best_offer"}
+
+_ID_UNSAFE_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def config_from_request(body: dict, env: str) -> dict:
+    """Bot config from a POST /market-making/strategies body.
+
+    Accepts a bot.py / combined_no_bot.py config as is ("stakes" or "tickers", optional "type"),
+    or the desktop form: {markets, order_size, yes_price and/or no_price, refill_mode,
+    stop_max_shares, check_interval_sec}, which becomes one per-stake bot with a stake per market
+    quoting the given prices. ValueError (a 400) for a form with no price, since its stakes would
+    never quote, or with stop_max_dollars, which the bots cannot enforce.
+    """
+    if strategy_kind(body):
+        config = dict(body)
+        config["type"] = strategy_kind(body)
+    elif body.get("markets"):
+        prices = {side: body.get(f"{side}_price") for side in ("yes", "no") if body.get(f"{side}_price") is not None}
+        if not prices:
+            raise ValueError("The form needs yes_price and/or no_price: stakes without a price never quote")
+        if any(not 1 <= int(p) <= 99 for p in prices.values()):
+            raise ValueError("Prices must be 1-99 cents")
+        if body.get("stop_max_dollars"):
+            raise ValueError("stop_max_dollars is not enforced by the bots; use stop_max_shares")
+        stakes = [
+            {
+                "ticker": ticker,
+                "side": "both" if len(prices) == 2 else next(iter(prices)),
+                **{f"{side}_price": int(p) for side, p in prices.items()},
+                "shares": int(body.get("order_size") or 1),
+                "repost_base": REFILL_MODES.get((body.get("refill_mode") or "same").lower(), "previous_fill"),
+                "max_shares": body.get("stop_max_shares"),
+            }
+            for ticker in body["markets"]
+            if ticker
+        ]
+        config = {"type": "mm", "stakes": stakes, "check_interval_sec": body.get("check_interval_sec") or 30}
+    else:
+        raise ValueError('Config needs "stakes" (per-stake bot), "tickers" (combined No) or "markets"')
+    config.pop("id", None)
+    config.setdefault("env", env.lower())
+    return config
+
+
+def _default_id(config: dict) -> str:
+    name = config.get("event_ticker") or next(
+        (s.get("ticker") for s in config.get("stakes") or [] if s.get("ticker")), None
+    ) or (config.get("tickers") or ["strategy"])[0]
+    return _ID_UNSAFE_RE.sub("_", f"{config['type']}_{name}")
+
+
+class StrategyRunner:
+    """Supervisor on a background event loop, driven from synchronous request handlers. Thread-safe."""
+
+    def __init__(self, store: Optional[StateStore] = None, supervisor: Optional[Supervisor] = None):
+        self.store = store if store is not None else open_state_store({})
+        self.supervisor = supervisor if supervisor is not None else Supervisor(store=self.store)
+        self.configs: dict[str, dict] = self.store.load(RUNNER_SCOPE)
+        self._lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="strategy-runner", daemon=True)
+        self._thread.start()
+
+    def _call(self, coro: Any, timeout: float = CALL_TIMEOUT_SEC) -> Any:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    def create(self, config: dict, strategy_id: Optional[str] = None) -> str:
+        """Save and start config. An explicit id replaces that strategy; otherwise a new id is made."""
+        with self._lock:
+            if not strategy_id:
+                base = strategy_id = _default_id(config)
+                n = 2
+                while strategy_id in self.configs:
+                    strategy_id = f"{base}-{n}"
+                    n += 1
+            self.configs[strategy_id] = config
+        self.store.put(RUNNER_SCOPE, strategy_id, config)
+        self._call(self.supervisor.add(strategy_id, config))
+        return strategy_id
+
+    def restart(self, strategy_id: str) -> None:
+        """(Re)start a known strategy with its saved config. KeyError if unknown."""
+        config = self.configs[strategy_id]
+        self._call(self.supervisor.add(strategy_id, config))
+
+    def stop(self, strategy_id: str) -> None:
+        """Stop a strategy (cancelling its orders); it stays listed as stopped. KeyError if unknown."""
+        if strategy_id not in self.configs:
+            raise KeyError(strategy_id)
+        self._call(self.supervisor.remove(strategy_id))
+
+    def delete(self, strategy_id: str) -> None:
+        """Stop a strategy and forget its config."""
+        self.stop(strategy_id)
+        with self._lock:
+            self.configs.pop(strategy_id, None)
+        self.store.delete(RUNNER_SCOPE, strategy_id)
+
+    def status(self, strategy_id: str) -> dict[str, Any]:
+        """Live status of one strategy ("status": running / starting / stopped / failed)."""
+        config = self.configs[strategy_id]
+        strategy = self.supervisor.strategies.get(strategy_id)
+        if strategy is None:
+            return {"id": strategy_id, "status": "stopped", "type": config.get("type"), "env": (config.get("env") or "").upper()}
+        status = strategy.status()
+        return {"id": strategy_id, "status": status.pop("state"), **status}
+
+    def list(self) -> list[dict[str, Any]]:
+        with self._lock:
+            ids = list(self.configs)
+        return [self.status(strategy_id) for strategy_id in ids]
+
+    def close(self) -> None:
+        """Stop every strategy (cancelling orders) and the loop thread."""
+        try:
+            self._call(self.supervisor.stop_all())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5.0)
+
+
+_runner: Optional[StrategyRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_runner() -> StrategyRunner:
+    """Process-wide runner, started on first use; strategies are stopped at interpreter exit."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = StrategyRunner()
+            atexit.register(_runner.close)
+        return _runner
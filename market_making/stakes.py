@@ -0,0 +1,98 @@
+"""
+Stakes compiled once for the per-stake bot's fill path.
+
+A bot.py stake config is a dict read with .get()/.strip()/int() on every fill. Stake parses it
+once (repost size, price base, cents_off, limits), and StakeIndex finds the stake for an executed
+order by (ticker, side) with one dict lookup instead of scanning every stake:
+
+    index = StakeIndex(config["stakes"])
+    stake = index.get(order["ticker"], order["side"])
+    if stake is not None and stake.reposts(order["side"]):
+        price = stake.repost_price(prev_fill, best_bid, best_ask, "no")
+"""
+from __future__ import annotations
+
+import math
+from typing import Iterable, Optional
+
+SIDES = ("yes", "no")
+
+
+def market_mean_cents(best_bid: int, best_ask: int) -> int:
+    """Round down: (48+49)/2 = 48.5 -> 48."""
+    return math.floor((best_bid + best_ask) / 2)
+
+
+def normalize_ticker(ticker: Optional[str]) -> str:
+    return (ticker or "").strip().upper()
+
+
+class Stake:
+    """One stake config with its repost parameters precomputed."""
+
+    __slots__ = ("config", "ticker", "side", "shares", "repost_size", "repost_base", "cents_off", "max_shares")
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.ticker = (config.get("ticker") or "").strip()
+        self.side = (config.get("side") or "yes").lower()
+        self.shares = int(config.get("shares") or 0)
+        pct = int(config.get("pct_reload") or 100)
+        self.repost_size = max(1, int(int(config.get("shares") or 1) * pct / 100))
+        self.repost_base = config.get("repost_base") or "previous_fill"
+        self.cents_off = max(0, int(config.get("cents_off") or 0))
+        max_shares = config.get("max_shares")
+        self.max_shares = int(max_shares) if max_shares is not None else None
+
+    @property
+    def sides(self) -> tuple[str, ...]:
+        """Sides this stake quotes."""
+        return SIDES if self.side == "both" else (self.side,)
+
+    @property
+    def needs_book(self) -> bool:
+        """Whether repost_price reads the orderbook (market-relative bases)."""
+        return self.repost_base in ("market_mean", "market_best_offer")
+
+    def reposts(self, side: str) -> bool:
+        """Whether a fill on side is reposted by this stake."""
+        return side in self.sides
+
+    def repost_price(self, prev_fill: Optional[int], best_bid: int, best_ask: int, side: str) -> int:
+        """Repost price from the configured base, minus cents_off, clamped to 1-99."""
+        base = self.repost_base
+        if base == "previous_fill" and prev_fill is not None:
+            base_price = prev_fill
+        elif base == "market_mean":
+            base_price = market_mean_cents(best_bid, best_ask)
+        elif base == "market_best_offer":
+            base_price = best_ask if side == "yes" else (100 - best_bid)
+        else:
+            base_price = prev_fill or 50
+        return max(1, min(99, base_price - self.cents_off))
+
+
+class StakeIndex:
+    """Stakes by (normalized ticker, side). For a ticker with several stakes, the first stake
+    quoting a side owns fills on that side; fills on an unquoted side go to the ticker's first
+    stake (counted, not reposted)."""
+
+    def __init__(self, stakes: Iterable[dict]):
+        self.stakes = [Stake(s) for s in stakes]
+        self._by_key: dict[tuple[str, str], Stake] = {}
+        named = [s for s in self.stakes if s.ticker]
+        for stake in named:
+            for side in stake.sides:
+                self._by_key.setdefault((normalize_ticker(stake.ticker), side), stake)
+        for stake in named:
+            for side in SIDES:
+                self._by_key.setdefault((normalize_ticker(stake.ticker), side), stake)
+
+    def get(self, ticker: Optional[str], side: Optional[str] = "yes") -> Optional[Stake]:
+        return self._by_key.get((normalize_ticker(ticker), (side or "yes").lower()))
+
+    def __iter__(self):
+        return iter(self.stakes)
+
+    def __len__(self) -> int:
+        return len(self.stakes)
@@ -0,0 +1,290 @@
+"""
+Crash-safe state for the market making bots: one SQLite database in WAL mode.
+
+Bots call put()/delete()/record_fill() from their loop; those only enqueue. A background writer
+thread applies everything queued in one transaction every flush_interval seconds, so the order
+path never waits on disk and fsync happens once per batch (synchronous=NORMAL: a process crash
+loses nothing already committed, a power cut at most the last batch).
+
+Fills go to an append-only journal. Once it holds compact_every rows, the writer folds them into
+per-ticker totals and deletes them, so rebuilding state on restart reads one small table plus a
+bounded journal tail:
+
+    store = open_state_store(config)
+    totals = store.fill_totals("mm:EVENT")   # {ticker: {"total_filled", "last_fill_price", "fills"}}
+    paused = store.get("mm:EVENT", "paused:KX-A", False)
+"""
+from __future__ import annotations
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+DEFAULT_STATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "state")
+STATE_DB_NAME = "state.db"
+# Seconds between writer commits (the batched fsync window).
+DEFAULT_FLUSH_INTERVAL = 0.2
+# Journal rows that trigger folding fills into fill_totals.
+DEFAULT_COMPACT_EVERY = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    scope TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (scope, key)
+);
+CREATE TABLE IF NOT EXISTS fills (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scope TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    order_id TEXT,
+    side TEXT,
+    count INTEGER NOT NULL,
+    price INTEGER,
+    ts REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fill_totals (
+    scope TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    total_filled INTEGER NOT NULL,
+    last_fill_price INTEGER,
+    fills INTEGER NOT NULL,
+    PRIMARY KEY (scope, ticker)
+);
+"""
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=10.0, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class StateStore:
+    """Write-behind key/value state plus a compacted fill journal. Safe to share across threads."""
+
+    _shared: dict[str, "StateStore"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        compact_every: int = DEFAULT_COMPACT_EVERY,
+    ):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.compact_every = compact_every
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._read = _connect(path)
+        self._read.executescript(_SCHEMA)
+        self._read_lock = threading.Lock()
+        self._journal_rows = self._read.execute("SELECT COUNT(*) FROM fills").fetchone()[0]
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._closed = False
+        self.stats = {"commits": 0, "writes": 0, "compactions": 0, "errors": 0}
+        self._writer = threading.Thread(target=self._write_loop, name="state-store-writer", daemon=True)
+        self._writer.start()
+
+    @classmethod
+    def open(cls, path: str) -> "StateStore":
+        """One store per database file per process (bots in one process share the writer)."""
+        key = os.path.abspath(path)
+        with cls._shared_lock:
+            store = cls._shared.get(key)
+            if store is None or store._closed:
+                store = cls._shared[key] = cls(path)
+            return store
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Close every store opened with open() (supervisor shutdown)."""
+        with cls._shared_lock:
+            stores = list(cls._shared.values())
+            cls._shared.clear()
+        for store in stores:
+            store.close()
+
+    # ---- writes (enqueue only) ----
+
+    def put(self, scope: str, key: str, value: Any) -> None:
+        """Set scope/key to a JSON-serialisable value."""
+        self._queue.put(("put", scope, key, json.dumps(value), time.time()))
+
+    def delete(self, scope: str, key: str) -> None:
+        self._queue.put(("delete", scope, key))
+
+    def delete_prefix(self, scope: str, prefix: str) -> None:
+        """Delete every key in scope starting with prefix."""
+        self._queue.put(("delete_prefix", scope, prefix))
+
+    def record_fill(
+        self,
+        scope: str,
+        ticker: str,
+        count: int,
+        price: Optional[int] = None,
+        order_id: Optional[str] = None,
+        side: Optional[str] = None,
+    ) -> None:
+        """Append a fill to the journal (count contracts at price on ticker)."""
+        self._queue.put(("fill", scope, ticker, order_id, side, int(count), price, time.time()))
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Block until everything queued so far is committed. False on timeout."""
+        done = threading.Event()
+        self._queue.put(("barrier", done))
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Commit what is queued, stop the writer and close the database."""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._queue.put(("stop",))
+        self._writer.join(timeout=10.0)
+        with self._read_lock:
+            self._read.close()
+
+    # ---- reads ----
+
+    def get(self, scope: str, key: str, default: Any = None) -> Any:
+        """Committed value of scope/key (call flush() first to see your own queued writes)."""
+        with self._read_lock:
+            row = self._read.execute("SELECT value FROM kv WHERE scope = ? AND key = ?", (scope, key)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def load(self, scope: str, prefix: str = "") -> dict[str, Any]:
+        """All committed keys in scope (optionally only those starting with prefix)."""
+        with self._read_lock:
+            rows = self._read.execute(
+                "SELECT key, value FROM kv WHERE scope = ? AND key >= ? AND key < ?",
+                (scope, prefix, prefix + "\uffff"),
+            ).fetchall()
+        return {k: json.loads(v) for k, v in rows}
+
+    def fill_totals(self, scope: str) -> dict[str, dict]:
+        """Per ticker: total contracts filled, last fill price and number of fills (compacted + journal)."""
+        with self._read_lock:
+            totals = {
+                t: {"total_filled": n, "last_fill_price": p, "fills": c}
+                for t, n, p, c in self._read.execute(
+                    "SELECT ticker, total_filled, last_fill_price, fills FROM fill_totals WHERE scope = ?", (scope,)
+                )
+            }
+            rows = self._read.execute(
+                "SELECT ticker, count, price FROM fills WHERE scope = ? ORDER BY id", (scope,)
+            ).fetchall()
+        for ticker, count, price in rows:
+            t = totals.setdefault(ticker, {"total_filled": 0, "last_fill_price": None, "fills": 0})
+            t["total_filled"] += count
+            t["fills"] += 1
+            if price is not None:
+                t["last_fill_price"] = price
+        return totals
+
+    def journal(self, scope: str) -> list[dict]:
+        """Fills not yet compacted, oldest first."""
+        with self._read_lock:
+            rows = self._read.execute(
+                "SELECT ticker, order_id, side, count, price, ts FROM fills WHERE scope = ? ORDER BY id", (scope,)
+            ).fetchall()
+        return [dict(zip(("ticker", "order_id", "side", "count", "price", "ts"), r)) for r in rows]
+
+    # ---- writer thread ----
+
+    def _write_loop(self) -> None:
+        conn = _connect(self.path)
+        try:
+            while True:
+                ops = [self._queue.get()]
+                deadline = time.monotonic() + self.flush_interval
+                while ops[-1][0] not in ("barrier", "stop"):
+                    try:
+                        ops.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                    except queue.Empty:
+                        break
+                self._apply(conn, ops)
+                if ops[-1][0] == "stop":
+                    return
+        finally:
+            conn.close()
+
+    def _apply(self, conn: sqlite3.Connection, ops: list) -> None:
+        barriers = []
+        writes = 0
+        try:
+            with conn:
+                for op in ops:
+                    kind = op[0]
+                    if kind == "put":
+                        conn.execute(
+                            "INSERT INTO kv (scope, key, value, updated_at) VALUES (?, ?, ?, ?) "
+                            "ON CONFLICT (scope, key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                            op[1:],
+                        )
+                    elif kind == "delete":
+                        conn.execute("DELETE FROM kv WHERE scope = ? AND key = ?", op[1:])
+                    elif kind == "delete_prefix":
+                        _, scope, prefix = op
+                        conn.execute(
+                            "DELETE FROM kv WHERE scope = ? AND key >= ? AND key < ?", (scope, prefix, prefix + "\uffff")
+                        )
+                    elif kind == "fill":
+                        conn.execute(
+                            "INSERT INTO fills (scope, ticker, order_id, side, count, price, ts) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            op[1:],
+                        )
+                        self._journal_rows += 1
+                    elif kind == "barrier":
+                        barriers.append(op[1])
+                        continue
+                    else:
+                        continue
+                    writes += 1
+                if self._journal_rows >= self.compact_every:
+                    self._compact(conn)
+            if writes:
+                self.stats["commits"] += 1
+                self.stats["writes"] += writes
+        except sqlite3.Error as e:
+            self.stats["errors"] += 1
+            self._journal_rows = conn.execute("SELECT COUNT(*) FROM fills").fetchone()[0]
+            print(f"State store write failed ({len(ops)} ops dropped): {e}")
+        finally:
+            for done in barriers:
+                done.set()
+
+    def _compact(self, conn: sqlite3.Connection) -> None:
+        """Fold the journal into fill_totals and delete it (inside the caller's transaction)."""
+        last = {}
+        for scope, ticker, price in conn.execute(
+            "SELECT scope, ticker, price FROM fills WHERE price IS NOT NULL ORDER BY id"
+        ):
+            last[(scope, ticker)] = price
+        for scope, ticker, total, n in conn.execute(
+            "SELECT scope, ticker, SUM(count), COUNT(*) FROM fills GROUP BY scope, ticker"
+        ).fetchall():
+            conn.execute(
+                "INSERT INTO fill_totals (scope, ticker, total_filled, last_fill_price, fills) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (scope, ticker) DO UPDATE SET total_filled = total_filled + excluded.total_filled, "
+                "last_fill_price = COALESCE(excluded.last_fill_price, last_fill_price), fills = fills + excluded.fills",
+                (scope, ticker, total, last.get((scope, ticker)), n),
+            )
+        conn.execute("DELETE FROM fills")
+        self._journal_rows = 0
+        self.stats["compactions"] += 1
+
+
+def open_state_store(config: dict) -> StateStore:
+    """The shared store for a bot config: <state_dir>/state.db, default market_making/state/."""
+    return StateStore.open(os.path.join(config.get("state_dir") or DEFAULT_STATE_DIR, STATE_DB_NAME))
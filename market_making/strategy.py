@@ -0,0 +1,162 @@
+"""
+Common shape of a market making strategy, so the same bot code runs standalone (one process per
+config, as the generated scripts do) or inside the supervisor next to other strategies.
+"""
+from __future__ import annotations
+
+import abc
+import os
+import signal
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Callable, Container, Iterable, Optional
+
+from betting_outs.kalshi.kalshi import get_client
+from market_making.market_data import MarketData
+from market_making.metrics import Histogram
+from market_making.state_store import StateStore, open_state_store
+
+
+def new_client_order_id(prefix: str) -> str:
+    """prefix plus a random suffix: unique per placement, so a create retried after a 409 finds
+    this order, not an older one placed under the same name. Shutdown still matches prefix."""
+    return f"{prefix}_{uuid.uuid4().hex[:8]}"
+
+
+def resolve_env(config: dict, env: Optional[str] = None) -> str:
+    """KALSHI_ENV (from the environment) overrides env, which overrides config "env"."""
+    return (os.environ.get("KALSHI_ENV") or env or config.get("env") or "DEMO").upper()
+
+
+class Strategy(abc.ABC):
+    """setup() once, then step() repeatedly, then shutdown().
+
+    step() does one cycle and returns how many seconds to wait before the next one; wake_up() (from
+    a feed thread, e.g. on a fill) ends that wait early, so a step never blocks waiting for events.
+    Steps may block briefly on HTTP calls, so the supervisor runs them in worker threads. client, market_data and store are passed in when shared; a standalone run builds
+    its own. name is the supervisor's strategy id; it keys the persisted state, so strategies on
+    the same event (or with no event) do not share it.
+    """
+
+    kind = "strategy"
+
+    def __init__(
+        self,
+        config: dict,
+        env: Optional[str] = None,
+        client: Any = None,
+        market_data: Optional[MarketData] = None,
+        store: Optional[StateStore] = None,
+        name: Optional[str] = None,
+    ):
+        self.config = config
+        self.name = name
+        self.env = resolve_env(config, env)
+        self.event_ticker = config.get("event_ticker") or ""
+        self.alert_url = config.get("alert_webhook_url")
+        self.client = client if client is not None else get_client(self.env)
+        self.market_data = market_data if market_data is not None else MarketData(self.client)
+        self.store = store if store is not None else open_state_store(config)
+        # Updated by timed_step() / the supervisor; read by status() from other threads.
+        self.stats: dict[str, Any] = {
+            "state": "created",
+            "cycles": 0,
+            "errors": 0,
+            "last_error": None,
+            "last_cycle_ms": None,
+            "last_cycle_at": None,
+            "started_at": None,
+        }
+        self.metrics: dict[str, Histogram] = {}
+        # Set by whatever drives the steps (supervisor or run_forever); called by wake_up().
+        self.waker: Optional[Callable[[], None]] = None
+
+    def setup(self) -> None:
+        """Load state, start market data, place initial orders."""
+
+    @abc.abstractmethod
+    def step(self) -> float:
+        """One cycle; returns the seconds to wait before the next."""
+
+    def shutdown(self) -> None:
+        """Cancel this strategy's resting orders and release shared resources."""
+
+    def wake_up(self) -> None:
+        """Run the next step now instead of after the delay the last one returned. Thread-safe."""
+        waker = self.waker
+        if waker is not None:
+            waker()
+
+    def resting_order_ids(self, prefix: str, tickers: Iterable[str], tracked: Container[str]) -> list[str]:
+        """Ids of this strategy's resting orders, for shutdown. With an event_ticker: every order in
+        the event whose client_order_id starts with prefix. Without one: the tracked orders resting
+        on tickers (another strategy may quote the same tickers with the same prefix)."""
+        if self.event_ticker:
+            return [
+                str(o.get("order_id") or o.get("id") or "")
+                for o in self.client.iter_orders(status="resting", event_ticker=self.event_ticker)
+                if (o.get("client_order_id") or "").strip().startswith(prefix)
+            ]
+        ids = []
+        for ticker in dict.fromkeys(t for t in tickers if t):
+            for o in self.client.iter_orders(status="resting", ticker=ticker):
+                oid = str(o.get("order_id") or o.get("id") or "")
+                if oid in tracked:
+                    ids.append(oid)
+        return ids
+
+    def timed_step(self) -> float:
+        """step() plus cycle counters and latency for status()."""
+        t0 = time.perf_counter()
+        try:
+            return self.step()
+        except Exception as e:
+            self.stats["errors"] += 1
+            self.stats["last_error"] = str(e)
+            raise
+        finally:
+            self.stats["cycles"] += 1
+            self.stats["last_cycle_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+            self.stats["last_cycle_at"] = time.time()
+
+    def histogram(self, name: str) -> Histogram:
+        """Named latency/age histogram, reported under "metrics" in status()."""
+        h = self.metrics.get(name)
+        if h is None:
+            h = self.metrics[name] = Histogram()
+        return h
+
+    def status(self) -> dict[str, Any]:
+        """Live status from memory (no disk or Kalshi calls), cheap enough to poll every second."""
+        limiter = getattr(self.client, "rate_limiter", None)
+        return {
+            "type": self.kind,
+            "env": self.env,
+            "event_ticker": self.event_ticker,
+            **self.stats,
+            "rate_limit_headroom": limiter.headroom() if limiter is not None else None,
+            "metrics": {name: h.summary() for name, h in list(self.metrics.items())},
+        }
+
+    def run_forever(self) -> None:
+        """Standalone loop: SIGTERM (systemd stop) runs shutdown() and exits."""
+
+        def _on_sigterm(signum: int, frame: Any) -> None:
+            self.shutdown()
+            self.store.close()
+            sys.exit(0)
+
+        signal.signal(signal.SIGTERM, _on_sigterm)
+        woken = threading.Event()
+        self.waker = woken.set
+        self.stats["started_at"] = time.time()
+        self.setup()
+        self.stats["state"] = "running"
+        while True:
+            # Cleared before the step, so a wake_up() during it is not lost
+            woken.clear()
+            delay = self.timed_step()
+            if delay > 0:
+                woken.wait(delay)
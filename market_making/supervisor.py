@@ -0,0 +1,277 @@
+"""
+Run many market making strategies in one process.
+
+Every strategy file in the strategies directory is started as an asyncio task:
+  - *.json: a bot.py or combined_no_bot.py config ("type": "mm" | "combined_no"; inferred from
+    "stakes" / "tickers" when missing)
+  - *.py: a generated strategy script (mm_*.py, combined_no_*.py); only its CONFIG_JSON is read
+Strategies share one Kalshi client (one PEM load, one connection pool, one rate limiter for the
+account), one WebSocket orderbook engine and fill feed per environment, and one state store.
+The directory is rescanned every few seconds: new files start, deleted files stop (their
+resting orders are cancelled), edited files restart. Other strategies keep running.
+
+Run from project root: python -m market_making.supervisor [--dir market_making/strategies]
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import signal
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+# Ensure project root is on path
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_script_dir)
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+# Load .env
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv(os.path.join(_project_root, ".env"))
+except ImportError:
+    pass
+
+from betting_outs.kalshi.kalshi import get_shared_client
+from market_making.bot import StakeBot
+from market_making.combined_no_bot import CombinedNoBot
+from market_making.market_data import MarketData
+from market_making.state_store import StateStore, open_state_store
+from market_making.strategy import Strategy, resolve_env
+
+STRATEGY_TYPES = {"mm": StakeBot, "combined_no": CombinedNoBot}
+DEFAULT_STRATEGIES_DIR = os.path.join(_script_dir, "strategies")
+SCAN_INTERVAL_SEC = 5.0
+# Worker threads for strategy steps; each running strategy uses at most one at a time.
+MAX_WORKERS = 32
+# Wait after a step raises before trying again.
+ERROR_BACKOFF_SEC = 5.0
+
+_CONFIG_JSON_RE = re.compile(r"CONFIG_JSON\s*=\s*r?'''(.*?)'''", re.DOTALL)
+
+
+def strategy_kind(config: dict) -> Optional[str]:
+    kind = (config.get("type") or "").strip().lower()
+    if kind in STRATEGY_TYPES:
+        return kind
+    if config.get("stakes"):
+        return "mm"
+    if config.get("tickers"):
+        return "combined_no"
+    return None
+
+
+async def _wait_any(events: tuple, timeout: float) -> None:
+    """Wait until one of events is set, or timeout seconds."""
+    waits = [asyncio.ensure_future(e.wait()) for e in events]
+    try:
+        await asyncio.wait(waits, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for w in waits:
+            w.cancel()
+
+
+def load_strategy_file(path: str) -> Optional[dict]:
+    """Config (with "type" filled in) from a .json config or a generated strategy .py, else None."""
+    with open(path, "r") as f:
+        text = f.read()
+    if path.endswith(".json"):
+        config = json.loads(text)
+    else:
+        m = _CONFIG_JSON_RE.search(text)
+        if not m:
+            return None
+        config = json.loads(m.group(1))
+        if "market_making.combined_no_bot" in text:
+            config.setdefault("type", "combined_no")
+        elif "market_making.bot" in text:
+            config.setdefault("type", "mm")
+    kind = strategy_kind(config)
+    if kind is None:
+        return None
+    config["type"] = kind
+    return config
+
+
+class Supervisor:
+    """Owns the shared client/market data and one asyncio task per running strategy."""
+
+    def __init__(
+        self,
+        strategies_dir: Optional[str] = None,
+        scan_interval: float = SCAN_INTERVAL_SEC,
+        max_workers: int = MAX_WORKERS,
+        store: Optional[StateStore] = None,
+    ):
+        self.strategies_dir = strategies_dir
+        # None: each strategy uses the shared store for its config's state_dir
+        self.store = store
+        self.scan_interval = scan_interval
+        self.strategies: dict[str, Strategy] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._stops: dict[str, asyncio.Event] = {}
+        self._mtimes: dict[str, float] = {}
+        self._market_data: dict[str, MarketData] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="strategy")
+        self._stopping: Optional[asyncio.Event] = None
+
+    # ---- shared resources ----
+
+    def market_data(self, env: str, client: Any) -> MarketData:
+        md = self._market_data.get(env)
+        if md is None:
+            md = self._market_data[env] = MarketData(client)
+        return md
+
+    def build(self, config: dict, name: Optional[str] = None) -> Strategy:
+        """Strategy object for config, wired to the shared client, market data and state store."""
+        cls = STRATEGY_TYPES[strategy_kind(config) or ""]
+        env = resolve_env(config)
+        client = get_shared_client(env)
+        store = self.store if self.store is not None else open_state_store(config)
+        return cls(config, env, client=client, market_data=self.market_data(env, client), store=store, name=name)
+
+    # ---- strategy lifecycle ----
+
+    async def add(self, name: str, config: dict) -> Strategy:
+        """Start (or restart) one strategy under name."""
+        if name in self._tasks:
+            await self.remove(name)
+        loop = asyncio.get_running_loop()
+        strategy = await loop.run_in_executor(self._executor, self.build, config, name)
+        stop = asyncio.Event()
+        self.strategies[name] = strategy
+        self._stops[name] = stop
+        self._tasks[name] = asyncio.create_task(self._drive(name, strategy, stop), name=f"strategy:{name}")
+        print(f"Started strategy {name} ({strategy.kind}, {strategy.env})")
+        return strategy
+
+    async def remove(self, name: str) -> None:
+        """Stop one strategy and wait for its shutdown (order cancels) to finish."""
+        stop, task = self._stops.pop(name, None), self._tasks.pop(name, None)
+        if stop is not None:
+            stop.set()
+        if task is not None:
+            await task
+        self.strategies.pop(name, None)
+        print(f"Stopped strategy {name}")
+
+    async def _drive(self, name: str, strategy: Strategy, stop: asyncio.Event) -> None:
+        loop = asyncio.get_running_loop()
+        # A strategy waiting for events (fills) waits here, not in a worker thread
+        woken = asyncio.Event()
+        strategy.waker = lambda: loop.call_soon_threadsafe(woken.set)
+        stats = strategy.stats
+        stats["state"] = "starting"
+        stats["started_at"] = time.time()
+        try:
+            await loop.run_in_executor(self._executor, strategy.setup)
+            stats["state"] = "running"
+            while not stop.is_set():
+                # Cleared before the step, so a wake_up() during it is not lost
+                woken.clear()
+                try:
+                    delay = await loop.run_in_executor(self._executor, strategy.timed_step)
+                except Exception as e:
+                    print(f"[{name}] step failed: {e}")
+                    delay = ERROR_BACKOFF_SEC
+                if delay > 0:
+                    await _wait_any((stop, woken), delay)
+        except Exception as e:
+            print(f"[{name}] setup failed: {e}")
+            stats["state"] = "failed"
+            stats["last_error"] = str(e)
+        finally:
+            try:
+                await loop.run_in_executor(self._executor, strategy.shutdown)
+            except Exception as e:
+                print(f"[{name}] shutdown failed: {e}")
+            strategy.waker = None
+            if stats["state"] != "failed":
+                stats["state"] = "stopped"
+
+    # ---- strategies directory ----
+
+    def scan(self) -> dict[str, tuple[float, str]]:
+        """{name: (mtime, path)} for every strategy file in the directory."""
+        found = {}
+        if not self.strategies_dir or not os.path.isdir(self.strategies_dir):
+            return found
+        for entry in os.scandir(self.strategies_dir):
+            if entry.is_file() and entry.name.endswith((".json", ".py")) and not entry.name.startswith(("_", ".")):
+                found[os.path.splitext(entry.name)[0]] = (entry.stat().st_mtime, entry.path)
+        return found
+
+    async def sync(self) -> None:
+        """Start new files, restart edited ones, stop strategies whose file is gone."""
+        found = self.scan()
+        for name in [n for n in self._mtimes if n not in found]:
+            self._mtimes.pop(name)
+            if name in self._tasks:
+                await self.remove(name)
+        for name, (mtime, path) in found.items():
+            if self._mtimes.get(name) == mtime:
+                continue
+            self._mtimes[name] = mtime
+            try:
+                config = load_strategy_file(path)
+            except (OSError, ValueError) as e:
+                print(f"Skipping {path}: {e}")
+                config = None
+            if config is None:
+                if name in self._tasks:
+                    await self.remove(name)
+                continue
+            try:
+                await self.add(name, config)
+            except Exception as e:
+                print(f"Could not start {name}: {e}")
+
+    async def run(self) -> None:
+        """Run until SIGTERM/SIGINT, then stop every strategy (cancelling their orders)."""
+        self._stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self._stopping.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # not on the main thread, or Windows
+        print(f"Supervisor watching {self.strategies_dir}")
+        while not self._stopping.is_set():
+            await self.sync()
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.scan_interval)
+            except asyncio.TimeoutError:
+                pass
+        await self.stop_all()
+
+    def stop(self) -> None:
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def stop_all(self) -> None:
+        await asyncio.gather(*(self.remove(name) for name in list(self._tasks)))
+        for md in self._market_data.values():
+            md.stop()
+        StateStore.close_all()
+        self._executor.shutdown(wait=False)
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run every strategy in a directory in one process")
+    parser.add_argument("--dir", default=os.environ.get("MARKET_MAKING_STRATEGIES_DIR") or DEFAULT_STRATEGIES_DIR)
+    parser.add_argument("--scan-interval", type=float, default=SCAN_INTERVAL_SEC)
+    args = parser.parse_args()
+    asyncio.run(Supervisor(args.dir, args.scan_interval).run())
+
+
+if __name__ == "__main__":
+    main()
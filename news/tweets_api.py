@@ -5,9 +5,14 @@ Default: http://localhost:8765
 
 Endpoints: GET /health (liveness, no DB), GET /api/tweets, POST /api/tweet, POST /api/tweet/into/<table>, etc.
 If the server won't start, run in a terminal from repo root and check stderr (MySQL, os_check, settings_win).
+Pass --asgi to serve under uvicorn: the tweet insert/read routes become async handlers (see asgi_server.py).
+MySQL connections come from a pool of TWEETS_API_DB_POOL (default 8) in both modes.
 """
+import os
 import sys
+import threading
 import traceback
+from contextlib import contextmanager
 from pathlib import Path
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
@@ -31,169 +36,150 @@ def health():
     return jsonify({"ok": True}), 200
 
 
-def _connect():
-    """New connection every time; mysql.connector connections must not be shared across threads."""
-    return mysql.connector.connect(
-        user=USER, password=PASSWORD, host=HOST, database="news_sources"
-    )
+DB_POOL_SIZE = int(os.getenv("TWEETS_API_DB_POOL", "8"))
+_pool = None
+_pool_lock = threading.Lock()
+# mysql.connector's pool raises instead of waiting when it is empty; callers queue here instead.
+_pool_slots = threading.BoundedSemaphore(DB_POOL_SIZE)
 
 
-@app.route("/api/tables", methods=["GET"])
-def get_tables():
-    """Returns list of table names in news_sources (for dropdown)."""
-    try:
-        import db
-        conn = _connect()
+def _get_pool():
+    """The connection pool, created on first use (so a MySQL outage at startup is retried later)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            from mysql.connector import pooling
+            _pool = pooling.MySQLConnectionPool(
+                pool_name="tweets_api", pool_size=DB_POOL_SIZE,
+                user=USER, password=PASSWORD, host=HOST, database="news_sources",
+            )
+        return _pool
+
+
+@contextmanager
+def _db():
+    """A pooled connection for one request; one thread uses it at a time and it goes back on exit."""
+    with _pool_slots:
+        conn = _get_pool().get_connection()
         try:
-            tables = db.list_tables(conn)
-            return jsonify({"ok": True, "tables": sorted(tables)})
+            yield conn
         finally:
             conn.close()
-    except Exception as e:
-        err = f"{type(e).__name__}: {e}"
-        traceback.print_exc(file=sys.stderr)
-        return jsonify({"ok": False, "error": err}), 500
 
 
-@app.route("/api/tweet/into/<table_name>", methods=["POST"])
-def post_tweet_into(table_name):
-    """Body: JSON { tweet_id, author_handle, text, url?, posted_at? }. Inserts into the given table (must exist in news_sources)."""
-    import re
-    if not re.match(r"^[a-z][a-z0-9_]*$", table_name):
-        return jsonify({"ok": False, "error": "Invalid table name"}), 400
-    data = request.get_json(force=True, silent=True) or {}
+def _error(e):
+    err = f"{type(e).__name__}: {e}"
+    traceback.print_exc(file=sys.stderr)
+    return {"ok": False, "error": err}, 500
+
+
+def _tweet_fields(data):
+    """(tweet_id, author_handle, text, url, posted_at) from a POST body, or None if tweet_id/text missing."""
     tweet_id = data.get("tweet_id") or ""
     author_handle = (data.get("author_handle") or "unknown").lstrip("@")
     text = data.get("text") or ""
-    url = data.get("url")
-    posted_at = data.get("posted_at")
     if not tweet_id or not text:
-        return jsonify({"ok": False, "error": "tweet_id and text required"}), 400
+        return None
+    return tweet_id, author_handle, text, data.get("url"), data.get("posted_at")
+
+
+def insert_tweet(insert_name, data):
+    """Insert a POSTed tweet with db.<insert_name>; (body, status)."""
+    fields = _tweet_fields(data)
+    if fields is None:
+        return {"ok": False, "error": "tweet_id and text required"}, 400
     try:
         import db
-        conn = _connect()
-        try:
+        with _db() as conn:
+            getattr(db, insert_name)(conn, *fields)
+            return {"ok": True}, 200
+    except Exception as e:
+        return _error(e)
+
+
+def insert_tweet_into(table_name, data):
+    """Insert a POSTed tweet into an existing news_sources table; (body, status)."""
+    import re
+    if not re.match(r"^[a-z][a-z0-9_]*$", table_name):
+        return {"ok": False, "error": "Invalid table name"}, 400
+    fields = _tweet_fields(data)
+    if fields is None:
+        return {"ok": False, "error": "tweet_id and text required"}, 400
+    try:
+        import db
+        with _db() as conn:
             allowed = db.list_tables(conn)
             if table_name not in allowed:
-                return jsonify({"ok": False, "error": f"Table {table_name} not found in news_sources"}), 404
-            db.insert_tweet_into_table(conn, table_name, tweet_id, author_handle, text, url, posted_at)
-            return jsonify({"ok": True})
-        finally:
-            conn.close()
+                return {"ok": False, "error": f"Table {table_name} not found in news_sources"}, 404
+            db.insert_tweet_into_table(conn, table_name, *fields)
+            return {"ok": True}, 200
     except Exception as e:
-        err = f"{type(e).__name__}: {e}"
-        traceback.print_exc(file=sys.stderr)
-        return jsonify({"ok": False, "error": err}), 500
+        return _error(e)
 
 
-@app.route("/api/tweet", methods=["POST"])
-def post_tweet():
-    """Body: JSON { tweet_id, author_handle, text, url?, posted_at? }. Inserts into mlb_tweets."""
-    data = request.get_json(force=True, silent=True) or {}
-    tweet_id = data.get("tweet_id") or ""
-    author_handle = (data.get("author_handle") or "unknown").lstrip("@")
-    text = data.get("text") or ""
-    url = data.get("url")
-    posted_at = data.get("posted_at")
-    if not tweet_id or not text:
-        return jsonify({"ok": False, "error": "tweet_id and text required"}), 400
+def recent_tweets(table, limit):
+    """Newest tweets from table; (body, status)."""
+    try:
+        return {"ok": True, "tweets": _get_tweets_from_table(table, limit)}, 200
+    except Exception as e:
+        return _error(e)
+
+
+def _limit(value):
+    return min(500, max(1, int(value if value is not None else 100)))
+
+
+@app.route("/api/tables", methods=["GET"])
+def get_tables():
+    """Returns list of table names in news_sources (for dropdown)."""
     try:
         import db
-        conn = _connect()
-        try:
-            db.insert_mlb_tweet(conn, tweet_id, author_handle, text, url, posted_at)
-            return jsonify({"ok": True})
-        finally:
-            conn.close()
+        with _db() as conn:
+            tables = db.list_tables(conn)
+            return jsonify({"ok": True, "tables": sorted(tables)})
     except Exception as e:
-        err = f"{type(e).__name__}: {e}"
-        traceback.print_exc(file=sys.stderr)
-        return jsonify({"ok": False, "error": err}), 500
+        body, status = _error(e)
+        return jsonify(body), status
+
+
+@app.route("/api/tweet/into/<table_name>", methods=["POST"])
+def post_tweet_into(table_name):
+    """Body: JSON { tweet_id, author_handle, text, url?, posted_at? }. Inserts into the given table (must exist in news_sources)."""
+    body, status = insert_tweet_into(table_name, request.get_json(force=True, silent=True) or {})
+    return jsonify(body), status
+
+
+@app.route("/api/tweet", methods=["POST"])
+def post_tweet():
+    """Body: JSON { tweet_id, author_handle, text, url?, posted_at? }. Inserts into mlb_tweets."""
+    body, status = insert_tweet("insert_mlb_tweet", request.get_json(force=True, silent=True) or {})
+    return jsonify(body), status
+
 
 @app.route("/api/tweet/golf", methods=["POST"])
 def post_tweet_golf():
     """Body: JSON { tweet_id, author_handle, text, url?, posted_at? }. Inserts into golf_tweets."""
-    data = request.get_json(force=True, silent=True) or {}
-    tweet_id = data.get("tweet_id") or ""
-    author_handle = (data.get("author_handle") or "unknown").lstrip("@")
-    text = data.get("text") or ""
-    url = data.get("url")
-    posted_at = data.get("posted_at")
-    if not tweet_id or not text:
-        return jsonify({"ok": False, "error": "tweet_id and text required"}), 400
-    try:
-        import db
-        conn = _connect()
-        try:
-            db.insert_golf_tweet(conn, tweet_id, author_handle, text, url, posted_at)
-            return jsonify({"ok": True})
-        finally:
-            conn.close()
-    except Exception as e:
-        err = f"{type(e).__name__}: {e}"
-        traceback.print_exc(file=sys.stderr)
-        return jsonify({"ok": False, "error": err}), 500
+    body, status = insert_tweet("insert_golf_tweet", request.get_json(force=True, silent=True) or {})
+    return jsonify(body), status
 
 
 @app.route("/api/tweet/all", methods=["POST"])
 def post_tweet_all():
     """Body: JSON { tweet_id, author_handle, text, url?, posted_at? }. Inserts into mlb_tweets_all."""
-    data = request.get_json(force=True, silent=True) or {}
-    tweet_id = data.get("tweet_id") or ""
-    author_handle = (data.get("author_handle") or "unknown").lstrip("@")
-    text = data.get("text") or ""
-    url = data.get("url")
-    posted_at = data.get("posted_at")
-    if not tweet_id or not text:
-        return jsonify({"ok": False, "error": "tweet_id and text required"}), 400
-    try:
-        import db
-        conn = _connect()
-        try:
-            db.insert_mlb_tweet_all(conn, tweet_id, author_handle, text, url, posted_at)
-            return jsonify({"ok": True})
-        finally:
-            conn.close()
-    except Exception as e:
-        err = f"{type(e).__name__}: {e}"
-        traceback.print_exc(file=sys.stderr)
-        return jsonify({"ok": False, "error": err}), 500
+    body, status = insert_tweet("insert_mlb_tweet_all", request.get_json(force=True, silent=True) or {})
+    return jsonify(body), status
 
 
 @app.route("/api/tweets", methods=["GET"])
 def get_tweets():
     """Query params: limit (default 100). Returns recent tweets from mlb_tweets (newest first)."""
-    limit = min(500, max(1, int(request.args.get("limit", 100))))
-    try:
-        import db
-        conn = _connect()
-        try:
-            cursor = conn.cursor(buffered=True)
-            cursor.execute(
-                "SELECT id, tweet_id, author_handle, text, url, posted_at, inserted_at "
-                "FROM mlb_tweets ORDER BY inserted_at DESC LIMIT %s",
-                (limit,),
-            )
-            rows = db.fetchall_named(cursor)
-            cursor.close()
-            for r in rows:
-                if r.get("posted_at"):
-                    r["posted_at"] = r["posted_at"].isoformat() if hasattr(r["posted_at"], "isoformat") else str(r["posted_at"])
-                if r.get("inserted_at"):
-                    r["inserted_at"] = r["inserted_at"].isoformat() if hasattr(r["inserted_at"], "isoformat") else str(r["inserted_at"])
-            return jsonify({"ok": True, "tweets": rows})
-        finally:
-            conn.close()
-    except Exception as e:
-        err = f"{type(e).__name__}: {e}"
-        traceback.print_exc(file=sys.stderr)
-        return jsonify({"ok": False, "error": err}), 500
+    body, status = recent_tweets("mlb_tweets", _limit(request.args.get("limit")))
+    return jsonify(body), status
 
 
 def _get_tweets_from_table(table, limit):
     import db
-    conn = _connect()
-    try:
+    with _db() as conn:
         cursor = conn.cursor(buffered=True)
         cursor.execute(
             "SELECT id, tweet_id, author_handle, text, url, posted_at, inserted_at "
@@ -207,33 +193,21 @@ def _get_tweets_from_table(table, limit):
                 r["posted_at"] = r["posted_at"].isoformat() if hasattr(r["posted_at"], "isoformat") else str(r["posted_at"])
             if r.get("inserted_at"):
                 r["inserted_at"] = r["inserted_at"].isoformat() if hasattr(r["inserted_at"], "isoformat") else str(r["inserted_at"])
-        return jsonify({"ok": True, "tweets": rows})
-    finally:
-        conn.close()
+        return rows
 
 
 @app.route("/api/tweets/all", methods=["GET"])
 def get_tweets_all():
     """Query params: limit (default 100). Returns recent tweets from mlb_tweets_all (newest first)."""
-    limit = min(500, max(1, int(request.args.get("limit", 100))))
-    try:
-        return _get_tweets_from_table("mlb_tweets_all", limit)
-    except Exception as e:
-        err = f"{type(e).__name__}: {e}"
-        traceback.print_exc(file=sys.stderr)
-        return jsonify({"ok": False, "error": err}), 500
+    body, status = recent_tweets("mlb_tweets_all", _limit(request.args.get("limit")))
+    return jsonify(body), status
 
 
 @app.route("/api/tweets/golf", methods=["GET"])
 def get_tweets_golf():
     """Query params: limit (default 100). Returns recent tweets from golf_tweets (newest first)."""
-    limit = min(500, max(1, int(request.args.get("limit", 100))))
-    try:
-        return _get_tweets_from_table("golf_tweets", limit)
-    except Exception as e:
-        err = f"{type(e).__name__}: {e}"
-        traceback.print_exc(file=sys.stderr)
-        return jsonify({"ok": False, "error": err}), 500
+    body, status = recent_tweets("golf_tweets", _limit(request.args.get("limit")))
+    return jsonify(body), status
 
 
 # Allowed table name: lowercase letters, digits, underscore only; must end with _tweets.
@@ -255,19 +229,59 @@ def create_table():
         }), 400
     try:
         import db
-        conn = _connect()
-        try:
+        with _db() as conn:
             db.create_tweets_table(conn, table_name)
             return jsonify({"ok": True, "table_name": table_name})
-        finally:
-            conn.close()
     except Exception as e:
-        err = f"{type(e).__name__}: {e}"
-        traceback.print_exc(file=sys.stderr)
-        return jsonify({"ok": False, "error": err}), 500
+        body, status = _error(e)
+        return jsonify(body), status
+
+
+# ---- ASGI mode (--asgi) ----
+# Tweet inserts and reads run as async handlers; mysql.connector is blocking, so each one's DB work
+# runs on a worker thread with a pooled connection and the event loop keeps serving meanwhile.
+# Other routes are served by the Flask app above. See asgi_server.py.
+
+def build_asgi_app():
+    import asyncio
+    from asgi_server import AsgiRouter, wsgi_fallback
+
+    router = AsgiRouter(fallback=wsgi_fallback(app), headers={"Access-Control-Allow-Origin": "*"})
+
+    @router.route("/health")
+    async def health_async(req):
+        return {"ok": True}
+
+    def insert_route(path, insert_name):
+        @router.route(path, methods=("POST",))
+        async def handler(req):
+            return await asyncio.to_thread(insert_tweet, insert_name, req.json() or {})
+
+    insert_route("/api/tweet", "insert_mlb_tweet")
+    insert_route("/api/tweet/golf", "insert_golf_tweet")
+    insert_route("/api/tweet/all", "insert_mlb_tweet_all")
+
+    @router.route("/api/tweet/into/<table_name>", methods=("POST",))
+    async def post_tweet_into_async(req):
+        return await asyncio.to_thread(insert_tweet_into, req.params["table_name"], req.json() or {})
+
+    def read_route(path, table):
+        @router.route(path)
+        async def handler(req):
+            return await asyncio.to_thread(recent_tweets, table, _limit(req.args.get("limit")))
+
+    read_route("/api/tweets", "mlb_tweets")
+    read_route("/api/tweets/all", "mlb_tweets_all")
+    read_route("/api/tweets/golf", "golf_tweets")
+    return router
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Tweets API for the X list monitor")
+    parser.add_argument("--asgi", action="store_true", help="serve with uvicorn: async insert/read routes")
+    args = parser.parse_args()
     # Log whether DB is reachable at startup (helps debug when run by Tauri vs shell).
     try:
         c = mysql.connector.connect(user=USER, password=PASSWORD, host=HOST, database="news_sources")
@@ -276,4 +290,8 @@ if __name__ == "__main__":
     except Exception as e:
         print("MySQL at startup:", e, file=sys.stderr)
         traceback.print_exc(file=sys.stderr)
-    app.run(host="0.0.0.0", port=8765, debug=False)
+    if args.asgi:
+        from asgi_server import serve
+        serve(build_asgi_app(), "0.0.0.0", 8765)
+    else:
+        app.run(host="0.0.0.0", port=8765, debug=False)
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import os
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+pytest.importorskip("asgiref")
+
+from betting_outs.kalshi import kalshi_api, kalshi_cache, kalshi_marketdata
+from betting_outs.kalshi.kalshi_cache import TTLCache
+from tests.test_kalshi_api_orderbooks import PublicKalshi
+
+
+async def _call(app, method, path, query="", body=None):
+    """One request through the ASGI app; returns (status, parsed JSON body)."""
+    payload = json.dumps(body).encode() if body is not None else b""
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method, "scheme": "http",
+             "path": path, "raw_path": path.encode(), "root_path": "", "query_string": query.encode(),
+             "headers": [(b"content-type", b"application/json"), (b"host", b"test")],
+             "server": ("test", 80), "client": ("127.0.0.1", 1)}
+    sent = []
+    received = []
+
+    async def receive():
+        if received:
+            await asyncio.sleep(3600)
+        received.append(1)
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    status = next(m["status"] for m in sent if m["type"] == "http.response.start")
+    return status, json.loads(b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body"))
+
+
+def test_asgi_mode_serves_async_routes_and_falls_back_to_flask(monkeypatch):
+    kalshi = PublicKalshi()
+    monkeypatch.setitem(kalshi_api.KALSHI_BASE_URL, "PROD", kalshi.url)
+    monkeypatch.setattr(kalshi_cache, "_orderbook_cache", TTLCache())
+    monkeypatch.setattr(kalshi_marketdata, "get_marketdata_client", lambda env: None)
+    app = kalshi_api.build_asgi_app()
+
+    async def run():
+        assert await _call(app, "GET", "/health") == (200, {"ok": True})
+        status, data = await _call(app, "POST", "/orderbooks", "env=prod", {"tickers": ["KX-A", "KX-B"], "depth": 1})
+        assert status == 200 and data["source"] == ["rest", "rest"] and data["yes_price"] == [[41], [41]]
+        assert (await _call(app, "POST", "/orderbooks", body={"tickers": "KX-A"}))[0] == 400
+        # not an async route: answered by the Flask app
+        status, stats = await _call(app, "GET", "/cache/stats")
+        assert status == 200 and "hits" in stats
+        for fn in app.on_shutdown:
+            await fn()
+
+    try:
+        asyncio.run(run())
+    finally:
+        kalshi.close()
+    assert sorted(kalshi.calls) == [("KX-A", None), ("KX-B", None)]  # public and unsigned
+
+
+def test_fallback_runs_flask_requests_concurrently_next_to_an_open_stream():
+    from flask import Flask
+
+    from asgi_server import AsgiRouter, Streaming, wsgi_fallback
+    from betting_outs.kalshi.kalshi_stream import StreamClient, StreamHub
+    from tests.test_kalshi_stream import FakeFeed
+
+    flask_app = Flask(__name__)
+
+    @flask_app.route("/slow")
+    def slow():
+        time.sleep(0.3)
+        return {"ok": True}
+
+    feed = FakeFeed()
+    hub = StreamHub(feed)
+    router = AsgiRouter(fallback=wsgi_fallback(flask_app))
+
+    @router.route("/stream")
+    async def stream(req):
+        return Streaming(hub.aevents(StreamClient(["book"], ["KX-A"]), heartbeat=0.05))
+
+    async def run():
+        chunks, closed = [], asyncio.Event()
+
+        async def receive():
+            if not chunks:
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await closed.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            chunks.append(message.get("body", b""))
+
+        scope = {"type": "http", "method": "GET", "path": "/stream", "query_string": b"", "headers": []}
+        streaming = asyncio.ensure_future(router(scope, receive, send))
+        while len(chunks) < 2:  # response start, hello
+            await asyncio.sleep(0.01)
+        assert feed.tickers == {"KX-A"}
+
+        t0 = time.monotonic()
+        results = await asyncio.gather(*(_call(router, "GET", "/slow") for _ in range(4)))
+        # One at a time (asgiref's default) would take 1.2 s
+        assert time.monotonic() - t0 < 0.9
+        assert results == [(200, {"ok": True})] * 4
+
+        feed.update("KX-A", [[40, 5]], [[55, 3]])
+        while not any(b"event: book" in c for c in chunks):
+            await asyncio.sleep(0.01)
+        closed.set()
+        await asyncio.wait_for(streaming, 2)
+        assert hub.clients == [] and feed.tickers == set()
+
+    try:
+        asyncio.run(run())
+    finally:
+        hub._stopping = True
+
+
+def test_asgi_orders_ignore_a_non_integer_limit(monkeypatch):
+    from betting_outs.kalshi import kalshi, kalshi_async
+
+    class FakeAsyncClient:
+        async def get_orders(self, limit=None, cursor=None, status=None):
+            return {"orders": [], "limit": limit}
+
+        async def get_positions(self, limit=None, cursor=None):
+            return {"market_positions": [], "limit": limit}
+
+    monkeypatch.setattr(kalshi, "get_shared_client", lambda env: None)
+    monkeypatch.setattr(kalshi_async.AsyncKalshiHttpClient, "from_client", staticmethod(lambda c: FakeAsyncClient()))
+    app = kalshi_api.build_asgi_app()
+
+    async def run():
+        # Like the Flask routes' args.get("limit", type=int): a bad value is dropped, not a 500
+        assert await _call(app, "GET", "/orders", "limit=abc") == (200, {"orders": [], "limit": None})
+        assert await _call(app, "GET", "/positions", "limit=5") == (200, {"market_positions": [], "limit": 5})
+
+    asyncio.run(run())
@@ -0,0 +1,101 @@
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from betting_outs.kalshi import kalshi_api, kalshi_cache, kalshi_marketdata
+from betting_outs.kalshi.kalshi_cache import TTLCache
+
+
+class PublicKalshi:
+    """Stub of Kalshi's public orderbook endpoint on a local port; records paths and auth headers."""
+
+    def __init__(self):
+        calls = self.calls = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                ticker = self.path.split("/")[-2]
+                calls.append((ticker, self.headers.get("KALSHI-ACCESS-KEY")))
+                if ticker == "KX-BAD":
+                    self.send_error(404, "market not found")
+                    return
+                body = json.dumps({"orderbook": {"yes": [[38, 5], [40, 10], [41, 2]], "no": [[57, 4]]}}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tickers(self):
+        return sorted(t for t, _ in self.calls)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_bulk_orderbooks_are_columnar_truncated_and_cached(monkeypatch):
+    kalshi = PublicKalshi()
+    monkeypatch.setitem(kalshi_api.KALSHI_BASE_URL, "DEMO", kalshi.url)
+    monkeypatch.setattr(kalshi_cache, "_orderbook_cache", TTLCache())
+    monkeypatch.setattr(kalshi_marketdata, "get_marketdata_client", lambda env: None)
+    app = kalshi_api.app.test_client()
+
+    resp = app.post("/orderbooks?env=demo", json={"tickers": ["KX-A", "KX-B", "KX-BAD", "KX-A"], "depth": 2})
+    data = resp.get_json()
+    assert kalshi.tickers() == ["KX-A", "KX-B", "KX-BAD"]  # one concurrent fan-out, duplicates dropped
+    assert all(key is None for _, key in kalshi.calls)  # public endpoint: no key, no signed budget
+    assert data["tickers"] == ["KX-A", "KX-B", "KX-BAD"] and data["source"] == ["rest", "rest", "error"]
+    assert data["yes_price"][0] == [41, 40] and data["yes_qty"][0] == [2, 10]  # best first, depth 2
+    assert data["no_price"][1] == [57] and data["yes_price"][2] == []
+    assert data["errors"]["KX-BAD"].startswith("404")
+
+    data = app.post("/orderbooks", json={"tickers": ["KX-A", "KX-C"]}).get_json()
+    assert kalshi.calls[-1][0] == "KX-C" and len(kalshi.calls) == 4 and data["source"] == ["cache", "rest"]
+    assert len(data["yes_price"][0]) == 3
+
+    assert app.post("/orderbooks", json={"tickers": "KX-A"}).status_code == 400
+    assert app.post("/orderbooks", json={"tickers": ["KX-A"], "depth": 0}).status_code == 400
+    kalshi.close()
+
+
+class ColdMarketData:
+    """A market-data service with no book yet for anything."""
+
+    def __init__(self):
+        self.added = []
+
+    def add_tickers(self, tickers):
+        self.added.extend(tickers)
+
+    def book(self, ticker):
+        return None
+
+
+def test_single_orderbook_goes_to_rest_without_waiting_for_the_live_book(monkeypatch):
+    md = ColdMarketData()
+    monkeypatch.setattr(kalshi_marketdata, "get_marketdata_client", lambda env: md)
+    fetched = []
+    monkeypatch.setattr(kalshi_api, "public_orderbook",
+                        lambda env, t: fetched.append(t) or {"orderbook": {"yes": [[40, 1]], "no": []}})
+    app = kalshi_api.app.test_client()
+
+    resp = app.get("/markets/kx-a/orderbook?env=prod")
+    assert resp.status_code == 200 and resp.get_json()["orderbook"]["yes"] == [[40, 1]]
+    assert md.added == ["KX-A"] and fetched == ["KX-A"]
+    assert app.get("/markets/KX A;/orderbook").status_code == 400
+    assert app.post("/orderbooks", json={"tickers": ["KX-A", "../x"]}).status_code == 400
+    assert md.added == ["KX-A"]  # nothing invalid reached the shared engine
@@ -0,0 +1,77 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from betting_outs.kalshi.kalshi_async import AsyncKalshiHttpClient
+from betting_outs.kalshi.kalshi_ratelimit import RateLimiter
+
+DELAY = 0.2
+
+
+async def _orderbook(request):
+    await asyncio.sleep(DELAY)
+    assert request.headers["KALSHI-ACCESS-SIGNATURE"]
+    ticker = request.match_info["ticker"]
+    return web.json_response({"orderbook": {"yes": [[40, 1]], "no": [[58, 2]]}, "ticker": ticker})
+
+
+def test_get_orderbooks_fans_out_concurrently():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    tickers = [f"KX-{i}" for i in range(6)]
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/trade-api/v2/markets/{ticker}/orderbook", _orderbook)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        client = AsyncKalshiHttpClient("k", key, "DEMO", rate_limiter=RateLimiter(read_per_sec=100))
+        client.host = f"http://127.0.0.1:{port}"
+        try:
+            t0 = time.perf_counter()
+            books = await client.get_orderbooks(tickers)
+            return books, time.perf_counter() - t0
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    books, elapsed = asyncio.run(main())
+    assert [books[t]["ticker"] for t in tickers] == tickers
+    assert elapsed < DELAY * 3
+
+
+def test_unfollowed_redirect_is_returned_not_retried():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    async def not_modified(request):
+        return web.Response(status=304)
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/trade-api/v2/exchange/status", not_modified)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        client = AsyncKalshiHttpClient("k", key, "DEMO", rate_limiter=RateLimiter(read_per_sec=100))
+        client.host = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        try:
+            return await client.get("/trade-api/v2/exchange/status")
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    assert asyncio.run(main()) == {}
@@ -0,0 +1,76 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from betting_outs.kalshi.kalshi_cache import MarketCache, TTLCache
+
+
+def test_concurrent_loads_of_one_key_are_coalesced():
+    cache = TTLCache()
+    calls = []
+    release = threading.Event()
+
+    def load():
+        calls.append(1)
+        release.wait(2)
+        return {"markets": []}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", load, 60))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 2
+    while cache.stats["misses"] + cache.stats["coalesced"] < 8 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1 and len(results) == 8 and all(r is results[0] for r in results)
+    assert cache.stats["misses"] == 1 and cache.stats["coalesced"] == 7
+    cache.get_or_load("k", load, 60)
+    assert cache.stats["hits"] == 1 and len(calls) == 1
+
+
+def test_entries_expire_and_errors_are_not_cached():
+    now = [0.0]
+    cache = TTLCache(clock=lambda: now[0])
+    assert cache.get_or_load("a", lambda: 1, 10) == 1
+    now[0] = 11
+    assert cache.get_or_load("a", lambda: 2, 10) == 2
+
+    def fail():
+        raise RuntimeError("502")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("b", fail, 10)
+    assert cache.get_or_load("b", lambda: 3, 10) == 3 and cache.stats["errors"] == 1
+    # ttl 0 only coalesces: nothing is kept, and a successful load is not an error
+    assert cache.get_or_load("c", lambda: 4, 0) == 4 and cache.get("c") is None and cache.stats["errors"] == 1
+
+
+def test_reciprocal_lookups_use_the_event_index():
+    calls = []
+
+    def fetch(env, params):
+        calls.append(params)
+        markets = [{"ticker": "KXEV-A", "event_ticker": "KXEV"}, {"ticker": "KXEV-B", "event_ticker": "KXEV"}]
+        if "tickers" in params:
+            markets = [m for m in markets if m["ticker"] == params["tickers"]]
+        return {"markets": markets, "cursor": ""}
+
+    cache = MarketCache(fetch=fetch)
+    assert cache.event_ticker("PROD", "KXEV-A") == "KXEV"
+    assert [m["ticker"] for m in cache.event_markets("PROD", "KXEV")] == ["KXEV-A", "KXEV-B"]
+    assert len(calls) == 2
+    # KXEV-B was indexed from the event listing: its reciprocal needs no call
+    assert cache.event_ticker("PROD", "kxev-b") == "KXEV" and cache.event_markets("PROD", "KXEV")
+    assert len(calls) == 2 and cache.stats()["index_hits"] == 2
+    cache.markets("PROD", {"event_ticker": "KXEV"}, fresh=True)
+    assert len(calls) == 3
@@ -0,0 +1,43 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from betting_outs.kalshi import kalshi
+
+
+def _write_pem(path):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    with open(path, "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ))
+
+
+def test_shared_client_cached_per_env_and_rebuilt_on_key_change(tmp_path, monkeypatch):
+    pem = tmp_path / "key.pem"
+    _write_pem(pem)
+    monkeypatch.setenv("KALSHI_API_KEY", "key-id")
+    monkeypatch.setenv("KALSHI_PRIVATE_KEY_PATH", str(pem))
+    monkeypatch.setattr(kalshi, "_shared_clients", {})
+    monkeypatch.setattr(kalshi, "_shared_limiters", {})
+
+    demo = kalshi.get_shared_client("DEMO")
+    assert kalshi.get_shared_client("DEMO") is demo
+    prod = kalshi.get_shared_client("PROD")
+    assert prod is not demo
+    assert prod.rate_limiter is not demo.rate_limiter
+
+    _write_pem(pem)
+    st = os.stat(pem)
+    os.utime(pem, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    rebuilt = kalshi.get_shared_client("DEMO")
+    assert rebuilt is not demo
+    assert rebuilt.rate_limiter is demo.rate_limiter
@@ -0,0 +1,98 @@
+import asyncio
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from betting_outs.kalshi.kalshi_live import OrderBookEngine
+
+KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+class FakeWs:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, text):
+        self.sent.append(json.loads(text))
+
+
+def _msg(kind, seq, sid=7, **msg):
+    return json.dumps({"type": kind, "sid": sid, "seq": seq, "msg": msg})
+
+
+def test_snapshot_delta_and_gap_resync():
+    engine = OrderBookEngine("k", KEY, "DEMO", ["KX-A"])
+    engine.ws = FakeWs()
+
+    async def feed():
+        await engine.on_open()
+        await engine.on_message(json.dumps({"type": "subscribed", "msg": {"channel": "orderbook_delta", "sid": 7}}))
+        await engine.on_message(_msg("orderbook_snapshot", 1, market_ticker="KX-A", yes=[[40, 10], [42, 5]], no=[[55, 3]]))
+        assert engine.best_bid_ask("KX-A") == (42, 55, 5, 3)
+        await engine.on_message(_msg("orderbook_delta", 2, market_ticker="KX-A", side="yes", price=42, delta=-5))
+        await engine.on_message(_msg("orderbook_delta", 3, market_ticker="KX-A", side="no", price=57, delta=4))
+        assert engine.best_bid_ask("KX-A") == (40, 57, 10, 4)
+        # seq 5 after 3: gap -> books unsynced and a fresh subscription requested
+        await engine.on_message(_msg("orderbook_delta", 5, market_ticker="KX-A", side="no", price=57, delta=1))
+        assert engine.best_bid_ask("KX-A") is None
+        # messages from the dropped subscription are ignored
+        await engine.on_message(_msg("orderbook_snapshot", 6, market_ticker="KX-A", yes=[[1, 1]], no=[[1, 1]]))
+        assert engine.best_bid_ask("KX-A") is None
+        await engine.on_message(json.dumps({"type": "subscribed", "msg": {"channel": "orderbook_delta", "sid": 8}}))
+        await engine.on_message(_msg("orderbook_snapshot", 1, sid=8, market_ticker="KX-A", yes=[[41, 2]], no=[[50, 1]]))
+
+    asyncio.run(feed())
+    assert engine.best_bid_ask("KX-A") == (41, 50, 2, 1)
+    cmds = [m["cmd"] for m in engine.ws.sent]
+    assert cmds == ["subscribe", "unsubscribe", "subscribe"]
+    assert engine.ws.sent[1]["params"]["sids"] == [7]
+    assert engine.stats["gaps"] == 1
+
+
+def test_added_tickers_join_the_subscription_without_a_resync():
+    engine = OrderBookEngine("k", KEY, "DEMO", ["KX-A"])
+    engine.ws = FakeWs()
+
+    async def feed():
+        await engine.on_open()
+        engine.tickers |= {"KX-B"}  # added while the subscribe is in flight
+        await engine._add_markets()
+        await engine.on_message(json.dumps({"id": 1, "type": "subscribed", "msg": {"channel": "orderbook_delta", "sid": 7}}))
+        await engine.on_message(_msg("orderbook_snapshot", 1, market_ticker="KX-A", yes=[[40, 10]], no=[[55, 3]]))
+        engine.tickers |= {"KX-BAD"}
+        await engine._add_markets()
+        await engine.on_message(json.dumps({"id": 3, "type": "error", "msg": {"code": 6, "msg": "market not found"}}))
+        await engine.on_message(_msg("orderbook_snapshot", 2, market_ticker="KX-B", yes=[[30, 1]], no=[[60, 1]]))
+
+    asyncio.run(feed())
+    assert engine.best_bid_ask("KX-A") == (40, 55, 10, 3)  # never went back to unsynced
+    assert engine.best_bid_ask("KX-B") == (30, 60, 1, 1)
+    assert [(m["cmd"], m["params"].get("market_tickers"), m["params"].get("action")) for m in engine.ws.sent] == [
+        ("subscribe", ["KX-A"], None),
+        ("update_subscription", ["KX-B"], "add_markets"),
+        ("update_subscription", ["KX-BAD"], "add_markets"),
+    ]
+    assert engine.tickers == {"KX-A", "KX-B"} and engine.stats["rejected"] == 1 and engine.stats["resyncs"] == 0
+
+
+def test_removed_tickers_leave_the_subscription():
+    engine = OrderBookEngine("k", KEY, "DEMO", ["KX-A", "KX-B"])
+    engine.ws = FakeWs()
+
+    async def feed():
+        await engine.on_open()
+        await engine.on_message(json.dumps({"id": 1, "type": "subscribed", "msg": {"channel": "orderbook_delta", "sid": 7}}))
+        await engine.on_message(_msg("orderbook_snapshot", 1, market_ticker="KX-B", yes=[[30, 1]], no=[]))
+        engine.tickers -= {"KX-B"}
+        await engine._remove_markets({"KX-B"})
+        await engine.on_message(_msg("orderbook_delta", 2, market_ticker="KX-B", side="yes", price=30, delta=1))
+
+    asyncio.run(feed())
+    assert engine.ws.sent[-1]["params"] == {"sids": [7], "market_tickers": ["KX-B"], "action": "delete_markets"}
+    assert engine.books["KX-B"].depth_at("yes", 30) == 1  # late delta for a removed ticker ignored
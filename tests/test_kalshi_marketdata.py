@@ -0,0 +1,145 @@
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from betting_outs.kalshi.kalshi_marketdata import MarketDataClient, MarketDataServer, decode_book, encode_book
+from betting_outs.kalshi.kalshi_orderbook import OrderBook
+
+pytestmark = pytest.mark.skipif(not hasattr(asyncio, "start_unix_server"), reason="needs Unix sockets")
+
+
+def _book(ticker, yes, no, seq=7):
+    book = OrderBook(ticker)
+    book.apply_snapshot(yes, no)
+    book.seq = seq
+    return book
+
+
+def test_book_round_trips_through_binary_format():
+    book = _book("KX-A", [[1, 500], [40, 12]], [[55, 3], [99, 70000]])
+    book.updated_at = time.monotonic() - 2.0
+    body = encode_book("KX-A", book)
+    assert len(body) == 1 + 4 + 15 + 4 * 5  # ticker, header, four levels
+    out = decode_book(body)
+    assert out.synced and out.seq == 7 and out.ticker == "KX-A"
+    assert 2.0 <= out.age() < 2.5  # age counts from the engine's update, not from decoding
+    assert out.to_levels("yes") == [[1, 500], [40, 12]] and out.to_levels("no") == [[55, 3], [99, 70000]]
+    assert out.best_yes_bid == 40 and out.best_no_bid == 99
+    assert not decode_book(encode_book("KX-B", None)).synced
+
+
+class FakeEngine:
+    def __init__(self, books):
+        self.books = books
+        self.lock = threading.Lock()
+        self.tickers = set()
+        self.listeners = []
+
+    def add_listener(self, fn):
+        self.listeners.append(fn)
+
+    def add_tickers(self, tickers):
+        self.tickers |= set(tickers)
+
+    def remove_tickers(self, tickers):
+        self.tickers -= set(tickers)
+
+    def update(self, ticker, book):
+        with self.lock:
+            self.books[ticker] = book
+        for fn in self.listeners:
+            fn(ticker, book)
+
+
+def _wait(cond, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def _start(server):
+    """Run server on its own loop thread; returns the loop."""
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        started.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    assert started.wait(2)
+    return loop
+
+
+def _stop(server, loop):
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result(2)
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def test_clients_subscribe_and_get_updates(tmp_path):
+    engine = FakeEngine({"KX-A": _book("KX-A", [[40, 10]], [[56, 5]])})
+    server = MarketDataServer(engine, str(tmp_path / "md.sock"))
+    loop = _start(server)
+    a, b = MarketDataClient(server.path), MarketDataClient(server.path)
+    try:
+        assert a.wait_for("KX-A", 2).to_levels("yes") == [[40, 10]]
+        assert a.best_bid_ask("KX-A") == (40, 56, 10, 5)
+        b.add_tickers(["KX-A", "KX-B"])
+        _wait(lambda: b.book("KX-A") is not None)
+        assert engine.tickers == {"KX-A", "KX-B"} and b.book("KX-B") is None  # no live book yet
+
+        engine.update("KX-B", _book("KX-B", [[30, 1]], []))
+        _wait(lambda: b.book("KX-B") is not None)
+        assert "KX-B" not in a.books  # a never subscribed
+
+        a.unsubscribe(["KX-A"])
+        _wait(lambda: server.stats["subscriptions"] == 2)
+        engine.update("KX-A", _book("KX-A", [[41, 10]], [[56, 5]]))
+        _wait(lambda: b.best_bid_ask("KX-A")[0] == 41)
+        assert a.book("KX-A") is None
+        assert engine.tickers == {"KX-A", "KX-B"}  # b still follows KX-A
+
+        b.unsubscribe(["KX-B"])
+        _wait(lambda: engine.tickers == {"KX-A"})  # last subscriber gone
+        assert server.stats["clients"] == 2
+    finally:
+        a.stop()
+        b.stop()
+        _stop(server, loop)
+
+
+def test_requests_survive_a_dead_service_and_resubscribe(tmp_path):
+    path = str(tmp_path / "md.sock")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen(1)
+    md = MarketDataClient(path)
+    conn, _ = listener.accept()
+    conn.close()  # the service dies
+    listener.close()
+    os.unlink(path)
+    md.add_tickers(["KX-A"])  # no BrokenPipeError for the caller
+    md.add_tickers(["KX-B"])
+    assert md.tickers == {"KX-A", "KX-B"} and md.book("KX-A") is None
+
+    engine = FakeEngine({"KX-A": _book("KX-A", [[40, 10]], [[56, 5]])})
+    server = MarketDataServer(engine, path)
+    loop = _start(server)
+    try:
+        _wait(lambda: md.book("KX-A") is not None, timeout=5)  # reconnected and resubscribed
+        assert engine.tickers == {"KX-A", "KX-B"}
+    finally:
+        md.stop()
+        _stop(server, loop)
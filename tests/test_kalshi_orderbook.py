@@ -0,0 +1,49 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from betting_outs.kalshi.kalshi_orderbook import OrderBook
+
+
+def _book():
+    return OrderBook.from_response({"orderbook": {"yes": [[30, 5], [35, 10], [40, 2]], "no": [[55, 7], [58, 1]]}}, "KX-A")
+
+
+def test_best_prices_and_implied_asks():
+    book = _book()
+    assert (book.best_yes_bid, book.best_no_bid) == (40, 58)
+    assert (book.best_yes_ask, book.best_no_ask) == (42, 60)
+    assert book.depth_at("yes", 35) == 10 and book.depth_at("yes", 36) == 0
+    assert book.to_levels("no") == [[55, 7], [58, 1]]
+
+
+def test_delta_updates_and_rescans_best():
+    book = _book()
+    book.apply_delta("yes", 40, -2)
+    assert book.best_yes_bid == 35
+    book.apply_delta("yes", 45, 3)
+    assert book.best_yes_bid == 45
+    book.apply_delta("no", 58, -5)  # over-removal clamps to empty
+    assert book.best_no_bid == 55 and book.depth_at("no", 58) == 0
+    book.apply_delta("no", 55, -7)
+    assert book.best_no_bid == 0 and book.best_yes_ask is None
+
+
+def test_cumulative_depth_and_vwap():
+    book = _book()
+    cum = book.cumulative_depth("yes")
+    assert (cum[40], cum[35], cum[30], cum[1]) == (2, 12, 17, 17)
+    vwap, filled = book.vwap_to_size("yes", 7)
+    assert filled == 7 and abs(vwap - (2 * 40 + 5 * 35) / 7) < 1e-9
+    assert book.vwap_to_size("yes", 100)[1] == 17
+    assert OrderBook().vwap_to_size("no", 5) is None
+
+
+def test_copy_is_independent():
+    book = _book()
+    snap = book.copy()
+    book.apply_delta("yes", 40, -2)
+    assert snap.best_yes_bid == 40 and snap.depth_at("yes", 40) == 2
@@ -0,0 +1,58 @@
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from betting_outs.kalshi.kalshi import KalshiHttpClient
+from betting_outs.kalshi.kalshi_async import AsyncKalshiHttpClient
+
+KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+PAGES = {None: ([1, 2], "c1"), "c1": ([3, 4], "c2"), "c2": ([5], "")}
+
+
+def test_iter_orders_follows_cursor_lazily():
+    client = KalshiHttpClient("k", KEY)
+    calls = []
+
+    def fake_get_orders(cursor=None, **params):
+        calls.append((cursor, params["status"], params["limit"]))
+        items, nxt = PAGES[cursor]
+        return {"orders": items, "cursor": nxt}
+
+    client.get_orders = fake_get_orders
+    it = client.iter_orders(status="resting")
+    assert next(it) == 1
+    assert len(calls) == 1  # second page not fetched until needed
+    assert list(it) == [2, 3, 4, 5]
+    assert calls == [(None, "resting", 200), ("c1", "resting", 200), ("c2", "resting", 200)]
+
+
+def test_async_iter_prefetches_next_page():
+    client = AsyncKalshiHttpClient("k", KEY)
+    delay = 0.1
+
+    async def fake_get_orders(cursor=None, **params):
+        await asyncio.sleep(delay)
+        items, nxt = PAGES[cursor]
+        return {"orders": items, "cursor": nxt}
+
+    client.get_orders = fake_get_orders
+
+    async def main():
+        out = []
+        t0 = time.perf_counter()
+        async for item in client.iter_orders():
+            out.append(item)
+            await asyncio.sleep(delay / 2)  # "processing" overlaps the next fetch
+        return out, time.perf_counter() - t0
+
+    items, elapsed = asyncio.run(main())
+    assert items == [1, 2, 3, 4, 5]
+    # Serial would be 3 fetches + 5 items of processing = 0.55 s.
+    assert elapsed < 0.5
@@ -0,0 +1,77 @@
+import asyncio
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from betting_outs.kalshi.kalshi_ratelimit import RateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_allows_burst_then_reports_wait():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=10, clock=clock)
+    assert all(bucket.reserve() == 0.0 for _ in range(10))
+    assert abs(bucket.reserve() - 0.1) < 1e-9
+    clock.now = 1.0
+    # One second refills 10 tokens; 1 was already owed.
+    assert abs(bucket.available() - 9.0) < 1e-9
+
+
+def test_try_acquire_never_goes_negative():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=5, capacity=2, clock=clock)
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert bucket.available() == 0.0
+    clock.now = 0.2
+    assert bucket.try_acquire()
+
+
+def test_cost_above_capacity_does_not_deadlock():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=10, clock=clock)
+    assert abs(bucket.reserve(20) - 1.0) < 1e-9
+
+
+def test_read_and_write_budgets_are_independent():
+    clock = FakeClock()
+    limiter = RateLimiter(read_per_sec=20, write_per_sec=10, safety=1.0, clock=clock)
+    for _ in range(10):
+        assert limiter.try_acquire("write")
+    assert not limiter.try_acquire("write")
+    # Writes exhausted; reads still have their full burst.
+    for _ in range(20):
+        assert limiter.try_acquire("read")
+    assert not limiter.try_acquire("read")
+
+
+def test_acquire_async_waits_without_blocking_loop():
+    limiter = RateLimiter.from_tier("basic", safety=1.0)
+    limiter.buckets["write"].tokens = 0.0
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        await limiter.acquire_async("write")
+        task.cancel()
+        return ticks
+
+    assert asyncio.run(main()) > 3
@@ -0,0 +1,93 @@
+import json
+import os
+import sys
+
+import pytest
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from betting_outs.kalshi import kalshi
+from betting_outs.kalshi.kalshi_retry import RetryPolicy, parse_retry_after
+
+KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _response(status, body=None, headers=None):
+    r = requests.Response()
+    r.status_code = status
+    r._content = json.dumps(body or {}).encode()
+    r.headers.update(headers or {})
+    r.url = "http://stub"
+    return r
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        r = self.responses.pop(0)
+        if isinstance(r, Exception):
+            raise r
+        return r
+
+
+@pytest.fixture
+def client(monkeypatch):
+    c = kalshi.KalshiHttpClient("k", KEY, retry_policy=RetryPolicy(max_retries=3, base_delay=0.0))
+    monkeypatch.setattr(kalshi.time, "sleep", lambda s: None)
+    return c
+
+
+def test_get_retries_429_and_5xx_and_throttles_limiter(client):
+    client.session = FakeSession([
+        _response(429, headers={"Retry-After": "0"}),
+        requests.ConnectionError("reset"),
+        _response(502),
+        _response(200, {"balance": 5}),
+    ])
+    read_rate = client.rate_limiter.buckets["read"].rate
+    assert client.get_balance() == {"balance": 5}
+    stats = client.retry_stats.snapshot()
+    assert stats["retries"] == 3
+    assert stats["throttled"] == 1 and stats["network_errors"] == 1 and stats["server_errors"] == 1
+    assert client.rate_limiter.buckets["read"].rate < read_rate
+
+
+def test_get_gives_up_after_max_retries(client):
+    client.session = FakeSession([_response(503)] * 4)
+    with pytest.raises(requests.HTTPError) as exc:
+        client.get_balance()
+    assert exc.value.retried == 3
+    assert client.retry_stats.snapshot()["gave_up"] == 1
+
+
+def test_delete_is_not_retried(client):
+    client.session = FakeSession([_response(503)])
+    with pytest.raises(requests.HTTPError):
+        client.cancel_order("abc")
+
+
+def test_create_order_retry_reuses_client_order_id_and_resolves_conflict(client):
+    client.session = FakeSession([
+        requests.Timeout("read timed out"),
+        _response(409, {"error": {"code": "order_already_exists"}}),
+        _response(200, {"orders": [{"order_id": "o1", "client_order_id": "cid-1"}], "cursor": ""}),
+    ])
+    result = client.create_order("KX-A", "buy", "no", 5, no_price=40, client_order_id="cid-1")
+    assert result == {"order": {"order_id": "o1", "client_order_id": "cid-1"}}
+    posted = [kw["json"]["client_order_id"] for m, _, kw in client.session.calls if m == "POST"]
+    assert posted == ["cid-1", "cid-1"]
+
+
+def test_parse_retry_after():
+    assert parse_retry_after({"Retry-After": "2"}) == 2.0
+    assert parse_retry_after({"Retry-After": "soon"}) is None
+    assert parse_retry_after({}) is None
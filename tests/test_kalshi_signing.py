@@ -0,0 +1,39 @@
+import base64
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+from betting_outs.kalshi.kalshi_signing import RequestSigner
+
+
+def _verify(public_key, headers, method, path):
+    message = (headers["KALSHI-ACCESS-TIMESTAMP"] + method + path).encode()
+    public_key.verify(
+        base64.b64decode(headers["KALSHI-ACCESS-SIGNATURE"]),
+        message,
+        padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH),
+        hashes.SHA256(),
+    )
+
+
+def test_headers_and_headers_many_produce_valid_signatures():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    signer = RequestSigner("key-id", key)
+
+    one = signer.headers("GET", "/trade-api/v2/portfolio/orders?status=resting")
+    assert one["KALSHI-ACCESS-KEY"] == "key-id"
+    _verify(key.public_key(), one, "GET", "/trade-api/v2/portfolio/orders")
+
+    pairs = [("POST", "/trade-api/v2/portfolio/orders"), ("DELETE", "/trade-api/v2/portfolio/orders/x?y=1")]
+    many = signer.headers_many(pairs)
+    assert len({h["KALSHI-ACCESS-TIMESTAMP"] for h in many}) == 1
+    _verify(key.public_key(), many[0], "POST", "/trade-api/v2/portfolio/orders")
+    _verify(key.public_key(), many[1], "DELETE", "/trade-api/v2/portfolio/orders/x")
+
+    assert signer.stats()["signatures"] == 3
@@ -0,0 +1,120 @@
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from betting_outs.kalshi import kalshi_stream
+from betting_outs.kalshi.kalshi_live import FillSubscription
+from betting_outs.kalshi.kalshi_orderbook import OrderBook
+from betting_outs.kalshi.kalshi_stream import StreamClient, StreamHub
+
+
+class FakeFeed:
+    def __init__(self):
+        self.books = {}
+        self.tickers = set()
+        self.listeners = []
+        self.sub = FillSubscription()
+        self.stats = {}
+
+    def subscribe(self):
+        return self.sub
+
+    def add_listener(self, fn):
+        self.listeners.append(fn)
+
+    def add_tickers(self, tickers):
+        self.tickers |= set(tickers)
+
+    def remove_tickers(self, tickers):
+        self.tickers -= set(tickers)
+
+    def book(self, ticker):
+        return self.books.get(ticker)
+
+    def update(self, ticker, yes, no):
+        book = self.books[ticker] = OrderBook(ticker)
+        book.apply_snapshot(yes, no)
+        for fn in self.listeners:
+            fn(ticker, book)
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = 0
+
+    def get_balance(self):
+        self.calls += 1
+        return {"balance": 1000 - self.calls}
+
+
+def _read(gen, n):
+    """Next n SSE chunks from gen, read on a thread so a stuck stream fails instead of hanging."""
+    out = []
+
+    def run():
+        for _ in range(n):
+            out.append(next(gen))
+
+    t = threading.Thread(target=run, daemon=True)
+    t.start()
+    t.join(3)
+    assert len(out) == n
+    return "".join(out)
+
+
+def test_clients_get_filtered_events_and_conflated_books(monkeypatch):
+    monkeypatch.setattr(kalshi_stream, "BALANCE_DEBOUNCE_SEC", 0.05)
+    feed, client = FakeFeed(), FakeClient()
+    hub = StreamHub(feed, client)
+    ui = StreamClient(["order", "fill", "balance"])
+    ladder = StreamClient(["book"], ["KX-A"], depth=1)
+    ui_stream, ladder_stream = hub.events(ui, heartbeat=0.05), hub.events(ladder, heartbeat=0.05)
+    assert "event: hello" in _read(ui_stream, 1) + _read(ladder_stream, 1)
+    assert feed.tickers == {"KX-A"}
+
+    for price in (40, 41, 42):  # three deltas before the client reads: one book event
+        feed.update("KX-A", [[38, 1], [price, 5]], [[55, 2]])
+    feed.update("KX-B", [[10, 1]], [])
+    chunk = _read(ladder_stream, 1)
+    assert chunk.count("event: book") == 1 and '"yes":[[42,5]]' in chunk and "KX-B" not in chunk
+    assert ladder.stats["conflated"] >= 2
+
+    feed.sub.events.put(("fill", {"market_ticker": "KX-A", "count": 3}))
+    feed.sub.events.put(("fill", {"market_ticker": "KX-A", "count": 2}))
+    feed.sub.events.put(("user_order", {"ticker": "KX-A", "status": "executed"}))
+    text = ""
+    deadline = time.monotonic() + 3
+    while "event: balance" not in text or text.count("event: fill") < 2 or "event: order" not in text:
+        assert time.monotonic() < deadline
+        text += _read(ui_stream, 1)
+    assert client.calls == 1  # one balance fetch for the burst of fills
+    assert "event: fill" not in _read(ladder_stream, 1)
+    hub._stopping = True
+
+
+def test_slow_client_overflow_becomes_one_resync():
+    c = StreamClient(["order"], max_queue=3)
+    for i in range(5):
+        c.push("order", {"i": i})
+    events, _ = c.take(0)
+    assert [k for k, _ in events] == ["resync", "order"] and c.stats["overflows"] == 1
+
+
+def test_book_tickers_leave_the_feed_with_their_last_client():
+    feed = FakeFeed()
+    hub = StreamHub(feed)
+    a = hub.connect(StreamClient(["book"], ["kx-a", "KX-B"]))
+    b = hub.connect(StreamClient(["book", "order"], ["KX-A"]))
+    hub.connect(StreamClient(["order"], ["KX-C"]))  # no book events: never subscribed
+    assert feed.tickers == {"KX-A", "KX-B"}
+    hub.disconnect(a)
+    assert feed.tickers == {"KX-A"}
+    hub.disconnect(a)  # twice is harmless
+    hub.disconnect(b)
+    assert feed.tickers == set() and hub._ticker_refs == {}
+    hub._stopping = True
@@ -0,0 +1,176 @@
+import json
+import os
+import sys
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from betting_outs.kalshi.kalshi import KalshiHttpClient
+from market_making.bot import StakeBot
+from market_making.stakes import StakeIndex
+from market_making.state_store import StateStore
+from market_making.supervisor import load_strategy_file
+
+
+class NoMarketData:
+    def orderbooks(self, config, tickers):
+        return None
+
+    def subscribe_fills(self, config):
+        return None
+
+
+class BatchSession:
+    """Answers POST /portfolio/orders/batched; every order is accepted."""
+
+    def __init__(self):
+        self.calls = []
+        self.orders = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url))
+        bodies = kwargs["json"]["orders"]
+        self.orders.extend(bodies)
+        out = [{"client_order_id": b["client_order_id"], "order": {"order_id": "o-" + b["client_order_id"]}} for b in bodies]
+        r = requests.Response()
+        r.status_code = 201
+        r._content = json.dumps({"orders": out}).encode()
+        return r
+
+
+def test_initial_placement_is_batched(tmp_path):
+    config = load_strategy_file(os.path.join(ROOT, "market_making", "mm_KXTXSENDPRIMARYMOV_26MAR03.py"))
+    for stake in config["stakes"]:
+        stake.update(side="both", yes_price=20, no_price=70)
+    client = KalshiHttpClient("k", rsa.generate_private_key(public_exponent=65537, key_size=2048))
+    client.session = BatchSession()
+    store = StateStore(str(tmp_path / "state.db"))
+    bot = StakeBot(config, "DEMO", client=client, market_data=NoMarketData(), store=store)
+    bot.setup()
+
+    # 11 stakes x 2 sides = 22 orders -> two batched requests instead of 22 creates
+    assert [url.rsplit("/", 2)[-2:] for _, url in client.session.calls] == [["orders", "batched"]] * 2
+    ticker = config["stakes"][0]["ticker"]
+    yes_id, no_id = bot.state[ticker]["our_order_ids"]
+    assert yes_id.startswith(f"o-mm_{ticker}_yes_") and no_id.startswith(f"o-mm_{ticker}_no_")
+    # Every placement gets its own client_order_id (a 409 retry must not resolve to an older order)
+    assert len({o["client_order_id"] for o in client.session.orders}) == 22
+    assert bot.tracker.tracked() == 22
+    store.flush()
+    assert store.get(bot.scope, f"placed:{ticker}") is True
+    store.close()
+
+
+def test_stake_index_dispatches_by_ticker_and_side():
+    index = StakeIndex([
+        {"ticker": " KX-A ", "side": "yes", "shares": 10, "pct_reload": 50, "repost_base": "market_mean", "cents_off": 2},
+        {"ticker": "KX-A", "side": "no", "shares": 4},
+        {"ticker": "KX-B", "side": "both", "shares": 3, "max_shares": "9"},
+    ])
+    a_yes, a_no = index.get("kx-a", "yes"), index.get("KX-A ", "NO")
+    assert (a_yes.side, a_no.side) == ("yes", "no")  # second stake on a ticker owns its side
+    assert a_yes.ticker == "KX-A" and a_yes.repost_size == 5 and index.get("KX-B", "no").max_shares == 9
+    assert a_yes.repost_price(None, 40, 44, "yes") == 40  # floor((40 + 44) / 2) - 2
+    assert index.get("KX-C", "yes") is None
+
+
+class FakeLive:
+    def best_bid_ask(self, ticker):
+        return (40, 56, 10, 10)  # yes bid 40, no bid 56 -> yes ask 44
+
+
+def test_fills_in_one_cycle_repost_as_one_batch(tmp_path):
+    config = {"event_ticker": "KXEV", "fill_source": "poll", "stakes": [
+        {"ticker": "KX-A", "side": "yes", "shares": 10, "repost_base": "market_mean"},
+        {"ticker": "KX-B", "side": "no", "shares": 4, "repost_base": "previous_fill", "cents_off": 1},
+    ]}
+    client = KalshiHttpClient("k", rsa.generate_private_key(public_exponent=65537, key_size=2048))
+    client.session = BatchSession()
+    store = StateStore(str(tmp_path / "state.db"))
+    bot = StakeBot(config, "DEMO", client=client, market_data=NoMarketData(), store=store)
+    bot.setup()
+    bot.live = FakeLive()
+    executed = [
+        {"order_id": "a1", "ticker": "KX-A", "side": "yes", "fill_count": 10, "yes_price": 41},
+        {"order_id": "a2", "ticker": "KX-A", "side": "yes", "fill_count": 10, "yes_price": 42},
+        {"order_id": "b1", "ticker": "KX-B", "side": "no", "fill_count": 4, "no_price": 60},
+    ]
+    bot.our_order_ids.update(o["order_id"] for o in executed)
+    bot.ready = [(o, time.monotonic()) for o in executed]
+    client.iter_fills = lambda **kw: iter(())
+    bot.step()
+
+    assert len(client.session.calls) == 1  # one batched create for all three fills
+    assert [(o["ticker"], o["count"], o.get("yes_price") or o.get("no_price")) for o in client.session.orders] == [
+        ("KX-A", 20, 42),  # market mean of 40 / 44
+        ("KX-B", 4, 59),  # previous fill 60 - 1c
+    ]
+    assert bot.state["KX-A"]["total_filled"] == 20 and bot.state["KX-B"]["last_fill_price"] == 60
+    assert bot.tracker.tracked() == 2  # KX-A's two fills merged into one 20-lot repost
+    assert bot.status()["metrics"]["fill_to_repost_ms"]["count"] == 2
+    store.close()
+
+
+class FillsMarketData(NoMarketData):
+    def __init__(self, sub):
+        self.sub = sub
+
+    def subscribe_fills(self, config):
+        return self.sub
+
+
+def test_ws_fill_after_gap_does_not_skip_reconcile(tmp_path):
+    from betting_outs.kalshi.kalshi_live import FillSubscription
+
+    config = {"event_ticker": "KXEV", "stakes": [{"ticker": "KX-A", "side": "yes", "shares": 5}]}
+    client = KalshiHttpClient("k", rsa.generate_private_key(public_exponent=65537, key_size=2048))
+    client.session = BatchSession()
+    sub = FillSubscription()
+    store = StateStore(str(tmp_path / "state.db"))
+    bot = StakeBot(config, "DEMO", client=client, market_data=FillsMarketData(sub), store=store)
+    bot.setup()
+    bot.watermark.min_ts = 1700000000
+    polls = []
+    lost = {"trade_id": "t1", "order_id": "x1", "count": 1, "ts": 1700000050}
+    client.iter_fills = lambda min_ts: polls.append(min_ts) or iter([lost] if min_ts <= 1700000050 else [])
+
+    # The feed skipped a sequence number (t1 lost), then delivered a newer fill before the reconcile
+    sub.missed.set()
+    bot.next_reconcile = time.monotonic() + 3600
+    bot.ingest("fill", {"trade_id": "t2", "order_id": "x2", "count": 1, "ts": 1700000090})
+    assert bot.watermark.min_ts == 1700000000
+    bot.step()
+    assert polls == [1700000000]
+    assert "t1" in bot.watermark.recent and bot.watermark.min_ts == 1700000050
+    store.close()
+
+
+def test_fill_feed_step_returns_the_wait_instead_of_blocking(tmp_path):
+    from betting_outs.kalshi.kalshi_live import FillSubscription
+
+    config = {"event_ticker": "KXEV", "stakes": [{"ticker": "KX-A", "side": "yes", "shares": 5}]}
+    client = KalshiHttpClient("k", rsa.generate_private_key(public_exponent=65537, key_size=2048))
+    client.session = BatchSession()
+    client.iter_fills = lambda min_ts: iter([])
+    sub = FillSubscription()
+    store = StateStore(str(tmp_path / "state.db"))
+    bot = StakeBot(config, "DEMO", client=client, market_data=FillsMarketData(sub), store=store)
+    woken = []
+    bot.waker = lambda: woken.append(1)
+    bot.setup()
+
+    t0 = time.monotonic()
+    delay = bot.step()
+    assert time.monotonic() - t0 < 0.5 and 0 < delay <= bot.reconcile_interval
+    # A fill on the feed thread wakes the driver, and the next step takes it without waiting
+    sub.put(("fill", {"trade_id": "t1", "order_id": "x1", "count": 1, "ts": 1700000050}))
+    assert woken == [1]
+    bot.step()
+    assert "t1" in bot.watermark.recent
+    store.close()
@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from betting_outs.kalshi.kalshi import KalshiHttpClient
+from betting_outs.kalshi.kalshi_orderbook import OrderBook
+from market_making.combined_no_bot import _get_no_bid_asks
+from market_making.metrics import Histogram
+
+DELAY = 0.1
+
+
+class FakeLive:
+    def __init__(self, books):
+        self.books = books
+
+    def book(self, ticker):
+        return self.books.get(ticker)
+
+
+def test_orderbooks_fan_out_and_prefer_live_books():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    client = KalshiHttpClient("k", key, "DEMO")
+    fetched = []
+
+    def get_orderbook(ticker):
+        fetched.append(ticker)
+        time.sleep(DELAY)
+        if ticker == "KX-BAD":
+            raise RuntimeError("boom")
+        return {"orderbook": {"yes": [[40, 1]], "no": [[55, 7]]}}
+
+    client.get_orderbook = get_orderbook
+    live = FakeLive({"KX-LIVE": OrderBook.from_response({"orderbook": {"yes": [[30, 1]], "no": [[60, 3]]}})})
+    tickers = [f"KX-{i}" for i in range(6)] + ["KX-LIVE", "KX-BAD"]
+
+    t0 = time.perf_counter()
+    rows = _get_no_bid_asks(client, tickers, live)
+    elapsed = time.perf_counter() - t0
+
+    assert elapsed < DELAY * 3  # concurrent, not 7 x DELAY
+    assert "KX-LIVE" not in fetched and rows["KX-LIVE"][:3] == (60, 70, 65.0)
+    assert rows["KX-0"][:3] == (55, 60, 57.5) and rows["KX-0"][3].depth_at("no", 55) == 7
+    assert rows["KX-BAD"] is None
+
+
+def test_histogram_percentiles_are_bucket_bounds():
+    h = Histogram()
+    for ms in [3] * 90 + [150] * 9 + [4000]:
+        h.record(ms)
+    summary = h.summary()
+    assert summary["count"] == 100 and summary["max_ms"] == 4000
+    assert (summary["p50_ms"], summary["p90_ms"], summary["p99_ms"]) == (5, 5, 200)
+    assert h.percentile(100) == 4000
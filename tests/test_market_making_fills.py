@@ -0,0 +1,107 @@
+import asyncio
+import json
+import os
+import queue
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from betting_outs.kalshi.kalshi_live import FillFeed
+from market_making.fills import BoundedSet, FillTracker, FillWatermark, next_events
+
+KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def test_partial_fills_complete_order_once():
+    tracker = FillTracker()
+    assert tracker.expect("o1", "KX-A", "no", 10) is None
+    assert tracker.on_event("fill", {"order_id": "o1", "count": 4, "yes_price": 12}) is None
+    done = tracker.on_event("fill", {"order_id": "o1", "count": 6, "yes_price": 13})
+    assert done == {"order_id": "o1", "ticker": "KX-A", "side": "no", "status": "executed",
+                    "fill_count": 10, "yes_price": 13, "no_price": 87}
+    assert tracker.on_event("fill", {"order_id": "o1", "count": 1}) is None  # no longer tracked
+    assert tracker.tracked() == 0
+
+
+def test_fill_before_expect_is_replayed_and_order_update_executes():
+    tracker = FillTracker()
+    assert tracker.on_event("fill", {"order_id": "fast", "count": 5, "yes_price": 40, "no_price": 60}) is None
+    done = tracker.expect("fast", "KX-B", "yes", 5)
+    assert done["fill_count"] == 5 and done["yes_price"] == 40
+    tracker.expect("o2", "KX-B", "yes", 5)
+    assert tracker.on_event("user_order", {"order_id": "o2", "status": "resting"}) is None
+    done = tracker.on_event("user_order", {"order_id": "o2", "status": "executed", "fill_count": 5, "yes_price": 41})
+    assert done["order_id"] == "o2" and done["no_price"] == 59
+
+
+def test_fill_feed_queues_events_and_flags_gaps():
+    feed = FillFeed("k", KEY, "DEMO")
+    sub, other = feed.subscribe(), feed.subscribe()
+
+    async def run():
+        await feed.on_message(json.dumps({"type": "fill", "sid": 1, "seq": 1, "msg": {"order_id": "a", "count": 1}}))
+        await feed.on_message(json.dumps({"type": "ticker", "sid": 2, "msg": {}}))
+        assert not sub.missed.is_set()
+        await feed.on_message(json.dumps({"type": "fill", "sid": 1, "seq": 3, "msg": {"order_id": "b", "count": 2}}))
+
+    asyncio.run(run())
+    assert sub.missed.is_set() and other.missed.is_set() and feed.stats["gaps"] == 1
+    events = next_events(sub.events, 0.1)
+    assert [m["order_id"] for _, m in events] == ["a", "b"]
+    assert other.events.qsize() == 2
+    feed.unsubscribe(other)
+    asyncio.run(feed.on_message(json.dumps({"type": "fill", "sid": 1, "seq": 4, "msg": {"order_id": "c"}})))
+    assert sub.events.qsize() == 1 and other.events.qsize() == 2
+    assert next_events(queue.Queue(), 0.01) == []
+
+
+def test_bounded_set_evicts_oldest():
+    seen = BoundedSet(3, ["a", "b", "c"])
+    seen.add("d")
+    assert "a" not in seen and list(seen) == ["b", "c", "d"] and len(seen) == 3
+
+
+def test_watermark_dedupes_and_round_trips():
+    assert FillWatermark.from_dict(None).min_ts > 1700000005  # fresh watermark starts about now
+    wm = FillWatermark(min_ts=0)
+    assert wm.add({"trade_id": "t1", "ts": 1700000000, "order_id": "o1", "count": 1})
+    assert not wm.add({"trade_id": "t1", "ts": 1700000000})
+    assert wm.add({"trade_id": "t2", "created_time": "2023-11-14T22:13:25Z"})
+    assert wm.min_ts == 1700000005 and wm.dirty
+    again = FillWatermark.from_dict(json.loads(json.dumps(wm.to_dict())))
+    assert not wm.dirty and again.min_ts == 1700000005
+    assert not again.add({"trade_id": "t2", "ts": 1700000005})
+
+
+def test_tracker_snapshot_restore():
+    tracker = FillTracker()
+    tracker.expect("o1", "KX-A", "yes", 10)
+    tracker.on_event("fill", {"order_id": "o1", "count": 4, "yes_price": 30})
+    assert tracker.dirty
+    snap = json.loads(json.dumps(tracker.snapshot()))
+    assert not tracker.dirty
+    resumed = FillTracker()
+    resumed.restore(snap)
+    done = resumed.on_event("fill", {"order_id": "o1", "count": 6, "yes_price": 31})
+    assert done["fill_count"] == 10 and done["ticker"] == "KX-A"
+
+
+def test_iter_fills_passes_watermark_and_follows_cursor():
+    from betting_outs.kalshi.kalshi import KalshiHttpClient
+
+    client = KalshiHttpClient.__new__(KalshiHttpClient)
+    calls = []
+
+    def fake_get_fills(**params):
+        calls.append(params)
+        if params["cursor"] is None:
+            return {"fills": [{"trade_id": "t3"}, {"trade_id": "t2"}], "cursor": "c1"}
+        return {"fills": [{"trade_id": "t1"}], "cursor": ""}
+
+    client.get_fills = fake_get_fills
+    assert [f["trade_id"] for f in client.iter_fills(min_ts=123)] == ["t3", "t2", "t1"]
+    assert all(c["min_ts"] == 123 and c["limit"] == 200 for c in calls)
@@ -0,0 +1,85 @@
+import math
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from hypothesis import given, settings, strategies as st  # requirements-dev.txt
+
+from betting_outs.kalshi.kalshi_orderbook import OrderBook
+from market_making.combined_no_bot import compute_offer_prices, compute_offer_prices_batch
+
+
+def reference_offer_prices(tickers, bid_ask_data, max_combined):
+    """The original 1c-at-a-time allocator, kept as the oracle."""
+    if not tickers:
+        return {}
+    caps = {}
+    for t in tickers:
+        _, _, median, _ = bid_ask_data.get(t, (0, 0, 0.0, None))
+        caps[t] = 1 if median <= 1 else max(1, int(math.floor(median)) - 1)
+    excess = sum(caps.values()) - max_combined
+    if excess <= 0:
+        return caps
+
+    def liquidity_at(ticker, price):
+        d = bid_ask_data.get(ticker)
+        return d[3].depth_at("no", price) if d else 0
+
+    while excess > 0:
+        ordered = sorted(tickers, key=lambda t: liquidity_at(t, caps[t]) if caps[t] > 1 else float("inf"))
+        progress = False
+        for t in ordered:
+            if excess <= 0:
+                break
+            if caps[t] > 1:
+                caps[t] -= 1
+                excess -= 1
+                progress = True
+        if not progress:
+            break
+    return caps
+
+
+leg = st.tuples(
+    st.floats(min_value=0, max_value=99, allow_nan=False),
+    st.dictionaries(st.integers(1, 99), st.integers(1, 3), max_size=8),  # few distinct sizes -> many ties
+)
+
+
+def _event(legs):
+    tickers = [f"KX-{i}" for i in range(len(legs))]
+    data = {}
+    for t, (median, depth) in zip(tickers, legs):
+        book = OrderBook(t)
+        book.apply_snapshot([], sorted(depth.items()))
+        data[t] = (0, 0, median, book)
+    return tickers, data
+
+
+@settings(max_examples=200, deadline=None)
+@given(st.lists(leg, max_size=30), st.integers(0, 2000))
+def test_matches_reference_allocator(legs, max_combined):
+    tickers, data = _event(legs)
+    assert compute_offer_prices(tickers, data, max_combined) == reference_offer_prices(tickers, data, max_combined)
+
+
+@settings(max_examples=60, deadline=None)
+@given(st.lists(st.lists(leg, min_size=1, max_size=12), min_size=1, max_size=6), st.integers(0, 600))
+def test_batch_matches_per_event(events, max_combined):
+    np = pytest.importorskip("numpy")
+    width = max(len(legs) for legs in events)
+    medians = np.full((len(events), width), np.nan)
+    depth = np.zeros((len(events), width, 100), dtype=np.int32)
+    expected = np.zeros((len(events), width), dtype=np.int64)
+    for e, legs in enumerate(events):
+        tickers, data = _event(legs)
+        for i, t in enumerate(tickers):
+            medians[e, i] = data[t][2]
+            depth[e, i] = data[t][3].no
+        expected[e, : len(tickers)] = list(reference_offer_prices(tickers, data, max_combined).values())
+    assert (compute_offer_prices_batch(medians, depth, max_combined) == expected).all()
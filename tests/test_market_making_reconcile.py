@@ -0,0 +1,107 @@
+import json
+import os
+import sys
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from betting_outs.kalshi.kalshi import KalshiHttpClient
+from market_making import reconcile
+
+
+def _order(oid, ticker, price, remaining, filled=0, side="no"):
+    return {"order_id": oid, "ticker": ticker, "side": side, f"{side}_price": price,
+            "remaining_count": remaining, "fill_count": filled, "client_order_id": f"combined_no_{ticker}"}
+
+
+def _quote(ticker, price, count=10, side="no"):
+    return {"ticker": ticker, "side": side, "price": price, "count": count}
+
+
+def test_plan_emits_minimal_actions():
+    desired = [_quote("KX-A", 40), _quote("KX-B", 30), _quote("KX-C", 20), _quote("KX-D", 25), _quote("KX-E", 45)]
+    resting = [
+        _order("a", "KX-A", 40, 10),               # matches: nothing to do
+        _order("b", "KX-B", 31, 10),               # wrong price: amend
+        _order("c", "KX-C", 20, 4, filled=6),      # partly filled: amend size back up
+        _order("d", "KX-D", 25, 15),               # too big: decrease
+        _order("d2", "KX-D", 24, 3),               # duplicate: cancel
+        _order("x", "KX-X", 50, 10),               # no longer wanted: cancel
+    ]
+    actions = reconcile.plan(desired, resting)
+    assert sorted(actions["cancel"]) == ["d2", "x"]
+    assert [(o["order_id"], q["price"]) for o, q in actions["amend"]] == [("b", 30), ("c", 20)]
+    assert [o["order_id"] for o, _ in actions["decrease"]] == ["d"]
+    assert actions["create"] == [_quote("KX-E", 45)]
+    # 2 x 0.2 + 2 amends + 1 decrease + 1 create, vs 2 writes per changed leg with cancel + create
+    assert reconcile.write_cost(actions) == 4.4
+    # keys limits the diff: KX-X's order is not touched when only KX-B is reconciled
+    assert reconcile.plan(desired, resting, [("KX-B", "no")])["cancel"] == []
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = []
+
+    def batch_cancel_orders(self, ids):
+        self.calls.append(("cancel", list(ids)))
+        return {"cancelled_orders": list(ids), "batch_responses": [{}]}
+
+    def amend_order(self, order_id, **kwargs):
+        self.calls.append(("amend", order_id, kwargs))
+        return {"order": {"order_id": order_id, "ticker": kwargs["ticker"], "no_price": kwargs.get("no_price")}}
+
+    def decrease_order(self, order_id, **kwargs):
+        self.calls.append(("decrease", order_id, kwargs))
+        return {"order": {"order_id": order_id}}
+
+    def batch_create_orders(self, orders):
+        self.calls.append(("create", orders))
+        return [{"order": {"order_id": "new"}}, {"error": "market closed"}]
+
+
+def test_execute_sends_batches_and_amends():
+    client = FakeClient()
+    actions = reconcile.plan(
+        [_quote("KX-A", 38), _quote("KX-B", 30), _quote("KX-C", 20)],
+        [_order("a", "KX-A", 40, 4, filled=6), _order("z", "KX-Z", 10, 1)],
+    )
+    done = reconcile.execute(client, actions, client_order_id=lambda q: f"combined_no_{q['ticker']}")
+    assert client.calls[0] == ("cancel", ["z"])
+    assert client.calls[1] == ("amend", "a", {"ticker": "KX-A", "side": "no", "action": "buy", "count": 16,
+                                              "client_order_id": "combined_no_KX-A", "no_price": 38})
+    kind, orders = client.calls[2]
+    assert kind == "create" and [o["client_order_id"] for o in orders] == ["combined_no_KX-B", "combined_no_KX-C"]
+    assert [o["order_id"] for o in done["orders"]] == ["a", "new"]
+    assert done["errors"] == [{"action": "create", "ticker": "KX-C", "error": "market closed"}]
+
+
+def test_batch_create_orders_chunks_and_maps_results_to_input():
+    client = KalshiHttpClient("k", rsa.generate_private_key(public_exponent=65537, key_size=2048))
+    sent = []
+
+    class Session:
+        def request(self, method, url, **kwargs):
+            bodies = kwargs["json"]["orders"]
+            sent.append((method, url, len(bodies)))
+            out = [{"client_order_id": b["client_order_id"], "order": {"order_id": b["client_order_id"]}, "error": None}
+                   for b in bodies]
+            out[0] = {"client_order_id": bodies[0]["client_order_id"], "order": None, "error": {"code": "invalid"}}
+            r = requests.Response()
+            r.status_code = 201
+            r._content = json.dumps({"orders": list(reversed(out))}).encode()
+            return r
+
+    client.session = Session()
+    orders = [{"ticker": f"KX-{i}", "side": "yes", "count": 1, "yes_price": 10, "client_order_id": f"c{i}"} for i in range(25)]
+    results = client.batch_create_orders(orders)
+    assert [n for _, _, n in sent] == [20, 5] and sent[0][1].endswith("/portfolio/orders/batched")
+    assert results[0] == {"error": {"code": "invalid"}} and results[20] == {"error": {"code": "invalid"}}
+    assert [r["order"]["order_id"] for i, r in enumerate(results) if i not in (0, 20)] == [
+        f"c{i}" for i in range(25) if i not in (0, 20)
+    ]
@@ -0,0 +1,150 @@
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from market_making.bot import StakeBot
+from market_making.runner import StrategyRunner, config_from_request
+from market_making.state_store import StateStore
+from market_making.strategy import Strategy
+from market_making.supervisor import Supervisor
+
+
+class FakeStrategy(Strategy):
+    kind = "fake"
+
+    def __init__(self, config):
+        super().__init__(config, "DEMO", client=object(), market_data=object(), store=object())
+
+    def step(self):
+        return 0.01
+
+
+class FakeSupervisor(Supervisor):
+    def build(self, config, name=None):
+        return FakeStrategy(config)
+
+
+class FormClient:
+    """Resting orders in memory: batched creates rest, batched cancels remove them."""
+
+    def __init__(self):
+        self.resting = {}
+        self.cancelled = []
+
+    def batch_create_orders(self, orders):
+        out = []
+        for o in orders:
+            oid = f"o{len(self.resting) + len(self.cancelled)}"
+            self.resting[oid] = {**o, "order_id": oid}
+            out.append({"order": {"order_id": oid}})
+        return out
+
+    def iter_orders(self, status=None, event_ticker=None, ticker=None):
+        return [o for o in list(self.resting.values()) if ticker is None or o["ticker"] == ticker]
+
+    def batch_cancel_orders(self, order_ids):
+        for oid in order_ids:
+            self.resting.pop(oid)
+            self.cancelled.append(oid)
+
+    def iter_fills(self, **kwargs):
+        return []
+
+    def get_orderbooks(self, tickers):
+        return {}
+
+
+class NoMarketData:
+    def orderbooks(self, config, tickers):
+        return None
+
+    def subscribe_fills(self, config):
+        return None
+
+    def unsubscribe_fills(self, sub):
+        pass
+
+
+class FormSupervisor(Supervisor):
+    def __init__(self, client, store):
+        super().__init__()
+        self.client, self.store = client, store
+
+    def build(self, config, name=None):
+        return StakeBot(config, "DEMO", client=self.client, market_data=NoMarketData(), store=self.store, name=name)
+
+
+def _wait_for(cond, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not cond() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return cond()
+
+
+def test_runner_create_status_stop_restart(tmp_path):
+    store = StateStore(str(tmp_path / "state.db"))
+    runner = StrategyRunner(store=store, supervisor=FakeSupervisor())
+    try:
+        sid = runner.create({"type": "mm", "event_ticker": "KXEV", "stakes": [{"ticker": "KX-A"}]})
+        assert sid == "mm_KXEV"
+        assert runner.create({"type": "mm", "event_ticker": "KXEV", "stakes": []}) == "mm_KXEV-2"
+        assert _wait_for(lambda: runner.status(sid)["cycles"] > 2)
+        status = runner.status(sid)
+        assert status["status"] == "running" and status["last_cycle_ms"] is not None
+        runner.stop(sid)
+        assert runner.status(sid)["status"] == "stopped"
+        runner.restart(sid)
+        assert _wait_for(lambda: runner.status(sid)["status"] == "running")
+        runner.delete("mm_KXEV-2")
+        assert [s["id"] for s in runner.list()] == [sid]
+        store.flush()
+        # A new runner (API restart) lists saved configs as stopped
+        assert StrategyRunner(store=store, supervisor=FakeSupervisor()).list() == [
+            {"id": sid, "status": "stopped", "type": "mm", "env": ""}
+        ]
+    finally:
+        runner.close()
+
+
+def test_config_from_desktop_form():
+    form = {"markets": ["KX-A", "KX-B"], "order_size": 5, "refill_mode": "median", "stop_max_shares": 50}
+    config = config_from_request({**form, "yes_price": 40}, "PROD")
+    assert config["type"] == "mm" and config["env"] == "prod"
+    assert [s["ticker"] for s in config["stakes"]] == ["KX-A", "KX-B"]
+    assert config["stakes"][0]["repost_base"] == "market_mean" and config["stakes"][0]["max_shares"] == 50
+    assert (config["stakes"][0]["side"], config["stakes"][0]["yes_price"]) == ("yes", 40)
+    assert config_from_request({**form, "yes_price": 40, "no_price": 55}, "PROD")["stakes"][1]["side"] == "both"
+    for bad in (form, {**form, "no_price": 0}, {**form, "yes_price": 40, "stop_max_dollars": 100}):
+        try:
+            config_from_request(bad, "PROD")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"accepted {bad}")
+    assert config_from_request({"tickers": ["KX-A"]}, "DEMO")["type"] == "combined_no"
+
+
+def test_stopping_a_form_strategy_cancels_only_its_orders(tmp_path):
+    store = StateStore(str(tmp_path / "state.db"))
+    client = FormClient()
+    runner = StrategyRunner(store=store, supervisor=FormSupervisor(client, store))
+    try:
+        form = {"markets": ["KX-A"], "order_size": 5, "yes_price": 40}
+        first = runner.create(config_from_request(form, "DEMO"))
+        second = runner.create(config_from_request({**form, "yes_price": 30}, "DEMO"))
+        assert _wait_for(lambda: len(client.resting) == 2)
+        ours = set(runner.supervisor.strategies[first].our_order_ids)
+        # Same ticker and client_order_id prefix, no event_ticker: state and orders stay separate
+        assert runner.supervisor.strategies[first].scope != runner.supervisor.strategies[second].scope
+        runner.stop(first)
+        assert set(client.cancelled) == ours
+        assert [o["yes_price"] for o in client.resting.values()] == [30]
+        store.flush()
+        assert store.get(f"mm:{first}", "placed:KX-A") is None
+        assert store.get(f"mm:{second}", "placed:KX-A") is True
+    finally:
+        runner.close()
@@ -0,0 +1,51 @@
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from market_making.state_store import StateStore
+
+
+def test_kv_writes_are_batched_and_survive_reopen(tmp_path):
+    path = str(tmp_path / "state.db")
+    store = StateStore(path, flush_interval=0.05)
+    store.put("mm:EV", "paused:KX-A", True)
+    store.put("mm:EV", "placed:KX-A", True)
+    store.put("mm:EV", "placed:KX-B", True)
+    store.put("other", "placed:KX-A", True)
+    store.delete_prefix("mm:EV", "placed:")
+    assert store.flush()
+    assert store.load("mm:EV") == {"paused:KX-A": True}
+    store.close()
+
+    reopened = StateStore(path)
+    assert reopened.get("mm:EV", "paused:KX-A") is True
+    assert reopened.get("other", "placed:KX-A") is True
+    assert reopened.get("mm:EV", "missing", 7) == 7
+    reopened.close()
+
+
+def test_fill_journal_compacts_into_totals(tmp_path):
+    path = str(tmp_path / "state.db")
+    store = StateStore(path, compact_every=5)
+    for i in range(7):
+        store.record_fill("mm:EV", "KX-A", 10, price=40 + i, order_id=f"o{i}", side="yes")
+    store.record_fill("mm:EV", "KX-B", 3)
+    store.record_fill("other", "KX-A", 1, price=99)
+    store.flush()
+    assert store.stats["compactions"] == 1
+    assert len(store.journal("mm:EV")) + len(store.journal("other")) < 9
+    store.close()
+
+    t0 = time.perf_counter()
+    reopened = StateStore(path)
+    totals = reopened.fill_totals("mm:EV")
+    rebuild_ms = (time.perf_counter() - t0) * 1000
+    assert totals["KX-A"] == {"total_filled": 70, "last_fill_price": 46, "fills": 7}
+    assert totals["KX-B"] == {"total_filled": 3, "last_fill_price": None, "fills": 1}
+    assert reopened.fill_totals("other")["KX-A"]["total_filled"] == 1
+    assert rebuild_ms < 500
+    reopened.close()
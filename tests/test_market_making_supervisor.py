@@ -0,0 +1,138 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from market_making.market_data import MarketData
+from market_making.strategy import Strategy
+from market_making.supervisor import Supervisor, load_strategy_file
+
+
+class FakeStrategy(Strategy):
+    kind = "fake"
+
+    def __init__(self, config, log):
+        super().__init__(config, "DEMO", client=object(), market_data=object(), store=object())
+        self.log = log
+
+    def setup(self):
+        self.log.append(("setup", self.config["n"]))
+
+    def step(self):
+        self.log.append(("step", self.config["n"]))
+        return 0.01
+
+    def shutdown(self):
+        self.log.append(("shutdown", self.config["n"]))
+
+
+class FakeSupervisor(Supervisor):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.log = []
+
+    def build(self, config, name=None):
+        return FakeStrategy(config, self.log)
+
+
+def _write(path, n):
+    with open(path, "w") as f:
+        json.dump({"type": "combined_no", "tickers": ["KX-A"], "n": n}, f)
+    os.utime(path, (time.time() + n, time.time() + n))  # distinct mtime per write
+
+
+def test_hot_add_restart_and_remove(tmp_path):
+    sup = FakeSupervisor(str(tmp_path))
+    a, b = tmp_path / "a.json", tmp_path / "b.json"
+
+    async def scenario():
+        _write(a, 1)
+        _write(b, 2)
+        await sup.sync()
+        await asyncio.sleep(0.05)
+        assert set(sup.strategies) == {"a", "b"}
+        _write(a, 3)  # edit -> restart a only
+        os.remove(b)  # delete -> stop b
+        await sup.sync()
+        await asyncio.sleep(0.05)
+        assert set(sup.strategies) == {"a"} and sup.strategies["a"].config["n"] == 3
+        await sup.stop_all()
+
+    asyncio.run(scenario())
+    events = sup.log
+    assert ("shutdown", 1) in events and ("shutdown", 2) in events and ("shutdown", 3) in events
+    assert events.count(("setup", 3)) == 1 and ("step", 3) in events
+    # b kept running while a restarted: b only shut down once, when its file was deleted
+    assert events.count(("shutdown", 2)) == 1
+
+
+def test_reads_generated_strategy_scripts():
+    mm = load_strategy_file(os.path.join(ROOT, "market_making", "mm_KXTXSENDPRIMARYMOV_26MAR03.py"))
+    assert mm["type"] == "mm" and len(mm["stakes"]) == 11
+    combined = load_strategy_file(os.path.join(ROOT, "market_making", "combined_no_KXTX02R_26.py"))
+    assert combined["type"] == "combined_no" and combined["max_combined"] == 97
+
+
+def test_strategy_without_step_fails_when_created():
+    class Unfinished(Strategy):
+        pass
+
+    try:
+        Unfinished({}, "DEMO", client=object(), market_data=object(), store=object())
+    except TypeError as e:
+        assert "step" in str(e)
+    else:
+        raise AssertionError("created a strategy with no step()")
+
+
+def test_wake_up_ends_the_wait_between_steps():
+    class Waiting(FakeStrategy):
+        def step(self):
+            self.log.append(("step", self.config["n"]))
+            return 60.0  # e.g. until the next fill reconcile
+
+    class WakeSupervisor(FakeSupervisor):
+        def build(self, config, name=None):
+            return Waiting(config, self.log)
+
+    sup = WakeSupervisor()
+
+    async def scenario():
+        strategy = await sup.add("a", {"n": 1})
+        await asyncio.sleep(0.05)
+        assert sup.log.count(("step", 1)) == 1
+        # A feed thread (fill arrived) wakes the strategy; no worker thread was waiting
+        threading.Thread(target=strategy.wake_up).start()
+        await asyncio.sleep(0.05)
+        assert sup.log.count(("step", 1)) == 2
+        await sup.stop_all()
+        assert strategy.waker is None
+
+    asyncio.run(scenario())
+
+
+def test_orderbook_tickers_are_released_when_no_strategy_uses_them():
+    class FakeEngine:
+        def __init__(self):
+            self.tickers = set()
+
+        def add_tickers(self, tickers):
+            self.tickers |= set(tickers)
+
+        def remove_tickers(self, tickers):
+            self.tickers -= set(tickers)
+
+    md = MarketData(object())
+    md.engine = FakeEngine()
+    md.orderbooks({}, ["KX-A", "KX-B"])
+    md.orderbooks({}, ["KX-B", "KX-C", "KX-C"])
+    md.release_orderbooks(["KX-A", "KX-B"])
+    assert md.engine.tickers == {"KX-B", "KX-C"}
+    md.release_orderbooks(["KX-B", "KX-C"])
+    assert md.engine.tickers == set()